@@ -0,0 +1,72 @@
+"""Authentication classes for the accounts."""
+
+__all__ = (
+    "TokenAuthentication",
+)
+
+from knox.models import AuthToken
+from knox.settings import knox_settings
+from knox.auth import TokenAuthentication as BaseTokenAuthentication
+
+from accounts.utils import TokenCache
+from accounts.models import User
+from accounts.principal import Principal
+
+
+class TokenAuthentication(BaseTokenAuthentication):
+    """
+    Token authentication that caches the validated tokens.
+
+    A cached token only costs a single query for the user and its
+    membership, instead of querying and comparing the token first. It
+    also resolves the principal of the user, see 'accounts.principal'.
+    """
+
+    def authenticate(self, request):
+        """
+        Overridden to attach the principal to the authenticated user.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: The authenticated user and token, if authenticated
+        :rtype: tuple | None
+        """
+        result = BaseTokenAuthentication.authenticate(self, request)
+
+        if result is not None:
+            setattr(result[0], "principal", Principal.for_user(result[0]))
+
+        return result
+
+    def authenticate_credentials(self, token):
+        """
+        Overridden to validate the token through the cache first.
+
+        :param token: The raw token as send by the client
+        :type token: bytes
+
+        :return: The authenticated user and token
+        :rtype: tuple
+        """
+        key = TokenCache.key(token)
+        fields = TokenCache.get(key)
+
+        if fields is not None:
+            user = User.objects.select_related("member")
+            user = user.filter(id=fields["user_id"]).first()
+
+            if user is not None and user.is_active:
+                return user, AuthToken(**{**fields, "user": user})
+
+            TokenCache.invalidate(fields["user_id"])
+
+        user, auth_token = BaseTokenAuthentication.authenticate_credentials(
+            self, token
+        )
+
+        # A refreshed expiry has to be written, so it can't be skipped
+        if not (knox_settings.AUTO_REFRESH and auth_token.expiry):
+            TokenCache.set(key, auth_token)
+
+        return user, auth_token
@@ -0,0 +1,79 @@
+"""Management command to process the uploaded registration jobs."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import RegistrationJob
+from accounts.registration import process_job
+
+
+class Command(BaseCommand):
+    """
+    Process the pending registration jobs.
+
+    Every job streams its csv file in chunks into the bulk account
+    creation, so that the memory usage doesn't grow with the file.
+
+    A job is claimed before it's processed, so concurrent workers never
+    process the same file, and the jobs of crashed workers are pending
+    again after the '--stale' timeout.
+    """
+
+    help = "Register the employees of the uploaded csv files."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="The number of rows to register at once.",
+        )
+
+        parser.add_argument(
+            "--stale",
+            type=int,
+            default=600,
+            help="The seconds without progress before a job is restarted.",
+        )
+
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep polling for jobs every interval seconds.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually process the jobs, and keep polling if requested.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        while True:
+            RegistrationJob.objects.reset_stale(options["stale"])
+
+            for job in RegistrationJob.objects.pending():
+                if not RegistrationJob.objects.claim(job):
+                    continue
+
+                if process_job(job, options["chunk_size"]):
+                    self.stdout.write(f"Finished registration job {job.id}")
+
+                else:
+                    self.stderr.write(f"Failed registration job {job.id}")
+
+            if not options["interval"]:
+                break
+
+            time.sleep(options["interval"])
@@ -2,9 +2,16 @@
 
 __all__ = (
     "UserManager",
+    "RegistrationJobManager",
 )
 
+import datetime
+
+from django.db.models.manager import Manager
 from django.contrib.auth.base_user import BaseUserManager
+from django.utils.timezone import now
+
+from accounts.utils import hash_passwords
 
 
 class UserManager(BaseUserManager):
@@ -38,3 +45,102 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
 
         return user
+
+    def create_users(self, emails, batch_size=500, **extra):
+        """
+        Create users with random passwords for a collection of emails.
+
+        The emails are normalized and deduplicated first, the emails
+        that already have an account are skipped with a single query
+        per batch. The passwords are hashed in bulk, see the function
+        'accounts.utils.hash_passwords', and inserted per batch.
+
+        :param emails: The email addresses to create the users for
+        :type emails: collections.abc.Iterable[str]
+
+        :param batch_size: The number of users to select and insert at once
+        :type batch_size: int
+
+        :param extra: The value's for additional fields
+        :type extra: str | int | bool | datetime.datetime
+
+        :return: The created users with their raw password
+        :rtype: list[tuple[accounts.models.User, str]]
+        """
+        emails = list(dict.fromkeys(map(self.normalize_email, emails)))
+        created = []
+
+        for index in range(0, len(emails), batch_size):
+            batch = emails[index:index + batch_size]
+
+            existing = self.filter(email__in=batch)
+            existing = set(existing.values_list("email", flat=True))
+
+            batch = [email for email in batch if email not in existing]
+            passwords = [self.make_random_password(12) for _ in batch]
+
+            self.bulk_create(
+                self.model(email=email, password=hashed, **extra)
+                for email, hashed in zip(batch, hash_passwords(passwords))
+            )
+
+            # Not every database returns the primary keys on insertion
+            users = self.filter(email__in=batch).in_bulk(field_name="email")
+            created.extend(zip(map(users.get, batch), passwords))
+
+        return created
+
+
+class RegistrationJobManager(Manager):
+    """Custom manager for the uploaded registration jobs."""
+
+    def pending(self):
+        """
+        Select the jobs that still have to be processed.
+
+        :return: The pending jobs, oldest first
+        :rtype: django.db.models.query.QuerySet
+        """
+        queryset = self.get_queryset().filter(status=self.model.PENDING)
+        return queryset.order_by("created", "id")
+
+    def claim(self, job):
+        """
+        Claim a pending job for the current worker.
+
+        :param job: The job to claim
+        :type job: accounts.models.RegistrationJob
+
+        :return: Whether the job was claimed, and not by another worker
+        :rtype: bool
+        """
+        queryset = self.filter(id=job.id, status=self.model.PENDING)
+        claimed = queryset.update(status=self.model.RUNNING, heartbeat=now())
+
+        return claimed == 1
+
+    def reset_stale(self, timeout):
+        """
+        Make the running jobs of crashed workers pending again.
+
+        The counters start over, the accounts that were registered
+        before the crash are reported as existing by the next run.
+
+        :param timeout: The seconds without a heartbeat of a crashed worker
+        :type timeout: int
+
+        :return: The number of reset jobs
+        :rtype: int
+        """
+        moment = now() - datetime.timedelta(seconds=timeout)
+
+        queryset = self.filter(status=self.model.RUNNING)
+        queryset = queryset.filter(heartbeat__lt=moment)
+
+        return queryset.update(
+            status=self.model.PENDING,
+            processed=0,
+            registered=0,
+            existing=0,
+            invalid=0,
+        )
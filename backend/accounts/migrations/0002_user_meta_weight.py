@@ -0,0 +1,23 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='meta_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='meta_total',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=9),
+        ),
+    ]
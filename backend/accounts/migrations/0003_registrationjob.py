@@ -0,0 +1,32 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:56
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_auto_20191015_2133'),
+        ('accounts', '0002_user_meta_weight'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='registrations/', validators=[django.core.validators.FileExtensionValidator(['csv', 'txt'])])),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('running', 'running'), ('finished', 'finished'), ('failed', 'failed')], default='pending', max_length=8)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('registered', models.PositiveIntegerField(default=0)),
+                ('existing', models.PositiveIntegerField(default=0)),
+                ('invalid', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(null=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registrations', to='companies.Company')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_registrationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registrationjob',
+            name='heartbeat',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -3,9 +3,19 @@
 __all__ = (
     "User",
     "Group",
+    "RegistrationJob",
 )
 
+from django.core.validators import FileExtensionValidator
+from django.dispatch.dispatcher import receiver
+
+from django.db.models.signals import post_save, post_delete
+
+from django.db.models.base import Model
 from django.db.models.fields import BooleanField, EmailField
+from django.db.models.fields import DecimalField, PositiveIntegerField
+from django.db.models.fields import CharField, DateTimeField, TextField
+from django.db.models.fields.files import FileField
 from django.db.models.fields.related import CASCADE, ForeignKey
 
 from django.utils.translation import gettext_lazy as _
@@ -13,7 +23,9 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import Group
 from django.contrib.auth.base_user import AbstractBaseUser
 
+from accounts.utils import TokenCache
 from accounts.managers import UserManager
+from accounts.managers import RegistrationJobManager
 
 
 class User(AbstractBaseUser):
@@ -29,6 +41,11 @@ class User(AbstractBaseUser):
     objects = UserManager()
     deleted = BooleanField(default=False)
 
+    # Denormalized sum and number of the weights of the user's metadata,
+    # these are maintained by the signals within 'analytics.models'.
+    meta_total = DecimalField(default=0, max_digits=9, decimal_places=1)
+    meta_count = PositiveIntegerField(default=0)
+
     @property
     def is_active(self):
         """
@@ -44,3 +61,86 @@ class User(AbstractBaseUser):
         Overridden because there is no real username.
         """
         self.email = self.__class__.objects.normalize_email(self.email)
+
+
+class RegistrationJob(Model):
+    """
+    An uploaded csv file of employees that is registered in the background.
+
+    The file is processed in chunks by the 'process_registrations'
+    management command, which keeps the counters up to date so that
+    the progress can be polled. A job is claimed by a single worker,
+    and processed again when its worker stopped beating.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+    STATUSES = (
+        (PENDING, _("pending")),
+        (RUNNING, _("running")),
+        (FINISHED, _("finished")),
+        (FAILED, _("failed")),
+    )
+
+    file = FileField(
+        upload_to="registrations/",
+        validators=[FileExtensionValidator(["csv", "txt"])],
+    )
+
+    company = ForeignKey("companies.Company", CASCADE, "registrations")
+    status = CharField(max_length=8, choices=STATUSES, default=PENDING)
+
+    processed = PositiveIntegerField(default=0)
+    registered = PositiveIntegerField(default=0)
+    existing = PositiveIntegerField(default=0)
+    invalid = PositiveIntegerField(default=0)
+
+    error = TextField(blank=True)
+    created = DateTimeField(auto_now_add=True)
+    finished = DateTimeField(null=True)
+
+    # Raised with every processed chunk, to detect jobs of crashed workers
+    heartbeat = DateTimeField(null=True)
+
+    objects = RegistrationJobManager()
+
+
+@receiver(post_delete, sender="knox.AuthToken")
+def _invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Drop the cached tokens of a user when a token is deleted.
+
+    This happens on logout, see 'knox.views.LogoutView', and when an
+    expired token is cleaned up.
+
+    :param sender: The model's class
+    :type sender: type of knox.models.AuthToken
+
+    :param instance: The deleted token
+    :type instance: knox.models.AuthToken
+
+    :param kwargs: Additional keyword arguments (ignored)
+    :type kwargs: any
+    """
+    TokenCache.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def _invalidate_deleted_user(sender, instance, **kwargs):
+    """
+    Drop the cached tokens of a user that is marked as deleted.
+
+    :param sender: The model's class
+    :type sender: type of accounts.models.User
+
+    :param instance: The saved user
+    :type instance: accounts.models.User
+
+    :param kwargs: Additional keyword arguments (ignored)
+    :type kwargs: any
+    """
+    if instance.deleted:
+        TokenCache.invalidate(instance.id)
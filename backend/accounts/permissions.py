@@ -21,6 +21,7 @@ from rest_framework.permissions import IsAuthenticated
 from accounts.utils import Groups
 from accounts.utils import is_management, is_employer
 from accounts.utils import is_administrator, is_employee
+from accounts.principal import get_principal
 
 
 class IsAcceptable(IsAuthenticated):
@@ -41,7 +42,7 @@ class IsAcceptable(IsAuthenticated):
         """
         return (
             IsAuthenticated.has_permission(self, request, view)
-            and request.user.group_id in Groups.__iter__()
+            and get_principal(request).group_id in Groups.__iter__()
         )
 
 
@@ -66,7 +67,7 @@ class IsManagement(IsAuthenticated):
         """
         return (
             IsAuthenticated.has_permission(self, request, view)
-            and is_management(request.user)
+            and is_management(get_principal(request))
         )
 
 
@@ -91,7 +92,7 @@ class IsEmployer(IsAuthenticated):
         """
         return (
             IsAuthenticated.has_permission(self, request, view)
-            and is_employer(request.user)
+            and is_employer(get_principal(request))
         )
 
 
@@ -116,7 +117,7 @@ class IsEmployee(IsAuthenticated):
         """
         return (
             IsAuthenticated.has_permission(self, request, view)
-            and is_employee(request.user)
+            and is_employee(get_principal(request))
         )
 
 
@@ -142,10 +143,12 @@ class IsManagementAndReadOnly(IsAuthenticated):
         if not IsAuthenticated.has_permission(self, request, view):
             return False
 
+        principal = get_principal(request)
+
         if request.method.upper() in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
-            return is_management(request.user)
+            return is_management(principal)
 
-        return is_administrator(request.user)
+        return is_administrator(principal)
 
 
 class IsEmployerAndReadOnly(IsAuthenticated):
@@ -170,10 +173,12 @@ class IsEmployerAndReadOnly(IsAuthenticated):
         if not IsAuthenticated.has_permission(self, request, view):
             return False
 
+        principal = get_principal(request)
+
         if request.method.upper() in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
-            return is_employer(request.user)
+            return is_employer(principal)
 
-        return is_administrator(request.user)
+        return is_administrator(principal)
 
 
 class IsEmployeeAndReadOnly(IsAuthenticated):
@@ -198,10 +203,12 @@ class IsEmployeeAndReadOnly(IsAuthenticated):
         if not IsAuthenticated.has_permission(self, request, view):
             return False
 
+        principal = get_principal(request)
+
         if request.method.upper() in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
-            return is_employee(request.user)
+            return is_employee(principal)
 
-        return is_administrator(request.user)
+        return is_administrator(principal)
 
 
 class IsManagementOrReadOnly(IsAuthenticated):
@@ -226,15 +233,17 @@ class IsManagementOrReadOnly(IsAuthenticated):
         if not IsAuthenticated.has_permission(self, request, view):
             return False
 
+        principal = get_principal(request)
+
         if (
-                is_employee(request.user, False) or
-                is_employer(request.user, False)
+                is_employee(principal, False) or
+                is_employer(principal, False)
         ):
             return request.method.upper() in (
                 'GET', 'HEAD', 'OPTIONS', 'TRACE'
             )
 
-        return is_management(request.user)
+        return is_management(principal)
 
 
 class IsEmployeeOrReadOnly(IsAuthenticated):
@@ -259,12 +268,14 @@ class IsEmployeeOrReadOnly(IsAuthenticated):
         if not IsAuthenticated.has_permission(self, request, view):
             return False
 
+        principal = get_principal(request)
+
         if (
-                is_management(request.user, False) or
-                is_employer(request.user, False)
+                is_management(principal, False) or
+                is_employer(principal, False)
         ):
             return request.method.upper() in (
                 'GET', 'HEAD', 'OPTIONS', 'TRACE'
             )
 
-        return is_employee(request.user)
+        return is_employee(principal)
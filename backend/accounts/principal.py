@@ -0,0 +1,97 @@
+"""The authorization details of the user of a request."""
+
+__all__ = (
+    "Principal",
+    "get_principal",
+)
+
+from companies.models import Member
+
+
+class Principal(object):
+    """
+    The resolved authorization details of a single user.
+
+    The group, membership and company of the user are resolved once
+    per request, so that the permissions, validators and view-set
+    filters don't have to follow the 'member' relation of the user
+    over and over again. Because it carries the 'group_id', it can be
+    passed to the role checks within 'accounts.utils' as well.
+    """
+
+    __slots__ = ("user_id", "group_id", "member_id", "company_id")
+
+    def __init__(self, user_id, group_id, member_id=None, company_id=None):
+        """
+        Initialize the principal.
+
+        :param user_id: The primary key of the user, if authenticated
+        :type user_id: int | None
+
+        :param group_id: The primary key of the group of the user
+        :type group_id: int | None
+
+        :param member_id: The primary key of the membership of the user
+        :type member_id: int | None
+
+        :param company_id: The primary key of the company of the user
+        :type company_id: int | None
+        """
+        self.user_id = user_id
+        self.group_id = group_id
+        self.member_id = member_id
+        self.company_id = company_id
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Resolve the principal of a user with at most a single query.
+
+        No query is needed when the membership was selected together
+        with the user, like the token authentication does.
+
+        :param user: The user to resolve the principal for
+        :type user: accounts.models.User | django.contrib.auth.models.AnonymousUser
+
+        :return: The principal of the user
+        :rtype: accounts.principal.Principal
+        """
+        if not user.is_authenticated:
+            return cls(None, None)
+
+        relation = user._meta.get_field("member")
+
+        # The membership might be selected together with the user already
+        if relation.is_cached(user):
+            member = relation.get_cached_value(user)
+            member = member and (member.id, member.company_id)
+
+        else:
+            member = Member.objects.filter(account=user.id)
+            member = member.values_list("id", "company_id").first()
+
+        return cls(user.id, user.group_id, *(member or ()))
+
+
+def get_principal(request):
+    """
+    Get the principal of the user of the request.
+
+    The principal is normally attached by the authentication, see
+    'accounts.authentication.TokenAuthentication', otherwise it's
+    resolved and cached on the user for the rest of the request.
+
+    :param request: The current request instance
+    :type request: rest_framework.request.Request
+
+    :return: The principal of the user of the request
+    :rtype: accounts.principal.Principal
+    """
+    user = request.user
+    principal = getattr(user, "principal", None)
+
+    if principal is None:
+        principal = Principal.for_user(user)
+        setattr(user, "principal", principal)
+
+    return principal
@@ -0,0 +1,152 @@
+"""Bulk registration of accounts for a company."""
+
+__all__ = (
+    "register",
+    "read_emails",
+    "process_job",
+)
+
+import io
+import csv
+import itertools
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from django.db.models.query import F
+from django.db.transaction import atomic
+from django.utils.timezone import now
+
+from accounts.utils import Groups
+from accounts.models import User, RegistrationJob
+from companies.models import Member
+
+from communications.utils import Environments, MultiMailTransport
+
+
+def register(emails, company, group, environ):
+    """
+    Create the accounts and memberships, and queue the notifications.
+
+    :param emails: The email addresses to register
+    :type emails: collections.abc.Iterable[str]
+
+    :param company: The company to register the accounts for
+    :type company: companies.models.Company
+
+    :param group: The group to assign the accounts to
+    :type group: int
+
+    :param environ: The environment of the notification email
+    :type environ: communications.utils.Environments
+
+    :return: The normalized addresses of the created accounts
+    :rtype: set[str]
+    """
+    created = User.objects.create_users(emails, group_id=group)
+
+    Member.objects.bulk_create(
+        Member(company=company, account=user) for user, _ in created
+    )
+
+    context = {"company": company.name}
+    transport = MultiMailTransport(context, environ, company)
+
+    transport.finish(
+        transport(user.email, {"email": user.email, "password": password})
+        for user, password in created
+    )
+
+    return {user.email for user, _ in created}
+
+
+def read_emails(file):
+    """
+    Read the email addresses from the first column of a csv file.
+
+    The file is read row by row, an optional header is skipped and
+    the rows with an invalid address are yielded as None.
+
+    :param file: The binary csv file to read
+    :type file: django.core.files.File
+
+    :return: An iterator over the addresses
+    :rtype: collections.abc.Iterator[str | None]
+    """
+    reader = csv.reader(io.TextIOWrapper(file, "utf-8-sig", newline=""))
+
+    for row in reader:
+        address = row[0].strip() if row else ""
+
+        if reader.line_num == 1 and address.lower() in ("email", "e-mail"):
+            continue
+
+        try:
+            validate_email(address)
+
+        except ValidationError:
+            yield None
+
+        else:
+            yield address
+
+
+def process_job(job, chunk_size=500):
+    """
+    Register all the employees of an uploaded csv file.
+
+    The file is processed in chunks of a fixed size, every chunk is
+    registered within its own transaction together with the progress.
+    The uploaded file is removed once the job is finished. The job has
+    to be claimed first, see 'RegistrationJobManager.claim'.
+
+    :param job: The job to process
+    :type job: accounts.models.RegistrationJob
+
+    :param chunk_size: The number of rows to register at once
+    :type chunk_size: int
+
+    :return: Whether or not the job finished successfully
+    :rtype: bool
+    """
+    queryset = RegistrationJob.objects.filter(id=job.id)
+
+    try:
+        with job.file.open("rb") as file:
+            rows = read_emails(file)
+
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+
+                if not chunk:
+                    break
+
+                emails = [email for email in chunk if email is not None]
+
+                with atomic():
+                    created = register(
+                        emails,
+                        job.company,
+                        Groups.employee,
+                        Environments.employee,
+                    )
+
+                    queryset.update(
+                        processed=F("processed") + len(chunk),
+                        registered=F("registered") + len(created),
+                        existing=F("existing") + len(emails) - len(created),
+                        invalid=F("invalid") + len(chunk) - len(emails),
+                        heartbeat=now(),
+                    )
+
+    except Exception as error:
+        queryset.update(
+            status=RegistrationJob.FAILED, error=str(error), finished=now()
+        )
+
+        return False
+
+    queryset.update(status=RegistrationJob.FINISHED, finished=now())
+    job.file.delete(save=False)
+
+    return True
@@ -2,19 +2,25 @@
 
 __all__ = (
     "AccountSerializer",
+    "BaseRegisterSerializer",
     "RegisterEmployerSerializer",
+    "RegistrationJobSerializer",
     "RegisterEmployeesSerializer",
 )
 
+from django.db.transaction import atomic
+
 from rest_framework.serializers import PrimaryKeyRelatedField
 from rest_framework.serializers import ListSerializer, Serializer
 from rest_framework.serializers import ModelSerializer, EmailField
+from rest_framework.serializers import ListField, DictField
 
 from accounts.utils import Groups
-from accounts.models import Group, User
+from accounts.models import User, RegistrationJob
+from accounts.validators import EmployerHasCompany
+from accounts.registration import register
 from companies.models import Company
-
-from communications.utils import MultiMailTransport
+from communications.utils import Environments
 
 
 class AccountSerializer(ModelSerializer):
@@ -25,113 +31,128 @@ class AccountSerializer(ModelSerializer):
         fields = ("id", "email", "group")
 
 
-class RegisterEmployerSerializer(Serializer):
-    """Create and register a new employer."""
+class BaseRegisterSerializer(Serializer):
+    """
+    Base serializer to register a set of user's for a company.
+
+    The accounts are created in bulk, see 'UserManager.create_users',
+    and the user's are notified through the email of the environment.
+    The outcome of every address is reported back as 'results'.
+    """
 
     update = None
     create = None
 
+    group = None
+    environ = None
+
     members = ListSerializer(child=EmailField())
-    company = PrimaryKeyRelatedField(queryset=Company.objects.all())
+    company = PrimaryKeyRelatedField(
+        queryset=Company.objects.all(),
+        validators=[EmployerHasCompany()],
+    )
+
+    results = ListField(child=DictField(), read_only=True)
 
+    @atomic
     def save(self, **kwargs):
         """
-        Register a new employer and notify him through email.
+        Create accounts for all the user's that are registered.
 
-        :param kwargs: additional key word arguments (ignored)
+        :param kwargs: Additional creation kwargs (ignored)
         :type kwargs: any
 
-        :return: The registered
-        :rtype: accounts.models.User
+        :return: The outcome for every registered address
+        :rtype: list[dict]
         """
-        group = Group.objects.get(id=Groups.employer)
-
         company = self.validated_data["company"]
         members = self.validated_data["members"]
 
-        transport = MultiMailTransport({"company": company.name}, 2, company)
+        created = register(members, company, self.group, self.environ)
+
+        results = self.report(members, created)
+        self.instance = {**self.validated_data, "results": results}
 
-        seeder = (transport(*self.employ(a, company, group)) for a in members)
-        return transport.finish(seeder)
+        return results
 
     @staticmethod
-    def employ(account, company, group):
+    def report(members, created):
         """
-        Create and initialize a single employer.
+        Determine the outcome of every registered address.
 
-        :param company: The company to employ the user for
-        :type company: companies.models.Company
+        :param members: The email addresses as registered
+        :type members: list[str]
 
-        :param account: The email address to create the account for
-        :type account: str
+        :param created: The normalized addresses of the created accounts
+        :type created: set[str]
 
-        :param group: The group to assign the user to
-        :type group: django.contrib.models.Group
-
-        :return: The parameters to the transport
-        :rtype: tuple
+        :return: The address and status for every address
+        :rtype: list[dict]
         """
-        password = User.objects.make_random_password(12)
-        instance = User.objects.create_user(email=account, password=password)
-        receiver = instance.email
+        seen = set()
+        results = []
 
-        instance.group = group
-        instance.member.create(company=company)
+        for address in members:
+            email = User.objects.normalize_email(address)
 
-        return receiver, {"email": receiver, "password": password}
+            if email in seen:
+                outcome = "duplicate"
+            elif email in created:
+                outcome = "created"
+            else:
+                outcome = "exists"
 
+            seen.add(email)
+            results.append({"email": address, "status": outcome})
 
-class RegisterEmployeesSerializer(Serializer):
-    """Serializer to register a set of user's."""
+        return results
 
-    update = None
-    create = None
 
-    members = ListSerializer(child=EmailField())
-    company = PrimaryKeyRelatedField(queryset=Company.objects.all())
+class RegisterEmployerSerializer(BaseRegisterSerializer):
+    """Create and register new employers."""
 
-    def save(self, **kwargs):
-        """
-        Create accounts for all the user's that are registered.
+    group = Groups.employer
+    environ = Environments.employer
 
-        :param kwargs: Additional creation kwargs (ignored)
-        :type kwargs: any
-
-        :return: The number of send emails
-        :rtype: int
-        """
-        group = Group.objects.get(id=Groups.employee)
-
-        company = self.validated_data["company"]
-        members = self.validated_data["members"]
-
-        transport = MultiMailTransport({"company": company.name}, 1, company)
 
-        seeder = (transport(*self.employ(a, company, group)) for a in members)
-        return transport.finish(seeder)
-
-    @staticmethod
-    def employ(account, company, group):
-        """
-        Create and initialize a single employee.
-
-        :param company: The company to employ the user for
-        :type company: companies.models.Company
-
-        :param account: The email address to create the account for
-        :type account: str
+class RegisterEmployeesSerializer(BaseRegisterSerializer):
+    """Serializer to register a set of user's."""
 
-        :param group: The group to assign the user to
-        :type group: django.contrib.models.Group
+    group = Groups.employee
+    environ = Environments.employee
 
-        :return: The parameters to the transport
-        :rtype: tuple
-        """
-        password = User.objects.make_random_password(12)
-        instance = User.objects.create_user(email=account, password=password)
-        receiver = instance.email
 
-        instance.group = group
-        instance.member.create(company=company)
+class RegistrationJobSerializer(ModelSerializer):
+    """Serializer to upload a csv file of employees and poll its progress."""
 
-        return receiver, {"email": receiver, "password": password}
+    class Meta:
+        model = RegistrationJob
+        fields = (
+            "id",
+            "file",
+            "company",
+            "status",
+            "processed",
+            "registered",
+            "existing",
+            "invalid",
+            "error",
+            "created",
+            "finished",
+        )
+
+        read_only_fields = (
+            "status",
+            "processed",
+            "registered",
+            "existing",
+            "invalid",
+            "error",
+            "created",
+            "finished",
+        )
+
+        extra_kwargs = {
+            "file": {"write_only": True},
+            "company": {"validators": [EmployerHasCompany()]},
+        }
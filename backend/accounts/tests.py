@@ -1,16 +1,36 @@
 """Tests for the accounts app."""
 
+import io
 import base64
+import datetime
+import tempfile
 
-from django.core import mail
 from django.urls import reverse
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.utils.timezone import now
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 from rest_framework import status
+from rest_framework.request import Request
 from rest_framework.test import URLPatternsTestCase, APITestCase
+from rest_framework.test import APIRequestFactory
 
+from accounts.utils import Groups, TokenCache
 from accounts.urls import urlpatterns
-from accounts.models import Group, User
+from accounts.models import Group, User, RegistrationJob
+
 from accounts.factories import UserFactory
+from accounts.factories import AuthFactory
+from accounts.principal import get_principal
+
+from communications.models import Email, Environment
+from communications.models import Variable, OutgoingMail
+
+from companies.factories import MemberFactory
 from companies.factories import CompanyFactory
 
 
@@ -55,11 +75,24 @@ def construct_headers(username, password):
 class ViewSetIntegrationTests(URLPatternsTestCase, APITestCase):
     """Tests for account's view-sets."""
 
+    fixtures = ["groups"]
     urlpatterns = urlpatterns
 
     @classmethod
     def setUpTestData(cls):
-        cls.user = UserFactory()
+        cls.user = UserFactory(group=Group.objects.get(id=Groups.management))
+        cls.token = AuthFactory(user=cls.user)
+
+        variable = Variable.objects.create(name="email", attr="email")
+
+        environ = Environment.objects.create(id=1, label="employees")
+        environ.variables.add(variable)
+
+        Email.objects.create(
+            subject="Account",
+            content="Welcome {email}",
+            environ=environ,
+        )
 
     def test_successful_login(self):
         headers = construct_headers(self.user.email, "password")
@@ -74,15 +107,227 @@ class ViewSetIntegrationTests(URLPatternsTestCase, APITestCase):
         self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
 
     def test_create_employees(self):
-        self.user.groups.add(Group.objects.get(id=2))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.plain}")
 
         company = CompanyFactory()
-        members = ["user1@example.com", "user1@example.com"]
+        members = [
+            "user1@example.com",
+            "user2@EXAMPLE.com",
+            "user1@example.com",
+            self.user.email,
+        ]
+
         content = {"company": company.id, "members": members}
+        response = self.client.post(
+            reverse("register-employees-list"), content, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["created", "created", "duplicate", "exists"],
+        )
+
+        employees = User.objects.filter(member__company=company)
 
-        response = self.client.post(reverse("register-employees"), content)
+        self.assertEqual(employees.count(), 2)
+        self.assertTrue(employees.filter(email="user2@example.com").exists())
+        self.assertFalse(employees.exclude(group=Groups.employee).exists())
+        self.assertEqual(OutgoingMail.objects.count(), 2)
+
+    def test_create_employees_passwords(self):
+        emails = [f"user{index}@example.com" for index in range(3)]
+        created = User.objects.create_users(emails, 2, group_id=Groups.employee)
+
+        self.assertEqual([user.email for user, _ in created], emails)
+
+        for user, password in created:
+            self.assertTrue(user.check_password(password))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestRegistrationJobView(URLPatternsTestCase, APITestCase):
+    """Tests for the csv upload of new employees."""
+
+    fixtures = ["groups"]
+    urlpatterns = urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(group=Group.objects.get(id=Groups.management))
+        cls.token = AuthFactory(user=cls.user)
+        cls.company = CompanyFactory()
+
+        variable = Variable.objects.create(name="email", attr="email")
+
+        environ = Environment.objects.create(id=1, label="employees")
+        environ.variables.add(variable)
+
+        Email.objects.create(
+            subject="Account",
+            content="Welcome {email}",
+            environ=environ,
+        )
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.plain}")
+
+    def test_upload(self):
+        rows = [
+            "email",
+            "user1@example.com",
+            "not an email",
+            "user2@example.com",
+            "user1@example.com",
+            self.user.email,
+        ]
+
+        content = "\r\n".join(rows).encode("utf-8")
+        upload = SimpleUploadedFile("employees.csv", content, "text/csv")
+
+        response = self.client.post(
+            reverse("register-employees-csv-list"),
+            {"company": self.company.id, "file": upload},
+            format="multipart",
+        )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(response.data["status"], RegistrationJob.PENDING)
+
+        call_command("process_registrations", chunk_size=2, stdout=io.StringIO())
+
+        url = reverse("register-employees-csv-detail", args=(response.data["id"],))
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["status"], RegistrationJob.FINISHED)
+        self.assertEqual(response.data["processed"], 5)
+        self.assertEqual(response.data["registered"], 2)
+        self.assertEqual(response.data["existing"], 2)
+        self.assertEqual(response.data["invalid"], 1)
+
+        employees = User.objects.filter(member__company=self.company)
+
+        self.assertEqual(employees.count(), 2)
+        self.assertEqual(OutgoingMail.objects.count(), 2)
+
+
+    def test_claim(self):
+        """Verify that a job is claimed once, and again when stale."""
+
+        upload = SimpleUploadedFile("employees.csv", b"a@example.com")
+        job = RegistrationJob.objects.create(company=self.company, file=upload)
+
+        self.assertTrue(RegistrationJob.objects.claim(job))
+        self.assertFalse(RegistrationJob.objects.claim(job))
+
+        self.assertEqual(RegistrationJob.objects.reset_stale(60), 0)
+
+        RegistrationJob.objects.update(
+            heartbeat=now() - datetime.timedelta(minutes=5)
+        )
+
+        self.assertEqual(RegistrationJob.objects.reset_stale(60), 1)
+        self.assertTrue(RegistrationJob.objects.claim(job))
+
+        job.file.delete(save=False)
+
+    def test_upload_for_other_company(self):
+        """Verify that an employer can't register for another company."""
+
+        employer = UserFactory(group=Group.objects.get(id=Groups.employer))
+        MemberFactory(account=employer, company=CompanyFactory())
+
+        token = AuthFactory(user=employer)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.plain}")
+
+        upload = SimpleUploadedFile("employees.csv", b"a@example.com")
+
+        response = self.client.post(
+            reverse("register-employees-csv-list"),
+            {"company": self.company.id, "file": upload},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RegistrationJob.objects.exists())
+
+
+class TestPrincipal(TestCase):
+    """Tests for the principal of a request."""
+
+    fixtures = ["groups"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.user = UserFactory(group=Group.objects.get(id=Groups.employer))
+        cls.member = MemberFactory(account=cls.user, company=cls.company)
+
+    def test_resolved_once(self):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = User.objects.get(id=self.user.id)
+
+        with self.assertNumQueries(1):
+            principal = get_principal(request)
+            get_principal(request)
+
+        self.assertEqual(principal.user_id, self.user.id)
+        self.assertEqual(principal.group_id, Groups.employer)
+        self.assertEqual(principal.member_id, self.member.id)
+        self.assertEqual(principal.company_id, self.company.id)
+
+
+class TestTokenCache(URLPatternsTestCase, APITestCase):
+    """Tests for the cache of validated authentication tokens."""
+
+    fixtures = ["groups"]
+    urlpatterns = urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(group=Group.objects.get(id=Groups.employee))
+        cls.token = AuthFactory(user=cls.user)
+
+        MemberFactory(account=cls.user, company=CompanyFactory())
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.plain}")
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("user"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_cached(self):
+        uncached = self._count_queries()
+        cached = self._count_queries()
+
+        self.assertEqual(cached, 1)
+        self.assertLess(cached, uncached)
+
+    def test_logout(self):
+        self.client.get(reverse("user"))
+        self.client.post(reverse("logout"))
+
+        # Any other process reads the same shared cache
+        key = TokenCache.key(self.token.plain.encode())
+        self.assertIsNone(TokenCache.get(key))
+
+        response = self.client.get(reverse("user"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted(self):
+        self.client.get(reverse("user"))
+
+        user = User.objects.get(id=self.user.id)
+        user.deleted = True
+        user.save()
+
+        key = TokenCache.key(self.token.plain.encode())
+        self.assertIsNone(TokenCache.get(key))
 
-        self.user.groups.
+        response = self.client.get(reverse("user"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
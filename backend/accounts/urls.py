@@ -12,6 +12,7 @@ from accounts.views import UserView
 from accounts.views import AccountViewSet
 from accounts.views import LogoutView, LoginView
 from accounts.views import RegisterEmployerViewSet
+from accounts.views import RegistrationJobViewSet
 from accounts.views import RegisterEmployeesViewSet
 
 router = SimpleRouter()
@@ -34,6 +35,12 @@ router.register(
     "register-employees"
 )
 
+router.register(
+    "register-employees-csv",
+    RegistrationJobViewSet,
+    "register-employees-csv"
+)
+
 urlpatterns = router.urls + [
     path("user/", UserView.as_view(), name="user"),
     path("login/", LoginView.as_view(), name="login"),
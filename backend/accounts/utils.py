@@ -2,13 +2,27 @@
 
 __all__ = (
     "Groups",
+    "TokenCache",
     "is_employer",
     "is_employee",
     "is_management",
+    "hash_passwords",
     "is_administrator",
 )
 
 import enum
+import hashlib
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.transaction import on_commit
+from django.utils.timezone import now
+from django.contrib.auth.hashers import make_password
+
+from utilities.caching import get_version, bump_version
 
 
 class Groups(enum.IntEnum):
@@ -30,7 +44,7 @@ def is_administrator(user):
     Check whether the user is a admin or not.
 
     :param user: The user to check for
-    :type user: accounts.models.User
+    :type user: accounts.models.User | accounts.principal.Principal
 
     :return: whether the user is a admin or not.
     :rtype: bool
@@ -43,7 +57,7 @@ def is_management(user, allow_admin=True):
     Check whether the user is a manager or not.
 
     :param user: The user to check for
-    :type user: accounts.models.User
+    :type user: accounts.models.User | accounts.principal.Principal
 
     :param allow_admin: Whether to give a false positive when admin or not
     :type allow_admin: bool
@@ -62,7 +76,7 @@ def is_employer(user, allow_admin=True):
     Check whether the user is a employer or not.
 
     :param user: The user to check for
-    :type user: accounts.models.User
+    :type user: accounts.models.User | accounts.principal.Principal
 
     :param allow_admin: Whether to give a false positive when admin or not
     :type allow_admin: bool
@@ -81,7 +95,7 @@ def is_employee(user, allow_admin=True):
     Check whether the user is a employee or not.
 
     :param user: The user to check for
-    :type user: accounts.models.User
+    :type user: accounts.models.User | accounts.principal.Principal
 
     :param allow_admin: Whether to give a false positive when admin or not
     :type allow_admin: bool
@@ -93,3 +107,174 @@ def is_employee(user, allow_admin=True):
         user.group_id == Groups.employee
         or (allow_admin and user.group_id == Groups.admin)
     )
+
+
+# The pool of processes shared by every call of 'hash_passwords'
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """
+    Get the pool of hashing processes, and create it on first use.
+
+    A single pool is created per process, so the worker is only forked
+    once instead of for every request that registers many accounts.
+
+    :param workers: The number of processes of a new pool
+    :type workers: int
+
+    :return: The shared pool of processes
+    :rtype: concurrent.futures.ProcessPoolExecutor
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(workers)
+
+        return _pool
+
+
+def hash_passwords(passwords, threshold=32):
+    """
+    Hash a collection of raw passwords.
+
+    Hashing is slow by design, so when there are many passwords they
+    are hashed in parallel by the shared pool of processes.
+
+    :param passwords: The raw passwords to hash
+    :type passwords: collections.abc.Iterable[str]
+
+    :param threshold: The number of passwords to start using processes
+    :type threshold: int
+
+    :return: The hashed passwords in the same order
+    :rtype: list[str]
+    """
+    passwords = list(passwords)
+
+    if len(passwords) < threshold:
+        return [make_password(password) for password in passwords]
+
+    workers = max(1, getattr(settings, "PASSWORD_HASHING_WORKERS", 1))
+    chunk = max(1, len(passwords) // (workers * 4))
+
+    executor = _get_pool(workers)
+    return list(executor.map(make_password, passwords, chunksize=chunk))
+
+
+class TokenCache(object):
+    """
+    Shared cache of validated authentication tokens.
+
+    The cache maps a hash of the raw token to the fields of the knox
+    token, so that the token doesn't have to be queried and compared
+    on every request. The entries expire after 'ttl' seconds or when
+    the token expires.
+
+    The entries are kept in the cache shared by all the processes, see
+    'CACHES', under the version of the tokens of their user. The
+    signals within 'accounts.models' bump that version when a token is
+    deleted or a user is marked as deleted, so the cached tokens of the
+    user are dropped within every process at once.
+    """
+
+    ttl = 60
+
+    @staticmethod
+    def key(token):
+        """
+        Hash the raw token, so that it's never kept in the cache.
+
+        :param token: The raw token as send by the client
+        :type token: bytes
+
+        :return: The cache key of the token
+        :rtype: str
+        """
+        return f"accounts.tokens.{hashlib.sha256(token).hexdigest()}"
+
+    @staticmethod
+    def namespace(user_id):
+        """
+        Create the namespace of the version of the tokens of a user.
+
+        :param user_id: The primary key of the user
+        :type user_id: int
+
+        :return: The namespace, see 'utilities.caching'
+        :rtype: str
+        """
+        return f"accounts.tokens.user.{user_id}"
+
+    @classmethod
+    def get(cls, key):
+        """
+        Get the fields of a validated token.
+
+        :param key: The key of the token, see 'key'
+        :type key: str
+
+        :return: The fields of the token, if cached and still valid
+        :rtype: dict | None
+        """
+        entry = cache.get(key)
+
+        if entry is None:
+            return None
+
+        version, fields = entry
+
+        if version != get_version(cls.namespace(fields["user_id"])):
+            return None
+
+        return fields
+
+    @classmethod
+    def set(cls, key, token):
+        """
+        Cache a validated token.
+
+        :param key: The key of the token, see 'key'
+        :type key: str
+
+        :param token: The validated token
+        :type token: knox.models.AuthToken
+        """
+        timeout = cls.ttl
+
+        if token.expiry is not None:
+            remaining = (token.expiry - now()).total_seconds()
+            timeout = min(timeout, int(remaining))
+
+        if timeout <= 0:
+            return
+
+        fields = {
+            "digest": token.digest,
+            "token_key": token.token_key,
+            "salt": token.salt,
+            "created": token.created,
+            "expiry": token.expiry,
+            "user_id": token.user_id,
+        }
+
+        version = get_version(cls.namespace(token.user_id))
+        cache.set(key, (version, fields), timeout)
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Drop the cached tokens of a user, within every process.
+
+        The version is bumped again after the commit, so tokens that
+        were cached while the transaction was pending are dropped too.
+
+        :param user_id: The primary key of the user
+        :type user_id: int
+        """
+        namespace = cls.namespace(user_id)
+
+        bump_version(namespace)
+        on_commit(lambda: bump_version(namespace))
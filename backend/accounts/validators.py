@@ -2,11 +2,13 @@
 
 __all__ = (
     "GroupValidator",
+    "EmployerHasCompany",
     "BaseGroupValidation",
 )
 
-from accounts.utils import Groups
+from accounts.utils import Groups, is_management
 from accounts.models import User
+from accounts.principal import get_principal
 
 from rest_framework.exceptions import ValidationError
 
@@ -111,3 +113,34 @@ class GroupValidator(BaseGroupValidation):
         :rtype: bool
         """
         return instance.group_id == self.ident
+
+
+class EmployerHasCompany(object):
+    """Check if a company that is tried to be set is the user's company."""
+
+    def __call__(self, company):
+        """
+        Validate that a non management user registers for their company.
+
+        :param company: The company to verify
+        :type company: companies.models.Company
+
+        :return: The validated company
+        :rtype: companies.models.Company
+        """
+        principal = getattr(self, "principal")
+
+        if is_management(principal) or company.id == principal.company_id:
+            return company
+
+        raise ValidationError("The users company isn't this company")
+
+    def set_context(self, serializer):
+        """
+        Extract the principal of the current user from the request.
+
+        :param serializer: The currently active serializer field
+        :type serializer: rest_framework.serializers.Field
+        """
+        principal = get_principal(serializer.context["request"])
+        setattr(self, "principal", principal)
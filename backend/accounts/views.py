@@ -10,6 +10,7 @@ __all__ = (
 
     "RegisterEmployerViewSet",
     "RegisterEmployeesViewSet",
+    "RegistrationJobViewSet",
 )
 
 from knox.views import LogoutView
@@ -20,8 +21,14 @@ from django.db.models.query import Q
 from rest_framework.views import APIView
 from rest_framework.viewsets import ViewSetMixin
 from rest_framework.generics import CreateAPIView
+from rest_framework.viewsets import GenericViewSet
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+
+from rest_framework.parsers import MultiPartParser
+
 from rest_framework.response import Response
 from rest_framework.authentication import BasicAuthentication
 
@@ -30,7 +37,8 @@ from accounts.utils import is_employee
 from accounts.utils import is_employer
 from accounts.utils import is_management
 
-from accounts.models import User
+from accounts.models import User, RegistrationJob
+from accounts.principal import get_principal
 
 from accounts.permissions import IsEmployer
 from accounts.permissions import IsAcceptable
@@ -38,8 +46,12 @@ from accounts.permissions import IsManagement
 
 from accounts.serializers import AccountSerializer
 from accounts.serializers import RegisterEmployerSerializer
+from accounts.serializers import RegistrationJobSerializer
 from accounts.serializers import RegisterEmployeesSerializer
 
+from utilities.mixins import InstrumentedMixin
+from utilities.mixins import ReplicaMixin
+
 
 class LoginView(BaseLoginView):
     """Overridden login view for HTTP basic authentication."""
@@ -58,7 +70,7 @@ class UserView(APIView):
         return Response(serializer.data)
 
 
-class AccountViewSet(ReadOnlyModelViewSet):
+class AccountViewSet(InstrumentedMixin, ReplicaMixin, ReadOnlyModelViewSet):
     """View-set for reading account info and linking."""
 
     queryset = User.objects.all()
@@ -76,28 +88,67 @@ class AccountViewSet(ReadOnlyModelViewSet):
         :rtype: django.db.models.query.QuerySet
         """
         query = Q()
-        if is_employee(self.request.user, False):
-            query &= Q(id=self.request.user.id)
+        principal = get_principal(self.request)
 
-        if is_employer(self.request.user, False):
+        if is_employee(principal, False):
+            query &= Q(id=principal.user_id)
+
+        if is_employer(principal, False):
             query &= Q(group=Groups.employee)
-            query &= Q(member__company=self.request.user.member.company)
+            query &= Q(member__company=principal.company_id)
 
-        if is_management(self.request.user, False):
+        if is_management(principal, False):
             query &= ~Q(group=Groups.admin)
 
         return queryset.filter(query)
 
 
-class RegisterEmployerViewSet(ViewSetMixin, CreateAPIView):
+class RegisterEmployerViewSet(InstrumentedMixin, ViewSetMixin, CreateAPIView):
     """View-set for registering a single employer."""
 
     serializer_class = RegisterEmployerSerializer
     permission_classes = (IsManagement,)
 
 
-class RegisterEmployeesViewSet(ViewSetMixin, CreateAPIView):
+class RegisterEmployeesViewSet(InstrumentedMixin, ViewSetMixin, CreateAPIView):
     """View-set for registering new employees."""
 
     serializer_class = RegisterEmployeesSerializer
     permission_classes = (IsManagement | IsEmployer,)
+
+
+class RegistrationJobViewSet(
+    InstrumentedMixin,
+    CreateModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
+    """
+    View-set for uploading a csv file of new employees.
+
+    The upload only stores the file and returns the job, which is
+    processed by the 'process_registrations' management command. The
+    job can be retrieved to poll the progress.
+    """
+
+    queryset = RegistrationJob.objects.all()
+    parser_classes = (MultiPartParser,)
+    serializer_class = RegistrationJobSerializer
+    permission_classes = (IsManagement | IsEmployer,)
+
+    def filter_queryset(self, queryset):
+        """
+        Filter the jobs for the company of an employer.
+
+        :param queryset: The queryset to filter
+        :type queryset: django.db.models.query.QuerySet
+
+        :return: The jobs the user is allowed to see
+        :rtype: django.db.models.query.QuerySet
+        """
+        principal = get_principal(self.request)
+
+        if is_employer(principal, False):
+            queryset = queryset.filter(company=principal.company_id)
+
+        return queryset
@@ -1 +1,167 @@
 """Factories for activity related models."""
+
+__all__ = (
+    "AnswerFactory",
+    "AnswersFactory",
+    "SessionFactory",
+    "AnsweredFactory",
+    "QuestionFactory",
+    "QuestionSetFactory",
+    "QuestionThemeFactory",
+)
+
+import datetime
+
+from factory.faker import Faker
+from factory.django import DjangoModelFactory
+from factory.helpers import lazy_attribute, post_generation
+from factory.declarations import SubFactory, Sequence
+
+from django.utils.timezone import now
+
+from activities.models import Answer
+from activities.models import Answers
+from activities.models import Answered
+from activities.models import Session
+from activities.models import Question
+from activities.models import QuestionSet
+from activities.models import QuestionTheme
+
+from companies.factories import CompanyFactory
+
+
+class QuestionThemeFactory(DjangoModelFactory):
+    """Factory for question themes."""
+
+    class Meta:
+        model = QuestionTheme
+
+    label = Faker("word")
+
+
+class QuestionSetFactory(DjangoModelFactory):
+    """Factory for question sets."""
+
+    class Meta:
+        model = QuestionSet
+
+    label = Faker("word")
+
+    @post_generation
+    def theme(self, create, extracted, **kwargs):
+        """
+        Link the question set to the given themes.
+
+        :param create: Whether the instance was created or just build
+        :type create: bool
+
+        :param extracted: The themes to link the question set to
+        :type extracted: list[activities.models.QuestionTheme] | None
+
+        :param kwargs: Additional keyword arguments (ignored)
+        :type kwargs: any
+        """
+        if create and extracted:
+            self.theme.add(*extracted)
+
+
+class AnswersFactory(DjangoModelFactory):
+    """Factory for a collection of possible answers."""
+
+    class Meta:
+        model = Answers
+
+    label = Sequence(lambda n: f"answers {n}")
+
+
+class AnswerFactory(DjangoModelFactory):
+    """Factory for a single answer of an answer collection."""
+
+    class Meta:
+        model = Answer
+
+    label = Sequence(lambda n: f"answer {n}")
+    order = Sequence(lambda n: n)
+    answers = SubFactory(AnswersFactory)
+
+
+class QuestionFactory(DjangoModelFactory):
+    """Factory for a single question."""
+
+    class Meta:
+        model = Question
+
+    set = SubFactory(QuestionSetFactory)
+    answers = SubFactory(AnswersFactory)
+    question = Sequence(lambda n: f"question {n}?")
+
+
+class SessionFactory(DjangoModelFactory):
+    """
+    Factory for a session.
+
+    The sessions that are generated by this factory are alive from
+    one day in the past until one day in the future.
+    """
+
+    class Meta:
+        model = Session
+
+    set = SubFactory(QuestionSetFactory)
+    theme = SubFactory(QuestionThemeFactory)
+    company = SubFactory(CompanyFactory)
+
+    @lazy_attribute
+    def start(self):
+        """
+        Generate the start of the session.
+
+        :return: The moment the session starts
+        :rtype: datetime.datetime
+        """
+        return now() - datetime.timedelta(days=1)
+
+    @lazy_attribute
+    def until(self):
+        """
+        Generate the end of the session.
+
+        :return: The moment the session ends
+        :rtype: datetime.datetime
+        """
+        return now() + datetime.timedelta(days=1)
+
+
+class AnsweredFactory(DjangoModelFactory):
+    """
+    Factory for answered questions.
+
+    The 'answerer' must always be provided because it must be a
+    member of the session's company.
+    """
+
+    class Meta:
+        model = Answered
+
+    value = 1
+    session = SubFactory(SessionFactory)
+
+    @lazy_attribute
+    def question(self):
+        """
+        Generate a question that belongs to the session's set.
+
+        :return: The question that is answered
+        :rtype: activities.models.Question
+        """
+        return QuestionFactory(set=self.session.set)
+
+    @lazy_attribute
+    def answer(self):
+        """
+        Generate a answer that belongs to the question.
+
+        :return: The answer that was given
+        :rtype: activities.models.Answer
+        """
+        return AnswerFactory(answers=self.question.answers)
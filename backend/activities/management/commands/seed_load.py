@@ -0,0 +1,79 @@
+"""Management command to generate synthetic data for load tests."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from activities.seeding import LoadSeeder
+
+
+class Command(BaseCommand):
+    """
+    Generate companies, members and their answered sessions in bulk.
+
+    The same seed always generates the same data, but every run adds
+    new records, see 'activities.seeding.LoadSeeder'.
+    """
+
+    help = "Generate production-like volumes of data for load tests."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        sizes = (
+            ("--companies", 10, "The number of companies."),
+            ("--members", 20, "The number of members per company."),
+            ("--themes", 4, "The number of question themes."),
+            ("--sessions", 4, "The number of sessions per company."),
+            ("--questions", 10, "The number of questions per theme."),
+            ("--options", 5, "The number of answers per question."),
+            ("--metadata", 2, "The number of metadata types per company."),
+            ("--seed", 0, "The seed of the random generator."),
+            ("--batch-size", 5000, "The number of records to insert at once."),
+        )
+
+        for name, default, description in sizes:
+            parser.add_argument(
+                name, type=int, default=default, help=description
+            )
+
+        parser.add_argument(
+            "--password",
+            default="seed",
+            help="The password of every generated account.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually generate the data, and report the number of records.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        start = time.perf_counter()
+
+        seeder = LoadSeeder(
+            options["seed"], options["batch_size"], options["password"]
+        )
+
+        counts = seeder.seed_all(
+            options["companies"],
+            options["members"],
+            options["themes"],
+            options["sessions"],
+            options["questions"],
+            options["options"],
+            options["metadata"],
+        )
+
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f"{label}: {count}")
+
+        self.stdout.write(f"Finished in {time.perf_counter() - start:.1f}s")
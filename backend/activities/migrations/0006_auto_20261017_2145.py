@@ -0,0 +1,34 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0005_question_weight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionset',
+            name='weight',
+            field=models.DecimalField(decimal_places=1, default=1, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='questiontheme',
+            name='weight',
+            field=models.DecimalField(decimal_places=1, default=1, max_digits=3),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='weight',
+            field=models.DecimalField(decimal_places=1, default=1, max_digits=3),
+        ),
+        migrations.AlterField(
+            model_name='session',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='companies.Company'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:46
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0006_auto_20261017_2145'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answered',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
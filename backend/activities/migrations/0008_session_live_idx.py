@@ -0,0 +1,17 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0007_answered_created'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['company', 'until', 'start'], name='activities_session_live_idx'),
+        ),
+    ]
@@ -14,7 +14,12 @@ __all__ = (
 
 )
 
+from django.db.transaction import on_commit
+from django.dispatch.dispatcher import receiver
+
 from django.db.models import Model
+from django.db.models.signals import post_save, post_delete
+from django.db.models.indexes import Index
 from django.db.models.fields import TextField
 from django.db.models.fields import CharField
 from django.db.models.fields import DecimalField
@@ -23,10 +28,13 @@ from django.db.models.fields import PositiveSmallIntegerField
 from django.db.models.fields.related import CASCADE, ForeignKey
 from django.db.models.fields.related import SET_NULL, ManyToManyField
 
+from django.utils.timezone import now
+
 from accounts.models import User
 from companies.models import Company
 from analytics.models import MetaBase
-from activities.utils import AnswerStyles
+from utilities.caching import bump_version
+from activities.utils import CATALOG, AnswerStyles
 
 
 class QuestionTheme(MetaBase, Model):
@@ -73,6 +81,14 @@ class Session(Model):
     class Meta:
         unique_together = ("company", "theme")
 
+        # The live sessions of a company are found by a range on 'until'
+        indexes = [
+            Index(
+                fields=("company", "until", "start"),
+                name="activities_session_live_idx",
+            ),
+        ]
+
     set = ForeignKey(QuestionSet, CASCADE, "sessions")
     theme = ForeignKey(QuestionTheme, CASCADE, "sessions")
 
@@ -95,6 +111,19 @@ class Answers(Model):
         AnswerStyle, CASCADE, "styles", default=AnswerStyles.radio
     )
 
+    @property
+    def current_values(self):
+        """
+        The answers that weren't (soft) deleted.
+
+        Filtered from all the answers, so that the prefetched answers are
+        used when available, see 'AnswersViewSet'.
+
+        :return: The answers of the collection
+        :rtype: list[activities.models.Answer]
+        """
+        return [value for value in self.values.all() if value.deleted is None]
+
 
 class Answer(Model):
     """
@@ -162,6 +191,8 @@ class Answered(Model):
     answerer = ForeignKey(User, CASCADE, "answered_questions")
     question = ForeignKey(Question, SET_NULL, "answered_questions", null=True)
 
+    created = DateTimeField(default=now, editable=False)
+
 
 class AnsweredPlain(Model):
     """
@@ -193,3 +224,25 @@ class Reflection(Model):
     answerer = ForeignKey(User, CASCADE, "reflections")
     question = ForeignKey(Question, CASCADE, "reflections")
     description = TextField()
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_save, sender=Answers)
+@receiver(post_delete, sender=Answer)
+@receiver(post_delete, sender=Answers)
+def _invalidate_catalog(sender, **kwargs):
+    """
+    Invalidate the cached responses of the survey catalog.
+
+    The version is bumped again after the commit, so responses that were
+    cached while the transaction was pending are invalidated as well.
+
+    :param sender: The model's class
+    :type sender: type of django.db.models.Model
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    bump_version(CATALOG)
+    on_commit(lambda: bump_version(CATALOG))
+    del sender, kwargs
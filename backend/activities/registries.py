@@ -0,0 +1,10 @@
+"""Registries of the constant activity tables."""
+
+__all__ = (
+    "answer_styles",
+)
+
+from utilities.registry import Registry
+
+# The styles of the 'styles.json' fixture, see 'activities.utils'
+answer_styles = Registry("activities.AnswerStyle", ("label",))
@@ -0,0 +1,434 @@
+"""Bulk generation of synthetic data for load tests."""
+
+__all__ = (
+    "LoadSeeder",
+)
+
+import random
+import decimal
+import datetime
+import collections
+
+from django.db import connection
+from django.db.models.aggregates import Max
+from django.db.transaction import atomic, on_commit
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.utils.timezone import localdate, now
+
+from accounts.utils import Groups
+from accounts.models import User
+
+from activities.models import Answer
+from activities.models import Answers
+from activities.models import Answered
+from activities.models import Session
+from activities.models import Question
+from activities.models import QuestionSet
+from activities.models import QuestionTheme
+from activities.utils import CATALOG
+
+from analytics.models import MetaData
+from analytics.models import MetaLink
+from analytics.models import MetaType
+from analytics.models import UserMeta
+from analytics.models import SessionScore
+
+from companies.models import Company, Member, ColourTheme
+
+from utilities.caching import bump_version
+
+# The models in the order they are inserted, so that every record is
+# inserted after the records it refers to
+MODELS = (
+    QuestionTheme,
+    QuestionSet,
+    QuestionSet.theme.through,
+    Answers,
+    Answer,
+    Question,
+    Company,
+    ColourTheme,
+    MetaLink,
+    MetaType,
+    MetaData,
+    User,
+    Member,
+    UserMeta,
+    Session,
+    Answered,
+    SessionScore,
+)
+
+# The length of every session, sessions of a company follow each other
+SESSION_LENGTH = datetime.timedelta(days=30)
+
+
+class LoadSeeder(object):
+    """
+    Generator of production-like volumes of data.
+
+    The records are generated with a seeded random generator, and are
+    inserted with 'bulk_create' in batches. The primary keys are given
+    up front, so that related records can be generated without reading
+    anything back from the database, and the sequences are reset once
+    all the records are inserted.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, password="seed"):
+        """
+        Initialize the seeder.
+
+        :param seed: The seed of the random generator
+        :type seed: int
+
+        :param batch_size: The number of records to insert at once
+        :type batch_size: int
+
+        :param password: The raw password of every generated account
+        :type password: str
+        """
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+
+        # Hashing is slow by design, so every account shares the hash
+        self.password = make_password(password)
+
+        self.counts = collections.Counter()
+        self.buffers = collections.OrderedDict((m, []) for m in MODELS)
+
+        self.identifiers = {}
+        self.orders = collections.Counter()
+
+    def seed_all(self, companies, members, themes, sessions, questions,
+                 options, metadata):
+        """
+        Generate the complete data set.
+
+        :param companies: The number of companies
+        :type companies: int
+
+        :param members: The number of members per company
+        :type members: int
+
+        :param themes: The number of question themes, each with a set
+        :type themes: int
+
+        :param sessions: The number of sessions per company
+        :type sessions: int
+
+        :param questions: The number of questions per set
+        :type questions: int
+
+        :param options: The number of answers per question
+        :type options: int
+
+        :param metadata: The number of metadata types per company
+        :type metadata: int
+
+        :return: The number of inserted records per model
+        :rtype: collections.Counter
+        """
+        sets = self.seed_survey(themes, questions, options)
+
+        # A company can't have two sessions of the same theme
+        sessions = min(sessions, len(sets))
+
+        for _ in range(companies):
+            self.seed_company(sets, members, sessions, metadata)
+
+        self.flush()
+        self.reset_sequences()
+
+        return self.counts
+
+    def seed_survey(self, themes, questions, options):
+        """
+        Generate the question themes and their sets of questions.
+
+        :param themes: The number of question themes, each with a set
+        :type themes: int
+
+        :param questions: The number of questions per set
+        :type questions: int
+
+        :param options: The number of answers per question
+        :type options: int
+
+        :return: The theme, set and questions with their answers per set
+        :rtype: list[tuple[int, int, list[tuple[int, list[int]]]]]
+        """
+        sets = []
+
+        for _ in range(themes):
+            theme = self.add(
+                QuestionTheme,
+                weight=self._weight(),
+                label=f"Theme {self.seed}.{self._peek(QuestionTheme)}",
+            )
+
+            question_set = self.add(
+                QuestionSet,
+                weight=self._weight(),
+                label=f"Set {self.seed}.{self._peek(QuestionSet)}",
+            )
+
+            self.add(
+                QuestionSet.theme.through,
+                questionset_id=question_set,
+                questiontheme_id=theme,
+            )
+
+            answers = self.add(
+                Answers,
+                label=f"Answers {self.seed}.{self._peek(Answers)}",
+            )
+
+            values = [
+                self.add(
+                    Answer, answers_id=answers, order=order, label=f"{order}"
+                )
+                for order in range(options)
+            ]
+
+            items = []
+
+            for _ in range(questions):
+                label = f"Question {self.seed}.{self._peek(Question)}?"
+                question = self.add(
+                    Question,
+                    set_id=question_set,
+                    answers_id=answers,
+                    weight=self._weight(),
+                    question=label,
+                )
+
+                items.append((question, values))
+
+            sets.append((theme, question_set, items))
+
+        return sets
+
+    def seed_company(self, sets, members, sessions, metadata):
+        """
+        Generate a company with its members and their answered sessions.
+
+        :param sets: The generated survey, see 'seed_survey'
+        :type sets: list[tuple[int, int, list[tuple[int, list[int]]]]]
+
+        :param members: The number of members
+        :type members: int
+
+        :param sessions: The number of sessions
+        :type sessions: int
+
+        :param metadata: The number of metadata types
+        :type metadata: int
+        """
+        company = self.add(Company, name=f"Company {self._peek(Company)}")
+
+        self.add(
+            ColourTheme,
+            company_id=company,
+            primary=self.random.randrange(0x1000000),
+            accent=self.random.randrange(0x1000000),
+        )
+
+        link = self.add(MetaLink, company_id=company)
+        types = []
+
+        for _ in range(metadata):
+            meta_type = self.add(
+                MetaType, link_id=link, name=f"Type {self._peek(MetaType)}"
+            )
+
+            options = []
+
+            for index in range(3):
+                weight = self._weight()
+                meta = self.add(
+                    MetaData,
+                    meta_type_id=meta_type,
+                    weight=weight,
+                    option=f"Option {index}",
+                )
+
+                options.append((meta, weight))
+
+            types.append(options)
+
+        until = now() + SESSION_LENGTH / 2
+        offset = self.random.randrange(len(sets))
+        schedule = []
+
+        for index in range(sessions):
+            theme, question_set, items = sets[(offset + index) % len(sets)]
+            start = until - SESSION_LENGTH
+
+            session = self.add(
+                Session,
+                set_id=question_set,
+                theme_id=theme,
+                company_id=company,
+                start=start,
+                until=until,
+            )
+
+            schedule.append((session, theme, start, min(until, now()), items))
+            until = start
+
+        scores = collections.defaultdict(lambda: [0, 0])
+
+        for index in range(members):
+            group = Groups.employer if index == 0 else Groups.employee
+            chosen = [self.random.choice(option) for option in types]
+
+            user = self.add(
+                User,
+                email=f"{self._peek(User)}@seed-{self.seed}.example.com",
+                password=self.password,
+                group_id=group,
+                meta_total=sum(weight for _, weight in chosen),
+                meta_count=len(chosen),
+            )
+
+            self.add(Member, company_id=company, account_id=user)
+
+            for meta, _ in chosen:
+                self.add(UserMeta, meta_id=meta, user_id=user)
+
+            if group != Groups.employee:
+                continue
+
+            for session, theme, start, end, items in schedule:
+                created = start + (end - start) * self.random.random()
+                day = localdate(created)
+
+                for question, values in items:
+                    value = self.random.randrange(len(values))
+
+                    self.add(
+                        Answered,
+                        value=value,
+                        answer_id=values[value],
+                        session_id=session,
+                        answerer_id=user,
+                        question_id=question,
+                        created=created,
+                        _order=self._order(question),
+                    )
+
+                    score = scores[(session, theme, day)]
+                    score[0] += value
+                    score[1] += 1
+
+        for (session, theme, day), (total, count) in scores.items():
+            self.add(
+                SessionScore,
+                day=day,
+                total=total,
+                count=count,
+                theme_id=theme,
+                session_id=session,
+                company_id=company,
+            )
+
+    def add(self, model, **fields):
+        """
+        Add a record to be inserted, inserting the batch when it's full.
+
+        :param model: The model of the record
+        :type model: type of django.db.models.Model
+
+        :param fields: The values of the fields of the record
+        :type fields: any
+
+        :return: The primary key of the record
+        :rtype: int
+        """
+        identifier = self._peek(model)
+        self.identifiers[model] = identifier + 1
+
+        buffer = self.buffers[model]
+        buffer.append(model(id=identifier, **fields))
+
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+        return identifier
+
+    @atomic
+    def flush(self):
+        """
+        Insert the added records, in the order of their relations.
+
+        The bulk inserts don't send any signals, so the cached catalog
+        responses are invalidated here, like '_invalidate_catalog' does.
+        """
+        for model, buffer in self.buffers.items():
+            if buffer:
+                # The backend splits the insert by its own limits
+                model.objects.bulk_create(buffer)
+
+                self.counts[model._meta.label] += len(buffer)
+                buffer.clear()
+
+        bump_version(CATALOG)
+        on_commit(lambda: bump_version(CATALOG))
+
+    def reset_sequences(self):
+        """Reset the sequences of the primary keys that were given."""
+
+        statements = connection.ops.sequence_reset_sql(no_style(), MODELS)
+
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def _peek(self, model):
+        """
+        Determine the primary key of the next record of a model.
+
+        :param model: The model of the record
+        :type model: type of django.db.models.Model
+
+        :return: The primary key of the next record
+        :rtype: int
+        """
+        if model not in self.identifiers:
+            last = model.objects.aggregate(last=Max("id"))["last"]
+            self.identifiers[model] = (last or 0) + 1
+
+        return self.identifiers[model]
+
+    def _order(self, question):
+        """
+        Determine the order of the next answer to a question.
+
+        Answered questions are ordered with respect to the question,
+        which 'bulk_create' doesn't maintain by itself.
+
+        :param question: The primary key of the question
+        :type question: int
+
+        :return: The order of the answered question
+        :rtype: int
+        """
+        if question not in self.orders:
+            answered = Answered.objects.filter(question=question)
+            self.orders[question] = answered.count()
+
+        order = self.orders[question]
+        self.orders[question] += 1
+
+        return order
+
+    def _weight(self):
+        """
+        Generate a weight between 0.5 and 1.5.
+
+        :return: The weight with a single decimal
+        :rtype: decimal.Decimal
+        """
+        return decimal.Decimal(self.random.randint(5, 15)) / 10
@@ -5,7 +5,9 @@ __all__ = (
     "AnswersSerializer",
     "SessionSerializer",
     "AnsweredSerializer",
+    "ExportParameterSerializer",
     "QuestionSerializer",
+    "BulkAnsweredSerializer",
     "ReflectionSerializer",
     "QuestionSetSerializer",
     "AnswerStyleSerializer",
@@ -15,15 +17,21 @@ __all__ = (
 import datetime
 
 from django.db.models.query import Q
+from django.db.models.aggregates import Count
+from django.db.transaction import atomic
 
 from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import IntegerField
+from rest_framework.serializers import ChoiceField
 from rest_framework.serializers import ModelSerializer
 from rest_framework.serializers import CurrentUserDefault
+from rest_framework.serializers import PrimaryKeyRelatedField
+from rest_framework.serializers import ListSerializer, Serializer
 
 from activities.models import Answer
 from activities.models import Answers
 from activities.models import Answered
+from activities.models import AnsweredPlain
 from activities.models import AnswerStyle
 from activities.models import Session
 from activities.models import Question
@@ -41,11 +49,13 @@ from accounts.models import User
 from accounts.validators import GroupValidator
 
 from analytics.query import get_value_query
+from analytics.models import SessionScore
 
 from companies.models import Company
-from communications.utils import MultiMailTransport
+from communications.utils import Environments, MultiMailTransport
 
 from utilities.fields import HyperlinkedRelatedReadField
+from utilities.streaming import STREAM_FORMATS
 
 
 class QuestionSerializer(ModelSerializer):
@@ -74,6 +84,7 @@ class QuestionSetSerializer(ModelSerializer):
         fields = ("id", "label", "theme")
 
     theme = HyperlinkedRelatedReadField(
+        many=True,
         queryset=QuestionTheme.objects.all(),
         view_name="",
     )
@@ -95,8 +106,10 @@ class AnswersSerializer(ModelSerializer):
         fields = ("id", "label", "values")
 
     values = HyperlinkedRelatedReadField(
-        queryset=Answer.objects.filter(deleted__isnull=True),
-        view_name="",
+        many=True,
+        read_only=True,
+        source="current_values",
+        view_name="answer-detail",
     )
 
 
@@ -162,7 +175,7 @@ class QuestionThemeSerializer(ModelSerializer):
 
     class Meta:
         model = QuestionTheme
-        fields = ("id", "label", "sets")
+        fields = ("id", "label", "sets", "sessions")
 
     sets = HyperlinkedRelatedReadField(
         many=True,
@@ -227,20 +240,31 @@ class AnsweredSerializer(ModelSerializer):
         value and delete the answer, or change it, safely and maintain
         data integrity.
 
+        The materialized session scores are updated within the same
+        transaction, so that the charts never have to aggregate all the
+        answered questions again.
+
         :param kwargs: The additional data to add to validated_data
         :type kwargs: any
 
         :return: The newly created 'Answered' instance
         :rtype: activities.models.Answered
         """
-        return ModelSerializer.save(self, **kwargs, value=self.get_calc())
+        with atomic():
+            instance = ModelSerializer.save(
+                self, **kwargs, value=self.get_calc()
+            )
+
+            SessionScore.objects.track(instance)
+
+        return instance
 
     def get_calc(self):
         """
-        Get the query to calculate the value.
+        Calculate the weighted value.
 
-        :return: The query to calculate the value.
-        :rtype: django.db.models.query.QuerySet
+        :return: The calculated value.
+        :rtype: decimal.Decimal
         """
         user = self.context["request"].user
         data = self.validated_data["value"]
@@ -300,6 +324,141 @@ class AnsweredSerializer(ModelSerializer):
         return extra
 
 
+class _BulkAnswerSerializer(Serializer):
+    """Serializer for a single answer within a bulk submission."""
+
+    update = None
+    create = None
+
+    value = IntegerField(min_value=0, max_value=100)
+    answer = IntegerField()
+    question = IntegerField()
+
+
+class BulkAnsweredSerializer(Serializer):
+    """
+    Serializer to answer the questions of a session at once.
+
+    The questions and answers are validated with a fixed number of
+    queries regardless of the number of answers, and the answered
+    questions are inserted with a single query.
+    """
+
+    update = None
+    create = None
+
+    session = PrimaryKeyRelatedField(
+        queryset=Session.objects.all(),
+        validators=[
+            SessionHasCompany(),
+            SessionIsNowAlive(),
+        ]
+    )
+
+    answers = ListSerializer(child=_BulkAnswerSerializer(), allow_empty=False)
+
+    def validate(self, attributes):
+        """
+        Validate all the answers and questions as a single set.
+
+        Validates that every question belongs to the session's question
+        set, that every answer is available to its question and that
+        none of the questions were answered before.
+
+        :param attributes: The values to validate
+        :type attributes: dict
+
+        :return: The validated values, including the questions
+        :rtype: dict
+        """
+        user = self.context["request"].user
+        GroupValidator(Groups.employee)(user)
+
+        session = attributes["session"]
+        answers = attributes["answers"]
+
+        identifiers = [answer["question"] for answer in answers]
+
+        if len(set(identifiers)) != len(identifiers):
+            raise ValidationError("A question may only be answered once")
+
+        questions = Question.objects.filter(set=session.set_id)
+        questions = questions.only("id", "answers", "weight")
+        questions = questions.in_bulk(identifiers)
+
+        if len(questions) != len(identifiers):
+            raise ValidationError(
+                "The question doesn't belong to this session"
+            )
+
+        options = Answer.objects.filter(deleted__isnull=True)
+        options = options.filter(id__in=[a["answer"] for a in answers])
+        options = dict(options.values_list("id", "answers"))
+
+        for answer in answers:
+            question = questions[answer["question"]]
+
+            if options.get(answer["answer"]) != question.answers_id:
+                raise ValidationError(
+                    "The given answer is not available to this question"
+                )
+
+        clause = Q(answerer=user) & Q(session=session)
+        clause = Q(question__in=identifiers) & clause
+
+        if Answered.objects.filter(clause).exists():
+            raise ValidationError("The question is already answered")
+
+        return {**attributes, "questions": questions}
+
+    def save(self, **kwargs):
+        """
+        Insert all the answered questions at once.
+
+        The values are calculated before the insert, and the position
+        of each answered question (see 'order_with_respect_to') is
+        retrieved with a single query because bulk_create doesn't set
+        it like Model.save() does.
+
+        :param kwargs: Additional keyword arguments (ignored)
+        :type kwargs: any
+
+        :return: The newly created answered questions
+        :rtype: list[activities.models.Answered]
+        """
+        user = self.context["request"].user
+        session = self.validated_data["session"]
+        questions = self.validated_data["questions"]
+
+        answered = [
+            Answered(
+                session=session,
+                answerer=user,
+                answer_id=answer["answer"],
+                question=questions[answer["question"]],
+                value=get_value_query(
+                    user, answer["value"], questions[answer["question"]]
+                ),
+            )
+
+            for answer in self.validated_data["answers"]
+        ]
+
+        with atomic():
+            orders = Answered.objects.filter(question__in=questions)
+            orders = orders.values("question").order_by()
+            orders = orders.annotate(count=Count("id"))
+            orders = {o["question"]: o["count"] for o in orders}
+
+            for instance in answered:
+                instance._order = orders.get(instance.question_id, 0)
+
+            Answered.objects.bulk_create(answered)
+            SessionScore.objects.track(*answered)
+
+        return answered
+
+
 class ReflectionSerializer(ModelSerializer):
     """
     Serializer for the reflection of a user.
@@ -357,7 +516,9 @@ class ReflectionSerializer(ModelSerializer):
         context = self.get_context(instance)
         company = instance.answerer.member.company
 
-        transport = MultiMailTransport(context, 3, company)
+        transport = MultiMailTransport(
+            context, Environments.follow_up, company
+        )
         transport.finish(transport(manager.email, {}) for manager in managers)
 
         return instance
@@ -404,3 +565,73 @@ class ReflectionSerializer(ModelSerializer):
             "company": instance.answerer.member.company.name,
             "description": instance.description,
         }
+
+
+class ExportParameterSerializer(Serializer):
+    """
+    Serializer for the query parameters of the answered export.
+
+    The export is limited to either a company or a session, and the
+    'kind' selects the answered questions or the plain text answers.
+    """
+
+    KINDS = {
+        "answered": (
+            Answered,
+            ("id", "session", "question", "answer", "value", "created"),
+        ),
+        "plain": (
+            AnsweredPlain,
+            ("id", "session", "question", "value"),
+        ),
+    }
+
+    update = None
+    create = None
+
+    kind = ChoiceField(choices=tuple(KINDS), default="answered")
+    output = ChoiceField(choices=tuple(STREAM_FORMATS), default="ndjson")
+
+    company = PrimaryKeyRelatedField(
+        queryset=Company.objects.all(), required=False
+    )
+
+    session = PrimaryKeyRelatedField(
+        queryset=Session.objects.all(), required=False
+    )
+
+    def validate(self, attrs):
+        """
+        Verify that the export is limited to a company or session.
+
+        :param attrs: The (by fields) validated values
+        :type attrs: dict
+
+        :return: The completely validated data
+        :rtype: dict
+        """
+        if "company" not in attrs and "session" not in attrs:
+            raise ValidationError("Either a company or session is required")
+
+        return attrs
+
+    def get_rows(self):
+        """
+        Select the rows to export, without loading them into memory.
+
+        :return: The names of the columns and a lazy iterator of the rows
+        :rtype: tuple[tuple[str], collections.abc.Iterator[tuple]]
+        """
+        model, columns = self.KINDS[self.validated_data["kind"]]
+        queryset = model.objects.order_by("id")
+
+        if "company" in self.validated_data:
+            company = self.validated_data["company"]
+            queryset = queryset.filter(session__company=company)
+
+        if "session" in self.validated_data:
+            session = self.validated_data["session"]
+            queryset = queryset.filter(session=session)
+
+        rows = queryset.values_list(*columns)
+        return columns, rows.iterator(chunk_size=2000)
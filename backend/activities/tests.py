@@ -1,3 +1,513 @@
-from rest_framework.test import URLPatternsTestCase, APITestCase
+"""Unittests for the activities app."""
 
-class
+import io
+import csv
+import json
+import datetime
+
+from django.db import connection
+from django.test import override_settings
+from django.core.cache import cache
+from django.db.models.aggregates import Count, Sum
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+
+from rest_framework.test import APITestCase
+from rest_framework.test import URLPatternsTestCase
+
+from rest_framework.reverse import reverse
+
+from accounts.utils import Groups
+from accounts.models import Group
+
+from accounts.factories import UserFactory
+from accounts.factories import AuthFactory
+
+from activities.urls import urlpatterns as activities_urlpatterns
+from activities.models import Answer
+from activities.models import Answers
+from activities.models import AnswerStyle
+from activities.models import Answered
+from activities.models import Session
+
+from activities.factories import AnswerFactory
+from activities.factories import AnswersFactory
+from activities.factories import AnsweredFactory
+from activities.factories import SessionFactory
+from activities.factories import QuestionFactory
+
+from activities.registries import answer_styles
+
+from analytics.models import SessionScore
+
+from companies.models import Member
+
+from companies.factories import MemberFactory
+from companies.factories import CompanyFactory
+
+from utilities.caching import bump_version
+
+
+class TestAnsweredBulkView(URLPatternsTestCase, APITestCase):
+    """Unittests for the bulk submission of answered questions."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = activities_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.session = SessionFactory(company=cls.company)
+        cls.questions = [QuestionFactory(set=cls.session.set) for _ in "abcd"]
+        cls.answers = [AnswerFactory(answers=q.answers) for q in cls.questions]
+
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+        MemberFactory(account=cls.employee, company=cls.company)
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+    def _submit(self, answers, session=None):
+        """
+        Submit the answers for the session.
+
+        :param answers: The (question, answer, value) to submit
+        :type answers: list[tuple]
+
+        :param session: The session to submit to, defaults to the session
+        :type session: activities.models.Session | None
+
+        :return: The response of the view-set
+        :rtype: rest_framework.response.Response
+        """
+        content = {
+            "session": (session or self.session).id,
+            "answers": [
+                {"question": q.id, "answer": a.id, "value": v}
+                for q, a, v in answers
+            ]
+        }
+
+        return self.client.post(
+            reverse("answered-bulk-list"), content, format="json"
+        )
+
+    def test_submit(self):
+        """Verify that all answers are stored and tracked."""
+
+        answers = zip(self.questions, self.answers, (1, 2, 3, 4))
+        response = self._submit(list(answers))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Answered.objects.count(), 4)
+
+        score = SessionScore.objects.get(session=self.session)
+
+        self.assertEqual(score.count, 4)
+        self.assertEqual(score.total, 10)
+
+    def test_constant_queries(self):
+        """Verify that the number of queries doesn't grow with answers."""
+
+        counts = []
+
+        # The first submission creates the rollup record of the session
+        for index in (slice(0, 1), slice(1, 2), slice(2, 4)):
+            answers = zip(self.questions, self.answers, (1, 2, 3, 4))
+
+            with CaptureQueriesContext(connection) as context:
+                response = self._submit(list(answers)[index])
+
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(context.captured_queries))
+
+        self.assertEqual(counts[1], counts[2])
+
+    def test_foreign_question(self):
+        """Verify that questions of other sets are refused."""
+
+        question = QuestionFactory()
+        answer = AnswerFactory(answers=question.answers)
+
+        response = self._submit([(question, answer, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Answered.objects.count(), 0)
+
+    def test_foreign_answer(self):
+        """Verify that answers of other questions are refused."""
+
+        answers = [(self.questions[0], self.answers[1], 1)]
+        response = self._submit(answers)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_answered_twice(self):
+        """Verify that a question can't be answered twice."""
+
+        answers = [(self.questions[0], self.answers[0], 1)]
+
+        self._submit(answers)
+        response = self._submit(answers)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Answered.objects.count(), 1)
+
+    def test_foreign_session(self):
+        """Verify that sessions of other companies are refused."""
+
+        session = SessionFactory()
+        question = QuestionFactory(set=session.set)
+        answer = AnswerFactory(answers=question.answers)
+
+        response = self._submit([(question, answer, 1)], session)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestAnsweredExportView(URLPatternsTestCase, APITestCase):
+    """Unittests for the streaming export of answered questions."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = activities_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.session = SessionFactory(company=cls.company)
+
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+        MemberFactory(account=cls.employee, company=cls.company)
+
+        cls.answered = [
+            AnsweredFactory(
+                session=cls.session, answerer=cls.employee, value=value
+            )
+            for value in (1, 2, 3)
+        ]
+
+        cls.management = UserFactory(
+            group=Group.objects.get(id=Groups.management)
+        )
+
+        cls.management_token = AuthFactory(user=cls.management)
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+    def _export(self, token, **params):
+        """
+        Request an export with the given query parameters.
+
+        :param token: The token to authenticate with
+        :type token: knox.models.AuthToken
+
+        :param params: The query parameters
+        :type params: any
+
+        :return: The response of the view-set
+        :rtype: django.http.response.HttpResponseBase
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.plain}")
+        return self.client.get(reverse("answered-export-list"), params)
+
+    def test_export_ndjson(self):
+        """Verify that every answered question is streamed as a line."""
+
+        response = self._export(
+            self.management_token, company=self.company.id
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        content = b"".join(response.streaming_content).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        ids = [answered.id for answered in self.answered]
+
+        self.assertEqual([r["id"] for r in rows], ids)
+        self.assertEqual([r["value"] for r in rows], ["1.00", "2.00", "3.00"])
+        self.assertNotIn("answerer", rows[0])
+
+    def test_export_csv(self):
+        """Verify that the CSV export starts with a header."""
+
+        response = self._export(
+            self.management_token, session=self.session.id, output="csv"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual(len(rows), 4)
+
+    def test_export_requires_scope(self):
+        """Verify that a company or session is required."""
+
+        response = self._export(self.management_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_as_employee(self):
+        """Verify that only management can export."""
+
+        response = self._export(self.employee_token, company=self.company.id)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+# The query plan is verified, so the responses are never cached
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class TestAnswersView(URLPatternsTestCase, APITestCase):
+    """Unittests for the answer sets."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = activities_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.answers = AnswersFactory()
+        cls.values = [AnswerFactory(answers=cls.answers) for _ in "abc"]
+
+        cls.management = UserFactory(
+            group=Group.objects.get(id=Groups.management)
+        )
+
+        cls.management_token = AuthFactory(user=cls.management)
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.management_token.plain}"
+        )
+
+    def test_list_without_deleted(self):
+        """Verify that the deleted answers aren't part of the set."""
+
+        Answer.objects.filter(id=self.values[0].id).update(
+            deleted=datetime.datetime.now(datetime.timezone.utc)
+        )
+
+        response = self.client.get(reverse("answers-list"))
+        values = response.data["results"][0]["values"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(values), 2)
+
+    def test_update_without_deleted(self):
+        """Verify that the deleted answers aren't part of an updated set."""
+
+        Answer.objects.filter(id=self.values[0].id).update(
+            deleted=datetime.datetime.now(datetime.timezone.utc)
+        )
+
+        url = reverse("answers-detail", kwargs={"pk": self.answers.id})
+        response = self.client.patch(url, {"label": "updated"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["values"]), 2)
+
+    def test_list_constant_queries(self):
+        """Verify that the number of queries doesn't grow with sets."""
+
+        # The first request caches the token, see 'TokenCache'
+        self.client.get(reverse("answers-list"))
+        counts = []
+
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse("answers-list"))
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(context.captured_queries))
+
+            AnswerFactory(answers=AnswersFactory())
+
+        self.assertEqual(counts[0], counts[1])
+
+
+class TestCatalogCache(URLPatternsTestCase, APITestCase):
+    """Unittests for the cached responses of the survey catalog."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = activities_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.answers = AnswersFactory()
+
+        cls.employee = UserFactory(
+            group=Group.objects.get(id=Groups.employee)
+        )
+
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+    def setUp(self):
+        cache.clear()
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+    def test_list_from_cache(self):
+        """Verify that a list is cached until the catalog changes."""
+
+        url = reverse("answers-list")
+        self.client.get(url)
+
+        # Updates without signals aren't noticed by the cache
+        Answers.objects.filter(id=self.answers.id).update(label="cached")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        labels = [answers["label"] for answers in response.data["results"]]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("cached", labels)
+
+        self.assertFalse(any(
+            "activities_answers" in query["sql"]
+            for query in context.captured_queries
+        ))
+
+        self.answers.label = "changed"
+        self.answers.save()
+
+        response = self.client.get(url)
+        labels = [answers["label"] for answers in response.data["results"]]
+
+        self.assertIn("changed", labels)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        """Verify that nothing is cached when the timeout is zero."""
+
+        url = reverse("answers-list")
+        self.client.get(url)
+
+        Answers.objects.filter(id=self.answers.id).update(label="uncached")
+        response = self.client.get(url)
+
+        labels = [answers["label"] for answers in response.data["results"]]
+        self.assertIn("uncached", labels)
+
+
+class TestAnswerStylesView(URLPatternsTestCase, APITestCase):
+    """Unittests for the answer styles served from their registry."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = activities_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = UserFactory(
+            group=Group.objects.get(id=Groups.employee)
+        )
+
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+    def setUp(self):
+        answer_styles.reload()
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+    def test_list_without_queries(self):
+        """Verify that the styles are listed without querying them."""
+
+        url = reverse("answer-styles-list")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(response.data), AnswerStyle.objects.count()
+        )
+
+        self.assertFalse(any(
+            "activities_answerstyle" in query["sql"]
+            for query in context.captured_queries
+        ))
+
+    def test_reload_from_other_process(self):
+        """Verify that a version bumped elsewhere reloads the styles."""
+
+        url = reverse("answer-styles-list")
+        self.client.get(url)
+
+        # Updates without signals are only noticed through the version
+        AnswerStyle.objects.filter(id=1).update(label="changed")
+        response = self.client.get(url)
+
+        labels = [style["label"] for style in response.data]
+        self.assertNotIn("changed", labels)
+
+        bump_version(answer_styles.namespace)
+        response = self.client.get(url)
+
+        labels = [style["label"] for style in response.data]
+        self.assertIn("changed", labels)
+
+
+class TestSeedLoad(APITestCase):
+    """Unittests for the generation of synthetic data."""
+
+    fixtures = ["groups", "styles"]
+
+    def _seed(self, seed):
+        """
+        Generate a small data set.
+
+        :param seed: The seed of the random generator
+        :type seed: int
+        """
+        call_command(
+            "seed_load",
+            companies=3,
+            members=4,
+            themes=2,
+            sessions=3,
+            questions=2,
+            seed=seed,
+            batch_size=10,
+            stdout=io.StringIO(),
+        )
+
+    def test_seed(self):
+        """Verify that the records are generated and related."""
+
+        self._seed(1)
+
+        # The sessions are limited by the themes, one member is employer
+        self.assertEqual(Member.objects.count(), 12)
+        self.assertEqual(Session.objects.count(), 6)
+        self.assertEqual(Answered.objects.count(), 3 * 3 * 2 * 2)
+
+        scores = SessionScore.objects.aggregate(
+            total=Sum("total"), count=Sum("count")
+        )
+
+        answered = Answered.objects.aggregate(
+            total=Sum("value"), count=Count("id")
+        )
+
+        self.assertEqual(scores, answered)
+
+    def test_seed_twice(self):
+        """Verify that the data can be generated on top of existing data."""
+
+        self._seed(1)
+        self._seed(1)
+
+        self.assertEqual(Member.objects.count(), 24)
+        self.assertEqual(Answered.objects.count(), 72)
@@ -9,11 +9,17 @@ from rest_framework.routers import SimpleRouter
 from activities.views import AnswerViewSet
 from activities.views import AnswersViewSet
 from activities.views import AnswerStylesViewSet
+from activities.views import AnsweredBulkViewSet
+from activities.views import AnsweredExportViewSet
 
 router = SimpleRouter()
 
 router.register("answer", AnswerViewSet, "answer")
 router.register("answers", AnswersViewSet, "answers")
 router.register("answer-styles", AnswerStylesViewSet, "answer-styles")
+router.register("answered-bulk", AnsweredBulkViewSet, "answered-bulk")
+router.register(
+    "answered-export", AnsweredExportViewSet, "answered-export"
+)
 
 urlpatterns = router.urls
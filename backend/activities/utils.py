@@ -1,11 +1,15 @@
 """Utilities for the activities app."""
 
 __all__ = (
+    "CATALOG",
     "AnswerStyles",
 )
 
 import enum
 
+# The cache namespace of the survey catalog, see 'utilities.caching'
+CATALOG = "activities.catalog"
+
 
 class AnswerStyles(enum.IntEnum):
     """
@@ -7,13 +7,13 @@ __all__ = (
     "QuestionIsAnswered",
 )
 
-import datetime
-
 from django.db.models.query import Q
+from django.utils.timezone import now
 
 from rest_framework.exceptions import ValidationError
 
-from activities.models import Question, Session
+from accounts.principal import get_principal
+from activities.models import Question
 
 
 class SessionIsNowAlive(object):
@@ -29,10 +29,7 @@ class SessionIsNowAlive(object):
         :return: The validated session
         :rtype: activities.models.Session
         """
-        moment = datetime.datetime.utcnow()
-        clause = Q(start__lte=moment) & Q(until_gte=moment)
-
-        if Session.objects.filter(clause).exists():
+        if session.start <= now() <= session.until:
             return session
 
         raise ValidationError("The session is not alive at this moment")
@@ -51,23 +48,22 @@ class SessionHasCompany(object):
         :return: The validated session
         :rtype: activities.models.Session
         """
-        member = getattr(self, "member")
-        clause = Q(company__member__account=member)
-        clause = Q(id=session.id) & clause
+        principal = getattr(self, "principal")
 
-        if Session.objects.filter(clause).exists():
+        if session.company_id == principal.company_id:
             return session
 
         raise ValidationError("The users company doesn't own this session")
 
     def set_context(self, serializer):
         """
-        Extract the current authenticated user from the request.
+        Extract the principal of the current user from the request.
 
         :param serializer: The currently active serializer field
         :type serializer: rest_framework.serializers.Field
         """
-        setattr(self, "member", serializer.context.request.user)
+        principal = get_principal(serializer.context["request"])
+        setattr(self, "principal", principal)
 
 
 class QuestionHasCompany(object):
@@ -84,8 +80,8 @@ class QuestionHasCompany(object):
         :return: The validated session
         :rtype: activities.models.Session
         """
-        member = getattr(self, "member")
-        clause = Q(set__session__company__member__account=member)
+        principal = getattr(self, "principal")
+        clause = Q(set__sessions__company=principal.company_id)
         clause = Q(id=question.id) & clause
 
         if Question.objects.filter(clause).exists():
@@ -97,12 +93,13 @@ class QuestionHasCompany(object):
 
     def set_context(self, serializer):
         """
-        Extract the current authenticated user from the request.
+        Extract the principal of the current user from the request.
 
         :param serializer: The currently active serializer field
         :type serializer: rest_framework.serializers.Field
         """
-        setattr(self, "member", serializer.context.request.user)
+        principal = get_principal(serializer.context["request"])
+        setattr(self, "principal", principal)
 
 
 class QuestionIsAnswered(object):
@@ -136,4 +133,4 @@ class QuestionIsAnswered(object):
         :param serializer: The currently active serializer field
         :type serializer: rest_framework.serializers.Field
         """
-        setattr(self, "answerer", serializer.context.request.user)
+        setattr(self, "answerer", serializer.context["request"].user)
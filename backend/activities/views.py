@@ -6,6 +6,8 @@ __all__ = (
     "SessionViewSet",
     "AnsweredViewSet",
     "QuestionViewSet",
+    "AnsweredBulkViewSet",
+    "AnsweredExportViewSet",
     "ReflectionViewSet",
     "QuestionSetViewSet",
     "AnswerStylesViewSet",
@@ -14,14 +16,23 @@ __all__ = (
 
 import datetime
 
+from django.db.models.query import Prefetch
+from django.http.response import StreamingHttpResponse
+from django.utils.timezone import now
+
 from rest_framework.mixins import ListModelMixin
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.mixins import RetrieveModelMixin
 
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ViewSetMixin
 from rest_framework.viewsets import GenericViewSet
+from rest_framework.generics import CreateAPIView
 
 from accounts.utils import is_management
+from accounts.principal import get_principal
+from accounts.permissions import IsEmployee
+from accounts.permissions import IsManagement
 from accounts.permissions import IsAcceptable
 from accounts.permissions import IsEmployeeOrReadOnly
 from accounts.permissions import IsManagementOrReadOnly
@@ -42,12 +53,23 @@ from activities.serializers import SessionSerializer
 from activities.serializers import QuestionSerializer
 from activities.serializers import AnsweredSerializer
 from activities.serializers import ReflectionSerializer
+from activities.serializers import BulkAnsweredSerializer
 from activities.serializers import QuestionSetSerializer
 from activities.serializers import AnswerStyleSerializer
 from activities.serializers import QuestionThemeSerializer
+from activities.serializers import ExportParameterSerializer
+
+from activities.utils import CATALOG
+from activities.registries import answer_styles
+
+from utilities.mixins import InstrumentedMixin
+from utilities.mixins import ReplicaMixin
+from utilities.mixins import QueryPlanMixin
+from utilities.mixins import VersionedCacheMixin
+from utilities.streaming import STREAM_FORMATS, stream_rows
 
 
-class QuestionViewSet(ModelViewSet):
+class QuestionViewSet(InstrumentedMixin, ModelViewSet):
     """View-set for questions."""
 
     queryset = Question.objects.all()
@@ -55,15 +77,17 @@ class QuestionViewSet(ModelViewSet):
     permission_classes = (IsManagementOrReadOnly,)
 
 
-class QuestionSetViewSet(ModelViewSet):
+class QuestionSetViewSet(InstrumentedMixin, QueryPlanMixin, ModelViewSet):
     """View-set for question sets."""
 
     queryset = QuestionSet.objects.all()
     serializer_class = QuestionSetSerializer
     permission_classes = (IsManagementOrReadOnly,)
 
+    prefetch_plan = ("theme",)
 
-class AnswerViewSet(ModelViewSet):
+
+class AnswerViewSet(InstrumentedMixin, VersionedCacheMixin, ModelViewSet):
     """
     View-set for answer records.
 
@@ -75,6 +99,8 @@ class AnswerViewSet(ModelViewSet):
     serializer_class = AnswerSerializer
     permission_classes = (IsManagementOrReadOnly,)
 
+    cache_namespace = CATALOG
+
     def perform_destroy(self, instance):
         """
         Perform a soft delete instead of hard delete.
@@ -89,23 +115,47 @@ class AnswerViewSet(ModelViewSet):
         instance.save()
 
 
-class AnswersViewSet(ModelViewSet):
+class AnswersViewSet(
+    InstrumentedMixin,
+    VersionedCacheMixin,
+    QueryPlanMixin,
+    ModelViewSet,
+):
     """View-set for a answer set."""
 
     queryset = Answers.objects.all()
     serializer_class = AnswersSerializer
     permission_classes = (IsManagementOrReadOnly,)
 
+    cache_namespace = CATALOG
 
-class AnswerStylesViewSet(GenericViewSet, ListModelMixin):
+    # Only the answers that weren't (soft) deleted are part of a set
+    prefetch_plan = (
+        Prefetch("values", Answer.objects.filter(deleted__isnull=True)),
+    )
+
+
+class AnswerStylesViewSet(InstrumentedMixin, GenericViewSet, ListModelMixin):
     """View set for read only styles."""
 
     queryset = AnswerStyle.objects.all()
     serializer_class = AnswerStyleSerializer
     permission_classes = (IsAcceptable,)
 
+    # The styles are a handful of constants, which aren't paginated
+    pagination_class = None
 
-class SessionViewSet(ModelViewSet):
+    def get_queryset(self):
+        """
+        Overridden to list the styles from their registry.
+
+        :return: The records of the styles
+        :rtype: list[tuple]
+        """
+        return list(answer_styles.values())
+
+
+class SessionViewSet(InstrumentedMixin, ReplicaMixin, ModelViewSet):
     """View-set for question sessions."""
 
     queryset = Session.objects.all()
@@ -122,22 +172,38 @@ class SessionViewSet(ModelViewSet):
         :return: The filtered queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        company = self.request.user.member.company_id
+        company = principal.company_id
         return queryset.filter(company=company)
 
 
-class QuestionThemeViewSet(ModelViewSet):
+class QuestionThemeViewSet(InstrumentedMixin, QueryPlanMixin, ModelViewSet):
     """View-set for question themes."""
 
     queryset = QuestionTheme.objects.all()
     serializer_class = QuestionThemeSerializer
     permission_classes = (IsManagementOrReadOnly,)
 
+    prefetch_plan = ("sets",)
+
+    def get_prefetch_plan(self):
+        """
+        Overridden to prefetch the sessions that are still alive.
+
+        :return: The lookups or 'Prefetch' instances of the relations
+        :rtype: tuple[str | django.db.models.Prefetch]
+        """
+        sessions = Session.objects.filter(until__gte=now())
+        return self.prefetch_plan + (Prefetch("sessions", sessions),)
+
 
 class AnsweredViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
     GenericViewSet,
     ListModelMixin,
     CreateModelMixin,
@@ -159,14 +225,69 @@ class AnsweredViewSet(
         :return: The filtered queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        company = self.request.user.member.company_id
+        company = principal.company_id
         return queryset.filter(answerer__member__company=company)
 
 
-class ReflectionViewSet(ModelViewSet):
+class AnsweredBulkViewSet(InstrumentedMixin, ViewSetMixin, CreateAPIView):
+    """View-set for answering the questions of a session at once."""
+
+    serializer_class = BulkAnsweredSerializer
+    permission_classes = (IsEmployee,)
+
+
+class AnsweredExportViewSet(InstrumentedMixin, GenericViewSet):
+    """
+    View-set for exporting the answered questions of a company or session.
+
+    The rows are streamed while they are fetched in chunks, so exports
+    of any size run in constant memory. The answerers are never part of
+    an export.
+    """
+
+    pagination_class = None
+    serializer_class = ExportParameterSerializer
+    permission_classes = (IsManagement,)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Stream the export as NDJSON or CSV.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param args: Additional arguments
+        :type args: any
+
+        :param kwargs: Additional keyword arguments
+        :type kwargs: any
+
+        :return: The streaming response
+        :rtype: django.http.response.StreamingHttpResponse
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        output = serializer.validated_data["output"]
+        columns, rows = serializer.get_rows()
+
+        response = StreamingHttpResponse(
+            stream_rows(columns, rows, output),
+            content_type=STREAM_FORMATS[output],
+        )
+
+        name = f"{serializer.validated_data['kind']}.{output}"
+        response["Content-Disposition"] = f'attachment; filename="{name}"'
+
+        return response
+
+
+class ReflectionViewSet(InstrumentedMixin, ReplicaMixin, ModelViewSet):
     """View-set for reflections on questions."""
 
     queryset = Reflection.objects.all()
@@ -183,8 +304,10 @@ class ReflectionViewSet(ModelViewSet):
         :return: The filtered queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        company = self.request.user.member.company_id
+        company = principal.company_id
         return queryset.filter(answerer__member__company=company)
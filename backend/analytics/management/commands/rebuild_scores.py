@@ -0,0 +1,42 @@
+"""Management command to rebuild the materialized session scores."""
+
+from django.core.management.base import BaseCommand
+
+from activities.models import Answered
+from analytics.models import SessionScore
+
+
+class Command(BaseCommand):
+    """Rebuild the session scores from all the answered questions."""
+
+    help = "Rebuild the materialized session scores from scratch."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of scores to insert at once.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually rebuild the session scores.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        count = SessionScore.objects.rebuild(
+            Answered.objects.all(), options["batch_size"]
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} scores"))
@@ -0,0 +1,120 @@
+"""Custom managers for analytics related models."""
+
+__all__ = (
+    "MetaDataManager",
+    "SessionScoreManager",
+)
+
+import collections
+
+from django.db.models.query import F
+from django.db.models.manager import Manager
+
+from django.db.models.aggregates import Sum, Count
+from django.db.models.expressions import OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+
+from django.db.transaction import atomic
+from django.utils.timezone import localdate
+
+
+class MetaDataManager(Manager):
+    """Manager to maintain the denormalized metadata weights of users."""
+
+    def update_weights(self, users):
+        """
+        Recalculate the sum and number of the metadata weights of users.
+
+        :param users: The users to recalculate the weights for
+        :type users: django.db.models.query.QuerySet
+
+        :return: The number of updated users
+        :rtype: int
+        """
+        weights = self.filter(usermeta__user=OuterRef("id"))
+        weights = weights.order_by().values("usermeta__user")
+
+        total = weights.annotate(total=Sum("weight")).values("total")
+        count = weights.annotate(count=Count("id")).values("count")
+
+        return users.update(
+            meta_total=Coalesce(Subquery(total), 0),
+            meta_count=Coalesce(Subquery(count), 0),
+        )
+
+
+class SessionScoreManager(Manager):
+    """Manager to keep the materialized session scores up to date."""
+
+    def track(self, *answered):
+        """
+        Add newly created answered questions to the rollup.
+
+        The answered questions are grouped per session and day first,
+        so that a complete set of answers only costs a single update
+        per rollup record.
+
+        :param answered: The answered questions that were just created
+        :type answered: activities.models.Answered
+
+        :return: The number of updated rollup records
+        :rtype: int
+        """
+        groups = collections.defaultdict(list)
+
+        for instance in answered:
+            key = (instance.session, localdate(instance.created))
+            groups[key].append(instance.value)
+
+        for (session, day), values in groups.items():
+            score, _ = self.get_or_create(
+                day=day,
+                theme_id=session.theme_id,
+                session_id=session.id,
+                defaults={"company_id": session.company_id},
+            )
+
+            self.filter(id=score.id).update(
+                total=F("total") + sum(values),
+                count=F("count") + len(values),
+            )
+
+        return len(groups)
+
+    @atomic
+    def rebuild(self, answered, batch_size=500):
+        """
+        Rebuild the complete rollup from the given answered questions.
+
+        :param answered: The answered questions to aggregate
+        :type answered: django.db.models.query.QuerySet
+
+        :param batch_size: The number of records to insert at once
+        :type batch_size: int
+
+        :return: The number of created rollup records
+        :rtype: int
+        """
+        self.get_queryset().delete()
+
+        rows = answered.annotate(day=TruncDate("created")).values(
+            "day", "session", "session__theme", "session__company",
+        )
+
+        rows = rows.annotate(total=Sum("value"), count=Count("id"))
+        rows = rows.order_by()
+
+        scores = self.bulk_create((
+            self.model(
+                day=row["day"],
+                total=row["total"],
+                count=row["count"],
+                theme_id=row["session__theme"],
+                session_id=row["session"],
+                company_id=row["session__company"],
+            )
+
+            for row in rows.iterator()
+        ), batch_size=batch_size)
+
+        return len(scores)
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0007_answered_created'),
+        ('companies', '0004_auto_20191015_2133'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='companies.Company')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='activities.Session')),
+                ('theme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='activities.QuestionTheme')),
+            ],
+            options={
+                'unique_together': {('session', 'theme', 'day')},
+            },
+        ),
+    ]
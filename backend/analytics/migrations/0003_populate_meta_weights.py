@@ -0,0 +1,34 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:48
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_meta_weights(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    MetaData = apps.get_model('analytics', 'MetaData')
+
+    weights = MetaData.objects.filter(usermeta__user=OuterRef('id'))
+    weights = weights.order_by().values('usermeta__user')
+
+    User.objects.update(
+        meta_total=Coalesce(Subquery(
+            weights.annotate(total=Sum('weight')).values('total')
+        ), 0),
+        meta_count=Coalesce(Subquery(
+            weights.annotate(count=Count('id')).values('count')
+        ), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_meta_weight'),
+        ('analytics', '0002_sessionscore'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_meta_weights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_populate_meta_weights'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usermeta',
+            index=models.Index(fields=['user', 'meta'], name='analytics_usermeta_user_idx'),
+        ),
+    ]
@@ -6,12 +6,19 @@ __all__ = (
     "MetaLink",
     "MetaType",
     "UserMeta",
+    "SessionScore",
 )
 
+from django.dispatch.dispatcher import receiver
+
 from django.db.models import Model
+from django.db.models.indexes import Index
+from django.db.models.signals import pre_save, post_save, post_delete
 
 from django.db.models.fields import CharField
+from django.db.models.fields import DateField
 from django.db.models.fields import DecimalField
+from django.db.models.fields import PositiveIntegerField
 
 from django.db.models.deletion import PROTECT, CASCADE, SET_NULL
 from django.db.models.fields.related import OneToOneField, ForeignKey
@@ -19,6 +26,9 @@ from django.db.models.fields.related import OneToOneField, ForeignKey
 from accounts.models import User
 from companies.models import Company
 
+from analytics.managers import MetaDataManager
+from analytics.managers import SessionScoreManager
+
 
 class MetaBase(Model):
     """Base mixin for all external models that have a certain weight."""
@@ -61,6 +71,8 @@ class MetaData(Model):
 
     meta_type = ForeignKey(MetaType, CASCADE, "options")
 
+    objects = MetaDataManager()
+
 
 class UserMeta(Model):
     """
@@ -71,5 +83,106 @@ class UserMeta(Model):
     to the answer values of a user.
     """
 
+    # The weights of a user are summed from this index alone
+    class Meta:
+        indexes = [
+            Index(fields=("user", "meta"), name="analytics_usermeta_user_idx"),
+        ]
+
     meta = ForeignKey(MetaData, PROTECT, "usermeta")
     user = ForeignKey(User, SET_NULL, "metadata", null=True)
+
+
+class SessionScore(Model):
+    """
+    Materialized rollup of the answered values within a session.
+
+    Each record holds the running total and number of the answered
+    questions of a single session and theme on a single day. The charts
+    are calculated from these records, so that they don't have to
+    aggregate every single answered question on each request.
+    """
+
+    class Meta:
+        unique_together = ("session", "theme", "day")
+
+    day = DateField()
+    total = DecimalField(default=0, max_digits=12, decimal_places=2)
+    count = PositiveIntegerField(default=0)
+
+    theme = ForeignKey("activities.QuestionTheme", CASCADE, "scores")
+    session = ForeignKey("activities.Session", CASCADE, "scores")
+    company = ForeignKey(Company, CASCADE, "scores")
+
+    objects = SessionScoreManager()
+
+
+@receiver(post_save, sender=MetaData)
+def _update_metadata_weights(sender, instance, **kwargs):
+    """
+    Recalculate the weights of the users with the changed metadata.
+
+    :param sender: The model's class
+    :type sender: type of analytics.models.MetaData
+
+    :param instance: The metadata instance that was saved
+    :type instance: analytics.models.MetaData
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    sender.objects.update_weights(User.objects.filter(metadata__meta=instance))
+    del kwargs
+
+
+@receiver(pre_save, sender=UserMeta)
+def _remember_previous_user(sender, instance, **kwargs):
+    """
+    Remember the stored user of metadata that may be moved to another.
+
+    :param sender: The model's class
+    :type sender: type of analytics.models.UserMeta
+
+    :param instance: The user metadata instance that will be saved
+    :type instance: analytics.models.UserMeta
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    previous = None
+
+    if instance.pk is not None:
+        previous = sender.objects.filter(pk=instance.pk).values_list(
+            "user_id", flat=True
+        ).first()
+
+    instance._previous_user_id = previous
+    del kwargs
+
+
+@receiver(post_save, sender=UserMeta)
+@receiver(post_delete, sender=UserMeta)
+def _update_user_weights(sender, instance, **kwargs):
+    """
+    Recalculate the weights of the users whose metadata changed.
+
+    Both the previous and the current user are recalculated when the
+    metadata was moved to another user.
+
+    :param sender: The model's class
+    :type sender: type of analytics.models.UserMeta
+
+    :param instance: The user metadata instance that was saved or deleted
+    :type instance: analytics.models.UserMeta
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    previous = getattr(instance, "_previous_user_id", None)
+    identifiers = {instance.user_id, previous} - {None}
+
+    if identifiers:
+        users = User.objects.filter(id__in=identifiers)
+        MetaData.objects.update_weights(users)
+
+    del sender, kwargs
@@ -1,65 +1,106 @@
 """Query generators for the analytics."""
 
 __all__ = (
+    "TREND_BUCKETS",
+
     "get_value_query",
+    "get_trend_query",
     "add_session_calculations",
 )
 
-from django.db.models.query import Q, F
-from django.db.models.fields import DecimalField
+import decimal
+
+from django.db.models.query import F
+from django.db.models.fields import DecimalField, FloatField
+from django.db.models.fields import DateTimeField
 
-from django.db.models.aggregates import Avg
+from django.db.models.aggregates import Avg, Sum
 
-from django.db.models.expressions import Func
-from django.db.models.expressions import Value
-from django.db.models.expressions import Subquery
+from django.db.models.expressions import Case, When
+from django.db.models.expressions import ExpressionWrapper
 
-from analytics.models import MetaData
+from django.db.models.functions import Cast, Now, Trunc
 
 
-def _calculate_value_weights(user, question):
+def get_value_query(user, data, question):
     """
-    Calculate the weights of the users metadata.
+    Calculate the value of a answered value.
+
+    The value is weighted by the average of the weights of the user's
+    metadata and the weight of the question. The weights of the
+    metadata are denormalized onto the user by the signals within
+    'analytics.models', so no additional query is required.
 
     :param user: The current user instance
     :type user: accounts.models.User
 
+    :param data: The actual submitted value
+    :type data: int
+
     :type question: The question that is answered
     :type question: activities.models.Question
 
-    :return: A queryset with the average of the weights
-    :rtype: django.db.models.query.QuerySet
+    :return: The calculated value.
+    :rtype: decimal.Decimal
     """
-    model = question.__class__
-    sub_q = model.objects.filter(id=question.id)
-    sub_q = sub_q.value("weight")
+    total = user.meta_total + question.weight
+    count = user.meta_count + 1
 
-    query = MetaData.objects.filter(Q(usermeta__user=user.id))
-    query = query.values("weight").union(sub_q)
-    query = query.annotate(__result=Func("weight", function="AVG"))
+    return (data * total / count).quantize(decimal.Decimal("0.01"))
 
-    return query.values("__result")
 
+TREND_BUCKETS = ("day", "week", "month")
 
-def get_value_query(user, data, question):
+
+def get_trend_query(queryset, bucket, since=None, until=None):
     """
-    Get the query to calculate the value of a answered value.
+    Aggregate the session scores to a single value per time bucket.
 
-    :param user: The current user instance
-    :type user: accounts.models.User
+    A session is placed within the bucket of its end, or within the
+    current bucket when the session is still running. The value of a
+    bucket is the weighted average of all the answered questions within
+    it, weighted by the question set and the theme.
 
-    :param data: The actual submitted value
-    :type data: int
+    :param queryset: The session scores to aggregate
+    :type queryset: django.db.models.query.QuerySet
 
-    :type question: The question that is answered
-    :type question: activities.models.Question
+    :param bucket: The size of the bucket, one of TREND_BUCKETS
+    :type bucket: str
+
+    :param since: The earliest moment of a bucketed session
+    :type since: datetime.datetime | None
+
+    :param until: The latest moment of a bucketed session
+    :type until: datetime.datetime | None
 
-    :return: The query to calculate the value.
+    :return: The queryset with a 'date' and 'data' value per bucket
     :rtype: django.db.models.query.QuerySet
     """
-    weight = _calculate_value_weights(user, question)
+    moment = Case(
+        When(session__until__lte=Now(), then=F("session__until")),
+        default=Now(),
+        output_field=DateTimeField(),
+    )
+
+    total = F("total") * F("session__set__weight") * F("theme__weight")
+    total = Cast(Sum(total), FloatField())
+
+    queryset = queryset.annotate(moment=moment)
+
+    # The moment is bucketed, so sessions that only overlap don't count
+    if since is not None:
+        queryset = queryset.filter(moment__gte=since)
+
+    if until is not None:
+        queryset = queryset.filter(moment__lte=until)
+
+    queryset = queryset.annotate(date=Trunc("moment", bucket))
+    queryset = queryset.values("date").order_by("date")
 
-    return Value(data) * weight
+    return queryset.annotate(data=ExpressionWrapper(
+        total / Sum("count"),
+        output_field=DecimalField(decimal_places=2, max_digits=3),
+    ))
 
 
 # XXX TODO: remove
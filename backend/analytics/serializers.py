@@ -1,9 +1,14 @@
 """Serializers related to the analytics."""
 
+from rest_framework.fields import ChoiceField
 from rest_framework.fields import DecimalField
+from rest_framework.fields import IntegerField
 from rest_framework.fields import DateTimeField
+from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import Serializer
 
+from analytics.query import TREND_BUCKETS
+
 
 class CompanyChartSerializer(Serializer):
     """Serializer for the charts data."""
@@ -13,3 +18,36 @@ class CompanyChartSerializer(Serializer):
 
     update = None
     create = None
+
+
+class SessionChartSerializer(CompanyChartSerializer):
+    """Serializer for the charts data of a single session."""
+
+    id = IntegerField(read_only=True)
+
+
+class TrendParameterSerializer(Serializer):
+    """Serializer for the query parameters of the company trend."""
+
+    bucket = ChoiceField(choices=TREND_BUCKETS)
+
+    since = DateTimeField()
+    until = DateTimeField()
+
+    update = None
+    create = None
+
+    def validate(self, attrs):
+        """
+        Verify that the date range is chronological.
+
+        :param attrs: The (by fields) validated values
+        :type attrs: dict
+
+        :return: The completely validated data
+        :rtype: dict
+        """
+        if attrs["since"] >= attrs["until"]:
+            raise ValidationError("Can not start after the end")
+
+        return attrs
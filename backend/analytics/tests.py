@@ -1,8 +1,340 @@
+"""Unittests for the analytics app."""
+
+import io
+import datetime
+import decimal
+
+from django.core.management import call_command
+
+from rest_framework import status
 
 from rest_framework.test import APITestCase
+from rest_framework.test import URLPatternsTestCase
+
+from rest_framework.reverse import reverse
+
+from accounts.utils import Groups
+from accounts.models import Group
+
+from accounts.factories import UserFactory
+from accounts.factories import AuthFactory
+
+from activities.models import Answered
+from activities.factories import SessionFactory
+from activities.factories import QuestionFactory
+from activities.factories import AnsweredFactory
+from activities.factories import QuestionThemeFactory
+
+from analytics.query import get_value_query
+
+from analytics.models import MetaData
+from analytics.models import MetaLink
+from analytics.models import MetaType
+from analytics.models import UserMeta
+from analytics.models import SessionScore
+from analytics.urls import urlpatterns as analytics_urlpatterns
+
+from companies.factories import MemberFactory
+from companies.factories import CompanyFactory
+
+
+class MetaWeightTest(APITestCase):
+    """Unittests for the denormalized metadata weights of a user."""
+
+    fixtures = ["groups", "styles"]
+
+    @classmethod
+    def setUpTestData(cls):
+        company = CompanyFactory()
+        link = MetaLink.objects.create(company=company)
+        kind = MetaType.objects.create(name="department", link=link)
+
+        cls.low = MetaData.objects.create(option="a", weight=1, meta_type=kind)
+        cls.high = MetaData.objects.create(option="b", weight=3, meta_type=kind)
+
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+
+    def test_signals(self):
+        """Verify that the weights follow the changes to the metadata."""
+
+        UserMeta.objects.create(user=self.employee, meta=self.low)
+        relation = UserMeta.objects.create(user=self.employee, meta=self.high)
+
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.meta_total, 4)
+        self.assertEqual(self.employee.meta_count, 2)
+
+        self.high.weight = 2
+        self.high.save()
+
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.meta_total, 3)
+
+        relation.delete()
+
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.meta_total, 1)
+        self.assertEqual(self.employee.meta_count, 1)
+
+    def test_move_to_other_user(self):
+        """Verify that both users are recalculated when metadata moves."""
+
+        other = UserFactory(group=Group.objects.get(id=Groups.employee))
+        relation = UserMeta.objects.create(user=self.employee, meta=self.high)
+
+        relation.user = other
+        relation.save()
+
+        self.employee.refresh_from_db()
+        other.refresh_from_db()
+
+        self.assertEqual(self.employee.meta_count, 0)
+        self.assertEqual(other.meta_total, 3)
+        self.assertEqual(other.meta_count, 1)
+
+    def test_value(self):
+        """Verify that the value is weighted without any queries."""
+
+        UserMeta.objects.create(user=self.employee, meta=self.low)
+        UserMeta.objects.create(user=self.employee, meta=self.high)
+
+        self.employee.refresh_from_db()
+        question = QuestionFactory(weight=2)
+
+        with self.assertNumQueries(0):
+            value = get_value_query(self.employee, 3, question)
+
+        self.assertEqual(value, decimal.Decimal("6.00"))
+
+
+class SessionScoreTest(APITestCase):
+    """Unittests for the materialized session scores."""
+
+    fixtures = ["groups", "styles"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.session = SessionFactory(company=cls.company)
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+
+        MemberFactory(account=cls.employee, company=cls.company)
+
+    def _answer(self, value, days=0):
+        """
+        Create and track a single answered question.
+
+        :param value: The value of the answered question
+        :type value: int
+
+        :param days: The number of days the answer lies in the past
+        :type days: int
+
+        :return: The tracked answered question
+        :rtype: activities.models.Answered
+        """
+        answered = AnsweredFactory(
+            value=value,
+            session=self.session,
+            answerer=self.employee,
+        )
+
+        answered.created -= datetime.timedelta(days=days)
+        answered.save()
+
+        SessionScore.objects.track(answered)
+        return answered
+
+    def test_track(self):
+        """Verify that the scores are grouped per day."""
+
+        self._answer(2)
+        self._answer(4)
+        self._answer(3, days=1)
+
+        scores = SessionScore.objects.order_by("day")
+
+        self.assertEqual(scores.count(), 2)
+        self.assertEqual(scores[0].total, 3)
+        self.assertEqual(scores[0].count, 1)
+        self.assertEqual(scores[1].total, 6)
+        self.assertEqual(scores[1].count, 2)
+        self.assertEqual(scores[1].theme_id, self.session.theme_id)
+        self.assertEqual(scores[1].company_id, self.company.id)
+
+    def test_rebuild(self):
+        """Verify that a rebuild results in the same scores."""
+
+        self._answer(2)
+        self._answer(4)
+        self._answer(3, days=1)
+
+        fields = ("day", "total", "count", "theme", "session", "company")
+        tracked = list(SessionScore.objects.order_by("day").values(*fields))
+
+        SessionScore.objects.all().delete()
+        call_command("rebuild_scores", stdout=io.StringIO())
+
+        rebuilt = list(SessionScore.objects.order_by("day").values(*fields))
+
+        self.assertListEqual(tracked, rebuilt)
+        self.assertEqual(Answered.objects.count(), 3)
+
+
+class CompanyChartTest(URLPatternsTestCase, APITestCase):
+    """Unittests for the chart view-sets."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = analytics_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.ignored = CompanyFactory()
+
+        theme = QuestionThemeFactory(weight=decimal.Decimal("0.5"))
+
+        cls.session = SessionFactory(company=cls.company, theme=theme)
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+        MemberFactory(account=cls.employee, company=cls.company)
+
+        for value in (2, 4):
+            SessionScore.objects.track(AnsweredFactory(
+                value=value,
+                session=cls.session,
+                answerer=cls.employee,
+            ))
+
+        SessionFactory(company=cls.ignored)
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+    def test_company_chart(self):
+        """Verify that the theme weight is applied to the session score."""
+
+        response = self.client.get(reverse("company-charts-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["data"], "1.50")
+
+    def test_session_chart(self):
+        """Verify that only the sessions of the company are charted."""
+
+        response = self.client.get(reverse("session-charts-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.session.id)
+        self.assertEqual(response.data["results"][0]["data"], "3.00")
+
+
+class CompanyTrendTest(URLPatternsTestCase, APITestCase):
+    """Unittests for the bucketed company trend."""
+
+    fixtures = ["groups", "styles"]
+    urlpatterns = analytics_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+        MemberFactory(account=cls.employee, company=cls.company)
+
+        moments = (
+            datetime.datetime(2019, 1, 10, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2019, 1, 20, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2019, 3, 10, tzinfo=datetime.timezone.utc),
+        )
+
+        for moment, value in zip(moments, (2, 4, 3)):
+            session = SessionFactory(
+                company=cls.company,
+                start=moment - datetime.timedelta(days=5),
+                until=moment,
+            )
+
+            SessionScore.objects.track(AnsweredFactory(
+                value=value,
+                session=session,
+                answerer=cls.employee,
+            ))
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+    def _trend(self, **parameters):
+        """
+        Request the trend with the given query parameters.
+
+        :param parameters: The query parameters
+        :type parameters: str
+
+        :return: The response of the trend view-set
+        :rtype: rest_framework.response.Response
+        """
+        return self.client.get(reverse("company-trend-list"), parameters)
+
+    def test_month_buckets(self):
+        """Verify that the sessions are aggregated per month."""
+
+        response = self._trend(
+            bucket="month",
+            since="2019-01-01T00:00:00Z",
+            until="2019-12-31T00:00:00Z",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            [(point["date"][:10], point["data"]) for point in response.data],
+            [("2019-01-01", "3.00"), ("2019-03-01", "3.00")],
+        )
+
+    def test_date_range(self):
+        """Verify that sessions outside the date range are ignored."""
+
+        response = self._trend(
+            bucket="day",
+            since="2019-01-01T00:00:00Z",
+            until="2019-01-12T00:00:00Z",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["data"], "2.00")
+
+    def test_straddling_session(self):
+        """Verify that a session ending after the date range is ignored."""
+
+        # The second session starts within the range, but ends after it
+        response = self._trend(
+            bucket="day",
+            since="2019-01-01T00:00:00Z",
+            until="2019-01-17T00:00:00Z",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            [(point["date"][:10], point["data"]) for point in response.data],
+            [("2019-01-10", "2.00")],
+        )
+
+    def test_invalid_bucket(self):
+        """Verify that only the supported buckets are accepted."""
 
-from activities.models import *
-from companies.factories import *
+        response = self._trend(
+            bucket="year",
+            since="2019-01-01T00:00:00Z",
+            until="2019-12-31T00:00:00Z",
+        )
 
-class CompanyChartTest(APITestCase):
-    def test_all(self):
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -2,6 +2,7 @@
 
 from rest_framework.routers import SimpleRouter
 
+from analytics.views import CompanyTrendViewSet
 from analytics.views import CompanyChartsViewSet
 from analytics.views import SessionChartsViewSet
 
@@ -9,5 +10,6 @@ router = SimpleRouter()
 
 router.register("company", CompanyChartsViewSet, "company-charts")
 router.register("session", SessionChartsViewSet, "session-charts")
+router.register("trend", CompanyTrendViewSet, "company-trend")
 
 urlpatterns = router.urls
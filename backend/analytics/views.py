@@ -1,72 +1,155 @@
 """ViewSets for the analytics app."""
 
 from django.db.models.query import F
-from django.db.models.fields import DecimalField
+from django.db.models.fields import DecimalField, FloatField
 
-from django.db.models.expressions import OuterRef, Case
-from django.db.models.expressions import Subquery, When
+from django.db.models.expressions import Case, When
 from django.db.models.expressions import ExpressionWrapper
 
-from django.db.models.functions import Now
-from django.db.models.aggregates import Avg, Sum
+from django.db.models.functions import Cast, Now
+from django.db.models.aggregates import Sum
 
 from rest_framework.mixins import ListModelMixin
 from rest_framework.viewsets import GenericViewSet
 
+from accounts.permissions import IsAcceptable
+from accounts.principal import get_principal
+
+from analytics.query import get_trend_query
+from analytics.models import SessionScore
+
 from analytics.serializers import CompanyChartSerializer
+from analytics.serializers import SessionChartSerializer
+from analytics.serializers import TrendParameterSerializer
 
-from companies.models import Company
 from activities.models import Session
 
+from utilities.mixins import InstrumentedMixin
+from utilities.mixins import ReplicaMixin
 
-class CompanyChartsViewSet(GenericViewSet, ListModelMixin):
-    queryset = Company.objects.annotate(
-        __session_average=Subquery(
-            Session.objects.filter(
-                company=OuterRef("id")
-            ).annotate(
-                value=ExpressionWrapper(
-                    Avg("answered_questions__value")
-                    *
-                    F("set__weight"),
-                    output_field=DecimalField(
-                        max_digits=3,
-                        decimal_places=2,
-                    )
-                )
-            ).values("value")
-        )
-    ).annotate(
-        date=Case(
-            When(
-                sessions__until__lte=Now(),
-                then=F("sessions__until")
-            ),
-            default=Now()
-        ),
+
+def _session_average():
+    """
+    Create the expression for the average answered value of a session.
+
+    The average is calculated from the materialized session scores, so
+    the cost doesn't depend on the number of answered questions.
+
+    :return: The expression with the average value
+    :rtype: django.db.models.expressions.Combinable
+    """
+    total = Cast(Sum("scores__total"), FloatField())
+    return total / Sum("scores__count")
+
+
+def _session_date():
+    """
+    Create the expression for the date of a session within the charts.
+
+    :return: The end of the session, or now when it's still running
+    :rtype: django.db.models.expressions.Case
+    """
+    return Case(When(until__lte=Now(), then=F("until")), default=Now())
+
+
+class CompanyChartsViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
+    GenericViewSet,
+    ListModelMixin,
+):
+    """View-set for the weighted session scores of a company."""
+
+    queryset = Session.objects.annotate(
+        date=_session_date(),
         data=ExpressionWrapper(
-            Sum("__session_average")
+            _session_average()
+            *
+            F("set__weight")
             *
-            F("sessions__theme__weight"),
+            F("theme__weight"),
 
             output_field=DecimalField(decimal_places=2, max_digits=3)
         )
-    ).values("data", "date")
+    ).values("id", "data", "date")
 
     serializer_class = CompanyChartSerializer
+    permission_classes = (IsAcceptable,)
 
     def filter_queryset(self, queryset):
-        return queryset.filter(id=self.request.user.member.company_id)
+        return queryset.filter(company=get_principal(self.request).company_id)
 
 
-class SessionChartsViewSet(GenericViewSet, ListModelMixin):
+class SessionChartsViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
+    GenericViewSet,
+    ListModelMixin,
+):
+    """View-set for the score of every single session."""
+
     queryset = Session.objects.annotate(
-        data=Avg("answered_questions__value") * F("set__weight"),
-        date=Case(
-            When(until__lte=Now(), then=F("until")),
-            default=Now()
-        ),
-    )
+        date=_session_date(),
+        data=ExpressionWrapper(
+            _session_average()
+            *
+            F("set__weight"),
+
+            output_field=DecimalField(decimal_places=2, max_digits=3)
+        )
+    ).values("id", "data", "date")
+
+    serializer_class = SessionChartSerializer
+    permission_classes = (IsAcceptable,)
 
     def filter_queryset(self, queryset):
-        return queryset.filter(id=self.request.user.member.company_id)
+        return queryset.filter(company=get_principal(self.request).company_id)
+
+
+class CompanyTrendViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
+    GenericViewSet,
+    ListModelMixin,
+):
+    """
+    View-set for the score trend of a company.
+
+    The scores are aggregated by the database into one point per
+    'day', 'week' or 'month' between 'since' and 'until', so that the
+    size of the response only depends on the number of buckets.
+    """
+
+    queryset = SessionScore.objects.all()
+    serializer_class = CompanyChartSerializer
+    permission_classes = (IsAcceptable,)
+
+    # The number of points is already limited by the buckets
+    pagination_class = None
+
+    def filter_queryset(self, queryset):
+        """
+        Filter the scores on the company and date range, and bucket them.
+
+        :param queryset: The queryset to filter
+        :type queryset: django.db.models.query.QuerySet
+
+        :return: The aggregated scores per bucket
+        :rtype: django.db.models.query.QuerySet
+        """
+        parameters = TrendParameterSerializer(data=self.request.query_params)
+        parameters.is_valid(raise_exception=True)
+
+        parameters = parameters.validated_data
+        queryset = queryset.filter(
+            company=get_principal(self.request).company_id,
+            session__start__lte=parameters["until"],
+            session__until__gte=parameters["since"],
+        )
+
+        return get_trend_query(
+            queryset,
+            parameters["bucket"],
+            parameters["since"],
+            parameters["until"],
+        )
@@ -48,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "utilities.middleware.InstrumentationMiddleware",
+    "utilities.middleware.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.common.CommonMiddleware",
 
@@ -72,6 +74,61 @@ DATABASES = {
     }
 }
 
+# An optional replica for the charts and lists, see 'utilities.routers'.
+# Locally it's a copy of the primary, kept in sync by 'sync_replica'.
+DATABASE_REPLICA = os.environ.get("DATABASE_REPLICA")
+
+DATABASE_REPLICA_ALIAS = "replica" if DATABASE_REPLICA else None
+
+# The seconds a user keeps reading from the primary after a write
+REPLICA_STICKINESS = int(os.environ.get("REPLICA_STICKINESS", 10))
+
+if DATABASE_REPLICA:
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": DATABASE_REPLICA,
+        "TEST": {"MIRROR": "default"},
+    }
+
+    DATABASE_ROUTERS = ["utilities.routers.ReplicaRouter"]
+
+# Applied to every new SQLite connection, see 'utilities.database'. The
+# write-ahead log lets the charts be read while answers are written,
+# and writers wait for the lock instead of failing immediately.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "normal"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -20000)),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 2 ** 28)),
+}
+
+# The cache that is shared by all the processes, which keeps the cached
+# tokens and responses, the versions of the registries and the replica
+# stickiness, see 'utilities.checks'. The files are shared by all the
+# processes of a single host, multiple hosts need a cache server, like
+# 'django.core.cache.backends.memcached.MemcachedCache'.
+CACHE_BACKEND = os.environ.get(
+    "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", os.path.join(BASE_DIR, "cache")
+        ),
+    }
+}
+
+if CACHE_BACKEND.endswith(".FileBasedCache"):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", 10000)),
+    }
+
+# The tests use a cache of their own, which starts empty
+TEST_RUNNER = "utilities.runner.TestRunner"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -114,16 +171,82 @@ USE_L10N = True
 USE_TZ = True
 
 
+# Uploaded files, like the csv files of the registration jobs
+
+MEDIA_URL = "/media/"
+
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+
 REST_KNOX = {
     "TOKEN_TTL": None,
 }
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "knox.auth.TokenAuthentication",
+        "accounts.authentication.TokenAuthentication",
     ),
 
     "DEFAULT_PERMISSION_CLASSES": (
         "knox.auth.TokenAuthentication",
-    )
+    ),
+
+    "DEFAULT_PAGINATION_CLASS": "utilities.pagination.KeysetPagination",
+    "PAGE_SIZE": 100,
+}
+
+# The largest page size a client may request with 'page_size'
+
+PAGINATION_MAX_PAGE_SIZE = 500
+
+# The processes that hash the passwords of a bulk registration, shared
+# by all the requests of a worker, see 'accounts.utils.hash_passwords'
+
+PASSWORD_HASHING_WORKERS = int(os.environ.get(
+    "PASSWORD_HASHING_WORKERS", min(4, os.cpu_count() or 1)
+))
+
+# The seconds the survey catalog responses are cached, the entries are
+# invalidated by the signals of every write anyway, see
+# 'utilities.caching'. Writes without signals, like 'QuerySet.update'
+# and 'bulk_create', have to call 'bump_version' of the 'CATALOG'
+# themselves, otherwise the responses are stale for up to this long.
+# Zero disables the caching.
+
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 600))
+
+
+# Opt-in timings of every request, see 'utilities.middleware', the
+# logged timings are aggregated by the 'timing_histogram' command
+
+INSTRUMENTATION = bool(int(os.environ.get("INSTRUMENTATION", False)))
+
+INSTRUMENTATION_LOG = os.environ.get(
+    "INSTRUMENTATION_LOG", os.path.join(BASE_DIR, "instrumentation.log")
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+
+    "handlers": {
+        "instrumentation": {
+            "class": "logging.FileHandler",
+            "filename": INSTRUMENTATION_LOG,
+            "formatter": "message",
+            "delay": True,
+        },
+    },
+
+    "loggers": {
+        "utilities.middleware": {
+            "handlers": ["instrumentation"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
 }
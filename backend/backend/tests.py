@@ -0,0 +1,367 @@
+"""
+Query count benchmarks and query plans of the API.
+
+Every endpoint is requested at two volumes of data, and the number
+of queries must be the same for both: a query count that grows with
+the number of rows is an N+1 query. The query count, wall time and
+size of every response are recorded, and written as CSV to the path
+within the 'BENCHMARK_REPORT' environment variable, if set.
+
+The hot queries are explained as well, and may never scan a table.
+"""
+
+import os
+import csv
+import time
+import datetime
+import unittest
+import collections
+
+from django.db import connection
+from django.db.models.aggregates import Sum
+from django.urls import get_resolver
+from django.urls.resolvers import URLResolver
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from rest_framework import status
+
+from rest_framework.test import APITestCase
+from rest_framework.reverse import reverse
+
+from accounts.utils import Groups
+from accounts.models import Group
+
+from accounts.factories import UserFactory
+from accounts.factories import AuthFactory
+
+from activities.factories import AnswerFactory
+from activities.factories import SessionFactory
+from activities.factories import QuestionFactory
+from activities.factories import AnsweredFactory
+
+from activities.models import Answered
+from activities.models import Session
+
+from analytics.query import get_trend_query
+from analytics.views import CompanyChartsViewSet
+
+from analytics.models import MetaData
+from analytics.models import SessionScore
+
+from companies.models import Member
+
+from companies.factories import MemberFactory
+from companies.factories import CompanyFactory
+
+# The endpoints that are requested, as (name, group, parameters), the
+# parameters without a value are filled in by the benchmark
+ENDPOINTS = (
+    ("user", Groups.employer, {}),
+    ("account-list", Groups.management, {}),
+    ("member-list", Groups.management, {}),
+    ("company-list", Groups.management, {}),
+    ("colour-theme-list", Groups.employer, {}),
+    ("company-logo-list", Groups.management, {}),
+    ("company-charts-list", Groups.employer, {}),
+    ("session-charts-list", Groups.employer, {}),
+    ("company-trend-list", Groups.employer, {
+        "bucket": "day", "since": None, "until": None,
+    }),
+    ("answer-list", Groups.management, {}),
+    ("answers-list", Groups.management, {}),
+    ("answer-styles-list", Groups.employer, {}),
+    ("answered-export-list", Groups.management, {"company": None}),
+)
+
+# The endpoints that can't be requested with a GET request
+WRITE_ONLY = {
+    "login",
+    "logout",
+    "answered-bulk-list",
+    "register-employers-list",
+    "register-employees-list",
+    "register-employees-csv-list",
+}
+
+# The volumes of the measurements, in companies and members per company
+VOLUMES = (1, 4)
+MEMBERS = 5
+QUESTIONS = 3
+
+Measurement = collections.namedtuple(
+    "Measurement", ("endpoint", "volume", "queries", "seconds", "size")
+)
+
+
+def _list_endpoints(patterns=None):
+    """
+    Find the names of all the endpoints without arguments.
+
+    :param patterns: The patterns to search, defaults to the root urlconf
+    :type patterns: list | None
+
+    :return: The names of the endpoints
+    :rtype: collections.abc.Iterator[str]
+    """
+    for pattern in patterns or get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _list_endpoints(pattern.url_patterns)
+
+        elif pattern.name and not pattern.pattern.regex.groups:
+            yield pattern.name
+
+
+# The queries are measured, so the responses are never cached
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class TestQueryCounts(APITestCase):
+    """Benchmarks of the query counts of every endpoint."""
+
+    fixtures = ["groups", "styles"]
+    measurements = []
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+
+        cls.tokens = {}
+
+        for group in (Groups.management, Groups.employer):
+            user = UserFactory(group=Group.objects.get(id=group))
+            cls.tokens[group] = AuthFactory(user=user)
+
+            if group == Groups.employer:
+                MemberFactory(account=user, company=cls.company)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Overridden to write the report of the measurements."""
+
+        path = os.environ.get("BENCHMARK_REPORT")
+
+        if path and cls.measurements:
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(Measurement._fields)
+                writer.writerows(cls.measurements)
+
+        super().tearDownClass()
+
+    @classmethod
+    def _seed(cls, companies):
+        """
+        Seed the companies, each with answered sessions of its members.
+
+        The company of the employer is always seeded as well, so that
+        the endpoints that are scoped to a company grow too.
+
+        :param companies: The number of additional companies to seed
+        :type companies: int
+        """
+        employee = Group.objects.get(id=Groups.employee)
+        seeded = [cls.company] + [CompanyFactory() for _ in range(companies)]
+
+        for company in seeded:
+            session = SessionFactory(company=company)
+            questions = [
+                QuestionFactory(set=session.set) for _ in range(QUESTIONS)
+            ]
+
+            answers = [
+                AnswerFactory(answers=question.answers)
+                for question in questions
+            ]
+
+            for _ in range(MEMBERS):
+                user = UserFactory(group=employee)
+                MemberFactory(account=user, company=company)
+
+                SessionScore.objects.track(*(
+                    AnsweredFactory(
+                        session=session,
+                        question=question,
+                        answer=answer,
+                        answerer=user,
+                    )
+                    for question, answer in zip(questions, answers)
+                ))
+
+    def _measure(self, volume):
+        """
+        Request every endpoint and measure the response.
+
+        Every endpoint is requested twice, so that the first request
+        warms up the caches, like the token cache.
+
+        :param volume: The volume of the data that is measured
+        :type volume: int
+
+        :return: The measurements per endpoint
+        :rtype: dict[str, backend.tests.Measurement]
+        """
+        measurements = {}
+        defaults = {
+            "since": now() - datetime.timedelta(days=7),
+            "until": now() + datetime.timedelta(days=7),
+            "company": self.company.id,
+        }
+
+        for name, group, parameters in ENDPOINTS:
+            token = self.tokens[group].plain
+            self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+            parameters = {
+                key: defaults[key] if value is None else value
+                for key, value in parameters.items()
+            }
+
+            for _ in range(2):
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    response = self.client.get(reverse(name), parameters)
+
+                    if response.streaming:
+                        content = b"".join(response.streaming_content)
+
+                    else:
+                        content = response.content
+
+                    seconds = time.perf_counter() - start
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK, name)
+
+            measurements[name] = Measurement(
+                name,
+                volume,
+                len(context.captured_queries),
+                round(seconds, 4),
+                len(content),
+            )
+
+        self.measurements.extend(measurements.values())
+        return measurements
+
+    def test_every_endpoint(self):
+        """Verify that every endpoint is benchmarked."""
+
+        names = {name for name, _, _ in ENDPOINTS}
+
+        for name in _list_endpoints():
+            with self.subTest(endpoint=name):
+                self.assertIn(name, names | WRITE_ONLY)
+
+    def test_constant_queries(self):
+        """Verify that the number of queries doesn't grow with the data."""
+
+        results = []
+
+        for volume in VOLUMES:
+            self._seed(volume)
+            results.append(self._measure(volume))
+
+        small, large = results
+
+        for name, _, _ in ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertGreater(large[name].size, 0)
+                self.assertEqual(small[name].queries, large[name].queries)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Explains SQLite plans")
+class TestQueryPlans(APITestCase):
+    """Verify that the hot queries are answered by the indexes."""
+
+    def _explain(self, queryset):
+        """
+        Explain the query plan of a queryset.
+
+        :param queryset: The queryset to explain
+        :type queryset: django.db.models.query.QuerySet
+
+        :return: The details of every step of the plan
+        :rtype: list[str]
+        """
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def _assert_searched(self, queryset, index=None):
+        """
+        Assert that no table is scanned, and that an index is used.
+
+        :param queryset: The queryset to explain
+        :type queryset: django.db.models.query.QuerySet
+
+        :param index: The name of the index that has to be used
+        :type index: str | None
+        """
+        plan = self._explain(queryset)
+
+        for step in plan:
+            self.assertFalse(step.startswith("SCAN"), plan)
+
+        if index is not None:
+            self.assertTrue(any(index in step for step in plan), plan)
+
+    def test_answered_by_company(self):
+        """Verify the answered questions of a company's members."""
+
+        self._assert_searched(
+            Answered.objects.filter(answerer__member__company=1)
+        )
+
+    def test_answered_export(self):
+        """Verify the answered questions of a session or company."""
+
+        for lookup in ("session", "session__company"):
+            with self.subTest(lookup=lookup):
+                queryset = Answered.objects.filter(**{lookup: 1})
+                queryset = queryset.order_by("id").values_list("id", "value")
+
+                self._assert_searched(queryset)
+
+    def test_live_sessions(self):
+        """Verify the sessions of a company that are alive."""
+
+        queryset = Session.objects.filter(
+            company=1, start__lte=now(), until__gte=now()
+        )
+
+        self._assert_searched(queryset, "activities_session_live_idx")
+
+    def test_company_charts(self):
+        """Verify the sessions of the company charts."""
+
+        queryset = CompanyChartsViewSet.queryset.filter(company=1)
+        self._assert_searched(queryset)
+
+    def test_company_trend(self):
+        """Verify the session scores of the company trend."""
+
+        queryset = SessionScore.objects.filter(
+            company=1,
+            session__start__lte=now(),
+            session__until__gte=now() - datetime.timedelta(days=7),
+        )
+
+        self._assert_searched(get_trend_query(queryset, "day"))
+
+    def test_user_weights(self):
+        """Verify the summed metadata weights of a user."""
+
+        queryset = MetaData.objects.filter(usermeta__user=1)
+        queryset = queryset.values("usermeta__user")
+
+        self._assert_searched(
+            queryset.annotate(total=Sum("weight")),
+            "analytics_usermeta_user_idx",
+        )
+
+    def test_members_by_company(self):
+        """Verify the members of a company, in the order of the cursor."""
+
+        queryset = Member.objects.filter(company=1).order_by("id")
+        self._assert_searched(queryset)
@@ -10,24 +10,39 @@ from django.utils.html import escape
 
 
 class EnvironmentEngine(object):
-    """Environment engine to parse content based on context."""
+    """
+    Environment engine to parse content based on context.
 
-    def __init__(self, environ, no_html=True):
+    Content is compiled once into literal and variable segments. The
+    compiled templates are cached for the whole process per key, which
+    is only valid for the same environment, content and version. The
+    version is the one of the 'environments' registry the environment
+    was resolved from, which is bumped by every process that changed an
+    environment or variable, see 'utilities.registry'.
+    """
+
+    pattern = re.compile(r"{([a-zA-Z\s]+?)}")
+
+    templates = {}
+
+    def __init__(self, environ, no_html=True, version=None):
         """
         Initialize the engine.
 
-        :param environ: The environment to use
-        :type environ: communications.models.Environment
+        :param environ: The environment to use, see 'environments'
+        :type environ: communications.registries.EnvironmentRecord
 
         :param no_html: If set we'll escape the html special chars
         :type no_html: bool
+
+        :param version: The version of the registry of the environment
+        :type version: int | None
         """
         self.environ = environ
-        self.pattern = re.compile(r"{([a-zA-Z\s]+?)}")
-        self.mapping = dict(self.environ.variables.values_list("name", "attr"))
         self.no_html = no_html
+        self.version = version
 
-    def __call__(self, content, context):
+    def __call__(self, content, context, key=None):
         """
         Process the actual content.
 
@@ -37,13 +52,82 @@ class EnvironmentEngine(object):
         :param context: A dictionary with the actual value's
         :type context: dict
 
+        :param key: The key to cache the compiled content with
+        :type key: collections.abc.Hashable | None
+
+        :return: The processed content
+        :rtype: str
+        """
+        if key is None:
+            return self.render(self.compile(content), context)
+
+        token = (self.environ.id, hash(content), self.version)
+        cached = self.templates.get(key)
+
+        if cached is None or cached[0] != token:
+            cached = token, self.compile(content)
+            self.templates[key] = cached
+
+        return self.render(cached[1], context)
+
+    @classmethod
+    def invalidate(cls, key=None):
+        """
+        Invalidate a single compiled template, or all of them.
+
+        :param key: The key of the template, or None for all templates
+        :type key: collections.abc.Hashable | None
+        """
+        if key is not None:
+            cls.templates.pop(key, None)
+            return
+
+        cls.templates.clear()
+
+    def compile(self, content):
+        """
+        Split the content into literal and variable segments.
+
+        :param content: The content to compile
+        :type content: str
+
+        :return: The (literal, attribute) segments and the trailing literal
+        :rtype: tuple
+        """
+        mapping = self.environ.variables
+
+        position = 0
+        segments = []
+
+        for match in self.pattern.finditer(content):
+            literal = content[position:match.start()]
+            segments.append((literal, mapping[match.group(1)]))
+
+            position = match.end()
+
+        return tuple(segments), content[position:]
+
+    def render(self, template, context):
+        """
+        Fill in the context into a compiled template.
+
+        :param template: The compiled template, see 'compile'
+        :type template: tuple
+
+        :param context: A dictionary with the actual value's
+        :type context: dict
+
         :return: The processed content
         :rtype: str
         """
-        def callback(match):
-            replace = context[self.mapping[match.group(1)]]
-            replace = replace.replace(" ", "").lower()
+        segments, trailing = template
+        parts = []
+
+        for literal, attr in segments:
+            replace = context[attr].replace(" ", "").lower()
 
-            return escape(replace) if self.no_html else replace
+            parts.append(literal)
+            parts.append(escape(replace) if self.no_html else replace)
 
-        return self.pattern.sub(callback, content)
+        parts.append(trailing)
+        return "".join(parts)
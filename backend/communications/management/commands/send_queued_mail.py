@@ -0,0 +1,165 @@
+"""Management command to send the queued outgoing emails."""
+
+import time
+import datetime
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from communications.models import OutgoingMail
+
+
+class Command(BaseCommand):
+    """
+    Drain the queue of outgoing emails.
+
+    The queue is drained in batches over a single SMTP connection. A
+    failed email is retried after an exponential backoff until the
+    maximum number of attempts is reached.
+
+    Every batch is claimed first, and every email is stored right after
+    sending it, so concurrent workers don't send duplicates and a crash
+    only resends the email that was being sent.
+    """
+
+    help = "Send the queued outgoing emails."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="The number of emails to send per batch.",
+        )
+
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+            help="The number of attempts before an email is given up.",
+        )
+
+        parser.add_argument(
+            "--backoff",
+            type=int,
+            default=60,
+            help="The seconds to wait before the first retry.",
+        )
+
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=300,
+            help="The seconds a worker may take to send a batch.",
+        )
+
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep polling the queue every interval seconds.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually drain the queue, and keep polling if requested.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        while True:
+            sent, failed = self.drain(
+                options["batch_size"],
+                options["max_attempts"],
+                options["backoff"],
+                options["lease"],
+            )
+
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed")
+
+            if not options["interval"]:
+                break
+
+            time.sleep(options["interval"])
+
+    @staticmethod
+    def drain(batch_size, max_attempts, backoff, lease=300):
+        """
+        Send all the pending emails over a single connection.
+
+        :param batch_size: The number of emails to send per batch
+        :type batch_size: int
+
+        :param max_attempts: The number of attempts before giving up
+        :type max_attempts: int
+
+        :param backoff: The seconds to wait before the first retry
+        :type backoff: int
+
+        :param lease: The seconds a worker may take to send a batch
+        :type lease: int
+
+        :return: The number of sent and failed emails
+        :rtype: tuple[int, int]
+        """
+        sent = failed = 0
+        connection = get_connection()
+
+        try:
+            while True:
+                batch = OutgoingMail.objects.claim(
+                    batch_size, max_attempts, lease
+                )
+
+                if not batch:
+                    break
+
+                # Reuses the connection, or reopens it after a failure
+                connection.open()
+
+                for mail in batch:
+                    message = EmailMessage(
+                        mail.subject,
+                        mail.content,
+                        mail.sender,
+                        [mail.receiver],
+                        connection=connection,
+                    )
+
+                    try:
+                        message.send()
+
+                    except Exception as error:
+                        delay = backoff * 2 ** mail.attempts
+                        delay = datetime.timedelta(seconds=delay)
+
+                        mail.error = str(error)
+                        mail.attempts += 1
+                        mail.scheduled = now() + delay
+
+                        failed += 1
+                        connection.close()
+
+                    else:
+                        mail.sent = now()
+                        sent += 1
+
+                    mail.save(update_fields=(
+                        "sent", "error", "attempts", "scheduled"
+                    ))
+
+        finally:
+            connection.close()
+
+        return sent, failed
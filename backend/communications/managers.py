@@ -2,11 +2,17 @@
 
 __all__ = (
     "EmailManager",
+    "OutgoingMailManager",
 )
 
+import uuid
+import datetime
+
 from django.db.models.query import Q, F
 from django.db.models.manager import Manager
 
+from django.utils.timezone import now
+
 
 class EmailManager(Manager):
     """Custom email manager to select the appropriate email."""
@@ -36,3 +42,86 @@ class EmailManager(Manager):
             query &= Q(company__isnull=True) | Q(company=company)
 
         return queryset.filter(Q(company=company) | query).first()
+
+
+class OutgoingMailManager(Manager):
+    """Custom manager for the queue of outgoing emails."""
+
+    def enqueue(self, messages):
+        """
+        Queue the messages with a single query.
+
+        :param messages: The (subject, content, sender, receivers) tuples
+        :type messages: collections.abc.Iterable[tuple]
+
+        :return: The queued emails
+        :rtype: list[communications.models.OutgoingMail]
+        """
+        return self.bulk_create(
+            self.model(
+                subject=subject,
+                content=content,
+                sender=sender,
+                receiver=receiver,
+            )
+
+            for subject, content, sender, receivers in messages
+            for receiver in receivers
+        )
+
+    def pending(self, max_attempts):
+        """
+        Select the emails that should be send at this moment.
+
+        :param max_attempts: The number of attempts before giving up
+        :type max_attempts: int
+
+        :return: The pending emails, oldest first
+        :rtype: django.db.models.query.QuerySet
+        """
+        queryset = self.get_queryset().filter(
+            sent__isnull=True,
+            scheduled__lte=now(),
+            attempts__lt=max_attempts,
+        )
+
+        return queryset.order_by("scheduled", "id")
+
+    def claim(self, batch_size, max_attempts, lease):
+        """
+        Claim a batch of pending emails for a single worker.
+
+        The emails are leased by rescheduling them after the lease,
+        within a single conditional update, so emails that another
+        worker claimed in the meantime are skipped. Emails that aren't
+        sent before the lease expired are pending again.
+
+        :param batch_size: The maximum number of emails to claim
+        :type batch_size: int
+
+        :param max_attempts: The number of attempts before giving up
+        :type max_attempts: int
+
+        :param lease: The seconds the worker may take to send the batch
+        :type lease: int
+
+        :return: The claimed emails
+        :rtype: list[communications.models.OutgoingMail]
+        """
+        moment = now()
+        owner = uuid.uuid4().hex
+
+        pending = self.pending(max_attempts).values_list("id", flat=True)
+        candidates = list(pending[:batch_size])
+
+        self.filter(
+            id__in=candidates,
+            sent__isnull=True,
+            scheduled__lte=moment,
+        ).update(
+            owner=owner,
+            scheduled=moment + datetime.timedelta(seconds=lease),
+        )
+
+        claimed = self.filter(id__in=candidates, owner=owner)
+        return list(claimed.order_by("id"))
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.5 on 2026-10-17 21:52
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingMail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=78)),
+                ('content', models.TextField()),
+                ('sender', models.EmailField(max_length=254)),
+                ('receiver', models.EmailField(max_length=254)),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('scheduled', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent', models.DateTimeField(null=True)),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='outgoingmail',
+            index=models.Index(fields=['sent', 'scheduled'], name='communicati_sent_27d99d_idx'),
+        ),
+    ]
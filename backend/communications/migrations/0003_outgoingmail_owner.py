@@ -0,0 +1,18 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0002_outgoingmail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingmail',
+            name='owner',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
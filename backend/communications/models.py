@@ -4,10 +4,18 @@ __all__ = (
     "Email",
     "Variable",
     "Environment",
+    "OutgoingMail",
 )
 
+from django.dispatch.dispatcher import receiver
+from django.utils.timezone import now
+
 from django.db.models import Model
+from django.db.models.signals import post_save, post_delete
+from django.db.models.indexes import Index
 from django.db.models.fields import TextField, CharField
+from django.db.models.fields import DateTimeField, EmailField
+from django.db.models.fields import PositiveSmallIntegerField
 
 from django.db.models.deletion import CASCADE
 from django.db.models.deletion import PROTECT
@@ -18,7 +26,9 @@ from django.db.models.fields.related import ManyToManyField
 from companies.models import Company
 
 from communications.engine import EnvironmentEngine
+from communications.registries import environments
 from communications.managers import EmailManager
+from communications.managers import OutgoingMailManager
 
 
 class Variable(Model):
@@ -78,5 +88,60 @@ class Email(Model):
         :return: The processed email
         :rtype: str
         """
-        engine = EnvironmentEngine(self.environ)
-        return engine(self.content, context)
+        version, records = environments.snapshot
+
+        engine = EnvironmentEngine(records[self.environ_id], version=version)
+        return engine(self.content, context, self.id)
+
+
+class OutgoingMail(Model):
+    """
+    A single queued outgoing email.
+
+    The requests only insert these records, the emails are actually
+    send by the 'send_queued_mail' management command. When sending
+    fails the email is rescheduled with an exponential backoff.
+
+    A worker claims a batch by leasing it, so concurrent workers never
+    send the same email, and the emails of a crashed worker are pending
+    again once the lease expired.
+    """
+
+    class Meta:
+        indexes = [Index(fields=("sent", "scheduled"))]
+
+    subject = CharField(max_length=78)
+    content = TextField()
+    sender = EmailField()
+    receiver = EmailField()
+
+    created = DateTimeField(default=now, editable=False)
+    scheduled = DateTimeField(default=now)
+    sent = DateTimeField(null=True)
+
+    error = TextField(blank=True)
+    attempts = PositiveSmallIntegerField(default=0)
+
+    # The worker that claimed the email, see 'OutgoingMailManager.claim'
+    owner = CharField(max_length=32, blank=True)
+
+    objects = OutgoingMailManager()
+
+
+@receiver(post_save, sender=Email)
+@receiver(post_delete, sender=Email)
+def _invalidate_email(sender, instance, **kwargs):
+    """
+    Drop the compiled template of the changed email.
+
+    :param sender: The model's class
+    :type sender: type of communications.models.Email
+
+    :param instance: The email instance that was changed
+    :type instance: communications.models.Email
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    EnvironmentEngine.invalidate(instance.id)
+    del sender, kwargs
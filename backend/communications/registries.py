@@ -0,0 +1,62 @@
+"""Registries of the constant communication tables."""
+
+__all__ = (
+    "variables",
+    "environments",
+    "EnvironmentRecord",
+    "EnvironmentRegistry",
+)
+
+import collections
+
+from types import MappingProxyType
+
+from utilities.registry import Registry
+
+EnvironmentRecord = collections.namedtuple(
+    "EnvironmentRecord", ("id", "label", "variables")
+)
+
+
+class EnvironmentRegistry(Registry):
+    """
+    Registry of the environments together with their variables.
+
+    The variables of a record map the names within the content of an
+    email to the attributes of the context, see 'EnvironmentEngine'.
+    """
+
+    def fetch(self):
+        """
+        Overridden to add the variables of every environment.
+
+        :return: The records by their primary key
+        :rtype: dict[int, communications.registries.EnvironmentRecord]
+        """
+        through = self.model.variables.through
+        mappings = collections.defaultdict(dict)
+
+        rows = through.objects.values_list(
+            "environment_id", "variable__name", "variable__attr"
+        )
+
+        for environ, name, attr in rows:
+            mappings[environ][name] = attr
+
+        return {
+            row.id: EnvironmentRecord(
+                row.id, row.label, MappingProxyType(mappings[row.id])
+            )
+
+            for row in super().fetch().values()
+        }
+
+
+# The variables and environments of the 'variables.json' fixture
+variables = Registry("communications.Variable", ("name", "attr"))
+
+environments = EnvironmentRegistry(
+    "communications.Environment",
+    ("label",),
+    ("communications.Variable", "communications.Environment_variables"),
+)
@@ -1,3 +1,189 @@
+"""Unittests for the communications app."""
+
+import io
+
+from unittest import mock
+
+from django.core import mail as outbox
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils.timezone import now
+
+from communications.engine import EnvironmentEngine
+from communications.registries import environments
+from communications.utils import MultiMailTransport
+from communications.models import Email, Environment, Variable, OutgoingMail
+
+from utilities.caching import bump_version
+
+
+class TestEnvironmentEngine(TestCase):
+    """Unittests for the compiled templates of the environment engine."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.email = Variable.objects.create(name="email", attr="email")
+        cls.company = Variable.objects.create(name="bedrijf", attr="company")
+
+        cls.environ = Environment.objects.create(label="account")
+        cls.environ.variables.add(cls.email, cls.company)
+
+        cls.mail = Email.objects.create(
+            subject="Account",
+            content="<p>{email} of {bedrijf}</p>",
+            environ=cls.environ,
+        )
+
+    def setUp(self):
+        environments.reload()
+        EnvironmentEngine.invalidate()
+
+    def test_process_content(self):
+        """Verify that the variables are filled in and escaped."""
+
+        content = self.mail.process_content({
+            "email": "Jane@Example.com",
+            "company": "A & B",
+        })
+
+        self.assertEqual(content, "<p>jane@example.com of a&amp;b</p>")
+
+    def test_cached_rendering(self):
+        """Verify that rendering recipients doesn't query the database."""
+
+        mail = Email.objects.select_email(self.environ)
+        mail.process_content({"email": "a", "company": "b"})
+
+        with self.assertNumQueries(0):
+            for address in ("c", "d", "e"):
+                mail.process_content({"email": address, "company": "f"})
+
+    def test_compile_without_queries(self):
+        """Verify that the variables are resolved from the registry."""
+
+        mail = Email.objects.select_email(self.environ)
+        mail.process_content({"email": "a", "company": "b"})
+
+        mail.content = "{bedrijf} of {email}"
+
+        with self.assertNumQueries(0):
+            content = mail.process_content({"email": "a", "company": "b"})
+
+        self.assertEqual(content, "b of a")
+
+    def test_invalidation(self):
+        """Verify that changes to the variables invalidate the cache."""
+
+        mail = Email.objects.get(id=self.mail.id)
+        company = Variable.objects.get(id=self.company.id)
+
+        context = {"email": "a", "company": "b"}
+        mail.process_content(context)
+
+        company.name = "organisatie"
+        company.save()
+
+        mail.content = "{email} of {organisatie}"
+        mail.save()
+
+        self.assertEqual(mail.process_content(context), "a of b")
+
+        company.name = "bedrijf"
+        company.save()
+
+        with self.assertRaises(KeyError):
+            mail.process_content(context)
+
+    def test_invalidation_from_other_process(self):
+        """Verify that a version bumped elsewhere recompiles the content."""
+
+        mail = Email.objects.get(id=self.mail.id)
+        context = {"email": "a", "company": "b"}
+
+        mail.process_content(context)
+
+        # Another process would only bump the version in the shared cache
+        Variable.objects.filter(id=self.company.id).update(name="firma")
+        self.assertEqual(mail.process_content(context), "<p>a of b</p>")
+
+        bump_version(environments.namespace)
+
+        with self.assertRaises(KeyError):
+            mail.process_content(context)
+
+
+class TestOutgoingMail(TestCase):
+    """Unittests for the queue of outgoing emails."""
+
+    @classmethod
+    def setUpTestData(cls):
+        variable = Variable.objects.create(name="email", attr="email")
+
+        cls.environ = Environment.objects.create(label="account")
+        cls.environ.variables.add(variable)
+
+        Email.objects.create(
+            subject="Account",
+            content="Welcome {email}",
+            environ=cls.environ,
+        )
+
+    def _enqueue(self, *addresses):
+        """
+        Queue a email for every address through the transport.
+
+        :param addresses: The addresses to send the email to
+        :type addresses: str
+
+        :return: The number of queued emails
+        :rtype: int
+        """
+        transport = MultiMailTransport({}, self.environ, None)
+        return transport.finish(transport(a, {"email": a}) for a in addresses)
+
+    def test_enqueue(self):
+        """Verify that the transport only queues the emails."""
+
+        self.assertEqual(self._enqueue("a@example.com", "b@example.com"), 2)
+        self.assertEqual(len(outbox.outbox), 0)
+        self.assertEqual(OutgoingMail.objects.filter(sent=None).count(), 2)
+
+    def test_send(self):
+        """Verify that the command sends all the queued emails."""
+
+        self._enqueue("a@example.com", "b@example.com", "c@example.com")
+        call_command("send_queued_mail", batch_size=2, stdout=io.StringIO())
+
+        self.assertEqual(len(outbox.outbox), 3)
+        self.assertEqual(outbox.outbox[0].body, "Welcome a@example.com")
+        self.assertFalse(OutgoingMail.objects.filter(sent=None).exists())
+
+    def test_retry(self):
+        """Verify that failed emails are rescheduled with a backoff."""
+
+        self._enqueue("a@example.com")
+
+        with mock.patch("django.core.mail.EmailMessage.send") as send:
+            send.side_effect = OSError("connection refused")
+            call_command("send_queued_mail", stdout=io.StringIO())
+
+        queued = OutgoingMail.objects.get()
+
+        self.assertIsNone(queued.sent)
+        self.assertEqual(queued.attempts, 1)
+        self.assertEqual(queued.error, "connection refused")
+        self.assertFalse(OutgoingMail.objects.pending(5).exists())
+
+    def test_claim(self):
+        """Verify that a claimed email isn't claimed by another worker."""
+
+        self._enqueue("a@example.com", "b@example.com")
+
+        claimed = OutgoingMail.objects.claim(10, 5, 300)
+
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual(OutgoingMail.objects.claim(10, 5, 300), [])
 
-# Create your tests here.
+        # The emails of a crashed worker are pending after the lease
+        OutgoingMail.objects.update(scheduled=now())
+        self.assertEqual(len(OutgoingMail.objects.claim(10, 5, 300)), 2)
@@ -1,13 +1,28 @@
 """Communications utilities."""
 
 __all__ = (
+    "Environments",
     "MultiMailTransport",
 )
 
+import enum
+
 from django.conf import settings
-from django.core.mail import send_mass_mail
 
-from communications.models import Email
+from communications.models import Email, OutgoingMail
+
+
+class Environments(enum.IntEnum):
+    """
+    Primary key mapping of the stored email environments.
+
+    Please note that this must be equal to the
+    variables.json fixture.
+    """
+
+    employee = 1
+    employer = 2
+    follow_up = 3
 
 
 class MultiMailTransport(object):
@@ -49,15 +64,19 @@ class MultiMailTransport(object):
 
     def finish(self, iterable=None):
         """
-        Finish the transport by actually sending it.
+        Finish the transport by queueing the emails for sending.
+
+        The emails are actually send by the 'send_queued_mail'
+        management command, so that the request doesn't have to wait
+        for the SMTP server.
 
         :param iterable: A iterable that will be looped through if necessary
         :type iterable: iterable
 
-        :return: The number of emails send
+        :return: The number of queued emails
         :rtype: int
         """
         if iterable is not None:
             tuple(iterable)
 
-        return send_mass_mail(self.pending)
+        return len(OutgoingMail.objects.enqueue(self.pending))
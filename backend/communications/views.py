@@ -21,9 +21,15 @@ from communications.serializers import EmailSerializer
 from communications.serializers import VariableSerializer
 from communications.serializers import EnvironmentSerializer
 
+from utilities.mixins import InstrumentedMixin
+
 
 class VariableViewSet(
-    GenericViewSet, RetrieveModelMixin, UpdateModelMixin, ListModelMixin
+    InstrumentedMixin,
+    GenericViewSet,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    ListModelMixin,
 ):
     """Get a overview of the available variables."""
 
@@ -33,7 +39,11 @@ class VariableViewSet(
 
 
 class EnvironmentViewSet(
-    GenericViewSet, RetrieveModelMixin, UpdateModelMixin, ListModelMixin
+    InstrumentedMixin,
+    GenericViewSet,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    ListModelMixin,
 ):
     """Get a overview of the available variables."""
 
@@ -42,7 +52,7 @@ class EnvironmentViewSet(
     permission_classes = (IsManagement,)
 
 
-class EmailViewSet(ModelViewSet):
+class EmailViewSet(InstrumentedMixin, ModelViewSet):
     """Main view set for inspecting, creating and updating emails."""
 
     queryset = Email.objects.all()
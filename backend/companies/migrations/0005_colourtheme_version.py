@@ -0,0 +1,24 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_auto_20191015_2133'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='colourtheme',
+            name='modified',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='colourtheme',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
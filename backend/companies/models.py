@@ -10,10 +10,12 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.dispatch.dispatcher import receiver
 
 from django.db.models.base import Model
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save, pre_delete
+from django.utils.timezone import now
 
 from django.db.models.fields import CharField
 from django.db.models.fields import BigIntegerField
+from django.db.models.fields import DateTimeField, PositiveIntegerField
 from django.db.models.fields.related import CASCADE, SET_NULL
 from django.db.models.fields.related import OneToOneField, ForeignKey
 
@@ -49,6 +51,10 @@ class ColourTheme(Model):
 
     logo = ForeignKey(Image, SET_NULL, null=True)
 
+    # Raised on every save, used to answer conditional requests
+    version = PositiveIntegerField(default=0, editable=False)
+    modified = DateTimeField(default=now, editable=False)
+
 
 @receiver(pre_delete, sender=Company)
 def _cascade_delete_company(sender, instance, **kwargs):
@@ -66,3 +72,21 @@ def _cascade_delete_company(sender, instance, **kwargs):
     """
     User.objects.filter(member__company=instance).delete()
     del sender, kwargs
+
+
+@receiver(pre_save, sender=ColourTheme)
+def _bump_colour_theme_version(sender, instance, **kwargs):
+    """
+    Raise the version of a colour theme that is about to be saved.
+
+    :param sender: The model's class
+    :type sender: type of companies.models.ColourTheme
+
+    :param instance: The colour theme that will be saved
+    :type instance: companies.models.ColourTheme
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    instance.version += 1
+    instance.modified = now()
@@ -3,11 +3,13 @@
 __all__ = (
     "MemberSerializer",
     "CompanySerializer",
+    "CompanyLogoSerializer",
     "ColourThemeSerializer",
 )
 
 from rest_framework.serializers import ModelSerializer
 from rest_framework.serializers import HyperlinkedRelatedField
+from rest_framework.serializers import HyperlinkedIdentityField
 
 from accounts.utils import is_employee
 from accounts.utils import is_management
@@ -18,6 +20,7 @@ from companies.models import ColourTheme
 
 from utilities.models import Image
 from utilities.fields import HyperlinkedRelatedReadField
+from utilities.serializers import ImageSerializer
 
 
 class MemberSerializer(ModelSerializer):
@@ -112,3 +115,12 @@ class ColourThemeSerializer(ModelSerializer):
                 "read_only": True
             }
         }
+
+
+class CompanyLogoSerializer(ImageSerializer):
+    """Serializer for the metadata of a company logo."""
+
+    class Meta(ImageSerializer.Meta):
+        fields = ImageSerializer.Meta.fields + ("download",)
+
+    download = HyperlinkedIdentityField(view_name="company-logo-download")
@@ -1,5 +1,17 @@
 """Unittests for the company app."""
 
+import io
+import time
+import base64
+import tempfile
+import importlib
+
+from django.db import connection
+from django.apps import apps
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
 from rest_framework import status
 
 from rest_framework.test import APITestCase
@@ -17,12 +29,15 @@ from accounts.factories import AuthFactory
 from accounts.urls import urlpatterns as accounts_urlpatterns
 from companies.urls import urlpatterns as company_urlpatterns
 
-from companies.models import Member
+from companies.models import Member, ColourTheme
 
 from companies.factories import MemberFactory
 from companies.factories import CompanyFactory
 
-from utilities.factories import ImageFactory
+from PIL import Image as PillowImage
+
+from utilities.models import Image
+from utilities.factories import BLACK_PIXEL
 
 
 class TestCompanyView(URLPatternsTestCase, APITestCase):
@@ -126,10 +141,10 @@ class TestCompanyView(URLPatternsTestCase, APITestCase):
 
             content["members"] = members
 
-        self.assertIsInstance(response.data, list)
+        self.assertIsInstance(response.data["results"], list)
 
-        self.assertEqual(len(response.data), 1)
-        self.assertDictEqual(response.data[0], content)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertDictEqual(response.data["results"][0], content)
 
     def test_list_companies_as_management(self):
         """Validate the response for the management."""
@@ -171,11 +186,38 @@ class TestCompanyView(URLPatternsTestCase, APITestCase):
             "members": [],
         }
 
-        self.assertIsInstance(response.data, list)
+        self.assertIsInstance(response.data["results"], list)
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertDictEqual(response.data["results"][0], company)
+        self.assertDictEqual(response.data["results"][1], ignored)
+
+    def test_list_constant_queries(self):
+        """Verify that the number of queries doesn't grow with companies."""
+
+        authorization = f"Token {self.management_token.plain}"
+        self.client.credentials(HTTP_AUTHORIZATION=authorization)
+
+        # The first request caches the token, see 'TokenCache'
+        self.client.get(reverse("company-list"))
+        counts = []
+
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse("company-list"))
 
-        self.assertEqual(len(response.data), 2)
-        self.assertDictEqual(response.data[0], company)
-        self.assertDictEqual(response.data[1], ignored)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(context.captured_queries))
+
+            company = CompanyFactory()
+            MemberFactory(
+                account=UserFactory(
+                    group=Group.objects.get(id=Groups.employee)
+                ),
+                company=company,
+            )
+
+        self.assertEqual(counts[0], counts[1])
 
     def _reverse_memberships(self, members, request):
         """
@@ -287,7 +329,7 @@ class TestMembersView(URLPatternsTestCase, APITestCase):
             for i, c, a in members.values_list("id", "company", "account")
         ]
 
-        self.assertListEqual(members, response.data)
+        self.assertListEqual(members, response.data["results"])
 
     def test_list_members_as_employee(self):
         """Test the response of the member view as employer."""
@@ -330,7 +372,7 @@ class TestMembersView(URLPatternsTestCase, APITestCase):
             for i, c, a in members.values_list("id", "company", "account")
         ]
 
-        self.assertListEqual(members, response.data)
+        self.assertListEqual(members, response.data["results"])
 
     def test_list_members_as_management(self):
         """Test the response of the member view as management."""
@@ -353,7 +395,31 @@ class TestMembersView(URLPatternsTestCase, APITestCase):
             for i, c, a in members.values_list("id", "company", "account")
         ]
 
-        self.assertListEqual(members, response.data)
+        self.assertListEqual(members, response.data["results"])
+
+    def test_cursor_pagination(self):
+        """Test that the members are paged with a capped cursor."""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.management_token.plain}"
+        )
+
+        url = reverse("member-list") + "?page_size=100"
+        pages = []
+
+        with override_settings(PAGINATION_MAX_PAGE_SIZE=3):
+            while url is not None:
+                response = self.client.get(url)
+                results = response.data["results"]
+
+                pages.append([member["id"] for member in results])
+                url = response.data["next"]
+
+        self.assertListEqual([len(page) for page in pages], [3, 1])
+        self.assertListEqual(
+            sum(pages, []),
+            list(Member.objects.order_by("id").values_list("id", flat=True)),
+        )
 
 
 class TestCompanyThemeView(URLPatternsTestCase, APITestCase):
@@ -409,7 +475,7 @@ class TestCompanyThemeView(URLPatternsTestCase, APITestCase):
             }
         ]
 
-        self.assertSequenceEqual(expected, response.data)
+        self.assertSequenceEqual(expected, response.data["results"])
 
     def test_list_colours_as_management(self):
         self.client.credentials(
@@ -427,6 +493,13 @@ class TestCompanyThemeView(URLPatternsTestCase, APITestCase):
                     Request(response.wsgi_request)
                 ),
 
+                "company": reverse(
+                    "company-detail",
+                    [self.company.id],
+                    None,
+                    Request(response.wsgi_request)
+                ),
+
                 "primary": self.company.theme.primary,
                 "accent": self.company.theme.accent,
                 "id": self.company.theme.id,
@@ -440,13 +513,20 @@ class TestCompanyThemeView(URLPatternsTestCase, APITestCase):
                     Request(response.wsgi_request)
                 ),
 
+                "company": reverse(
+                    "company-detail",
+                    [self.ignored.id],
+                    None,
+                    Request(response.wsgi_request)
+                ),
+
                 "primary": self.ignored.theme.primary,
                 "accent": self.ignored.theme.accent,
                 "id": self.ignored.theme.id,
             }
         ]
 
-        self.assertSequenceEqual(expected, response.data)
+        self.assertSequenceEqual(expected, response.data["results"])
 
 
 class TestCompanyLogoView(URLPatternsTestCase, APITestCase):
@@ -473,6 +553,31 @@ class TestCompanyLogoView(URLPatternsTestCase, APITestCase):
         MemberFactory(account=cls.employer, company=cls.company)
         MemberFactory(account=cls.employee, company=cls.company)
 
+    def _expected_logo(self, company, request):
+        """
+        The expected metadata of the logo of a company.
+
+        :param company: The company who's logo to expect
+        :type company: companies.models.Company
+
+        :param request: The request instance that holds the domain
+        :type request: rest_framework.request.Request
+
+        :return: The expected serialized logo
+        :rtype: dict
+        """
+        logo = company.theme.logo
+
+        return {
+            "id": logo.id,
+            "path": logo.path,
+            "mime": "PNG",
+            "size": len(BLACK_PIXEL),
+            "download": reverse(
+                "company-logo-download", [logo.id], None, request
+            ),
+        }
+
     def test_list_colours_as_employee(self):
         self.client.credentials(
             HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
@@ -480,16 +585,10 @@ class TestCompanyLogoView(URLPatternsTestCase, APITestCase):
 
         response = self.client.get(reverse("company-logo-list"))
         expected = [
-            {
-                "id": self.company.theme.logo.id,
-                "data": b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAAAAAA6fptVAA'
-                        b'AACklEQVR4nGNiAAAABgADNjd8qAAAAABJRU5ErkJggg==',
-                "path": self.company.theme.logo.path,
-                "mime": "PNG",
-            }
+            self._expected_logo(self.company, Request(response.wsgi_request))
         ]
 
-        self.assertSequenceEqual(expected, response.data)
+        self.assertSequenceEqual(expected, response.data["results"])
 
     def test_list_colours_as_management(self):
         self.client.credentials(
@@ -498,20 +597,227 @@ class TestCompanyLogoView(URLPatternsTestCase, APITestCase):
 
         response = self.client.get(reverse("company-logo-list"))
         expected = [
-            {
-                "id": self.company.theme.logo.id,
-                "data": b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAAAAAA6fptVAA'
-                        b'AACklEQVR4nGNiAAAABgADNjd8qAAAAABJRU5ErkJggg==',
-                "path": self.company.theme.logo.path,
-                "mime": "PNG",
-            },
-            {
-                "id": self.ignored.theme.logo.id,
-                "data": b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAAAAAA6fptVAA'
-                        b'AACklEQVR4nGNiAAAABgADNjd8qAAAAABJRU5ErkJggg==',
-                "path": self.ignored.theme.logo.path,
-                "mime": "PNG",
-            }
+            self._expected_logo(self.company, Request(response.wsgi_request)),
+            self._expected_logo(self.ignored, Request(response.wsgi_request)),
         ]
 
-        self.assertSequenceEqual(expected, response.data)
+        self.assertSequenceEqual(expected, response.data["results"])
+
+    def test_list_without_data(self):
+        """Verify that listing the logos doesn't select the raw bytes."""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.managing_token.plain}"
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("company-logo-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for query in context.captured_queries:
+            self.assertNotIn('"utilities_image"."data"', query["sql"])
+
+    def test_download(self):
+        """Verify that the bytes of a logo are streamed."""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+        url = reverse("company-logo-download", [self.company.theme.logo.id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(b"".join(response.streaming_content), BLACK_PIXEL)
+
+    def test_upload(self):
+        """Verify that uploaded logos are written to the file storage."""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.managing_token.plain}"
+        )
+
+        content = {
+            "path": "logo.png",
+            "mime": "image/png",
+            "data": base64.b64encode(BLACK_PIXEL).decode(),
+        }
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            response = self.client.post(
+                reverse("company-logo-list"), content, format="json"
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertNotIn("data", response.data)
+
+            image = Image.objects.get(id=response.data["id"])
+
+            self.assertIsNone(image.data)
+            self.assertEqual(image.size, len(BLACK_PIXEL))
+
+            with image.open() as file:
+                self.assertEqual(file.read(), BLACK_PIXEL)
+
+    def test_thumbnails(self):
+        """Verify that thumbnails are rendered and selected by size."""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.managing_token.plain}"
+        )
+
+        buffer = io.BytesIO()
+        PillowImage.new("RGB", (300, 150)).save(buffer, "PNG")
+
+        content = {
+            "path": "logo.png",
+            "mime": "image/png",
+            "data": base64.b64encode(buffer.getvalue()).decode(),
+        }
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            response = self.client.post(
+                reverse("company-logo-list"), content, format="json"
+            )
+
+            url = reverse("company-logo-download", [response.data["id"]])
+
+            for size, expected in ((64, 64), (100, None), (256, 256)):
+                with self.subTest(size=size):
+                    response = self.client.get(url, {"size": size})
+
+                    if expected is None:
+                        self.assertEqual(
+                            response.status_code,
+                            status.HTTP_400_BAD_REQUEST,
+                        )
+
+                        continue
+
+                    data = b"".join(response.streaming_content)
+                    image = PillowImage.open(io.BytesIO(data))
+
+                    self.assertEqual(image.size, (expected, expected // 2))
+
+    def test_render_missing_thumbnails(self):
+        """Verify that the migration renders the thumbnails of old logos."""
+
+        migration = importlib.import_module(
+            "utilities.migrations.0006_render_thumbnails"
+        )
+
+        buffer = io.BytesIO()
+        PillowImage.new("RGB", (300, 150)).save(buffer, "PNG")
+
+        # Stored within the table, before the thumbnails were rendered
+        image = Image.objects.create(
+            mime="image/png", path="logo.png", data=buffer.getvalue()
+        )
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            migration.render_missing_thumbnails(apps, None)
+
+        sizes = image.thumbnails.values_list("size", flat=True)
+        self.assertEqual(sorted(sizes), [64, 128, 256])
+
+
+class TestConditionalRequests(URLPatternsTestCase, APITestCase):
+    """Unittests for the conditional requests of the company branding."""
+
+    fixtures = ["groups"]
+    urlpatterns = company_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyFactory()
+        cls.employee = UserFactory(group=Group.objects.get(id=Groups.employee))
+        cls.employee_token = AuthFactory(user=cls.employee)
+
+        MemberFactory(account=cls.employee, company=cls.company)
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.employee_token.plain}"
+        )
+
+    def test_not_modified(self):
+        """Verify that a matching ETag is answered with 304."""
+
+        urls = (
+            reverse("colour-theme-list"),
+            reverse("colour-theme-detail", [self.company.theme.id]),
+            reverse("company-logo-list"),
+            reverse("company-logo-download", [self.company.theme.logo.id]),
+        )
+
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+                response = self.client.get(
+                    url, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+
+                self.assertEqual(
+                    response.status_code, status.HTTP_304_NOT_MODIFIED
+                )
+
+    def test_last_modified(self):
+        """Verify that only the details carry a Last-Modified."""
+
+        detail = reverse("colour-theme-detail", [self.company.theme.id])
+        response = self.client.get(detail)
+
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            detail, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(reverse("colour-theme-list"))
+        self.assertNotIn("Last-Modified", response)
+
+    def test_deleted_from_list(self):
+        """Verify that a list isn't 'not modified' after a deletion."""
+
+        management = UserFactory(
+            group=Group.objects.get(id=Groups.management)
+        )
+
+        token = AuthFactory(user=management)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.plain}")
+
+        other = CompanyFactory()
+        url = reverse("colour-theme-list")
+
+        self.client.get(url)
+        ColourTheme.objects.filter(company=other).delete()
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_modified(self):
+        """Verify that saving a theme changes the ETag."""
+
+        url = reverse("colour-theme-detail", [self.company.theme.id])
+        etag = self.client.get(url)["ETag"]
+
+        theme = ColourTheme.objects.get(id=self.company.theme.id)
+        theme.accent = 0
+        theme.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["accent"], 0)
@@ -7,10 +7,14 @@ __all__ = (
     "ColourThemeViewSet",
 )
 
+from django.http.response import FileResponse
+
+from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
 
 from accounts.utils import is_employee
 from accounts.utils import is_management
+from accounts.principal import get_principal
 
 from accounts.permissions import IsEmployer
 from accounts.permissions import IsAcceptable
@@ -23,13 +27,18 @@ from companies.models import Company, Member
 
 from companies.serializers import MemberSerializer
 from companies.serializers import CompanySerializer
+from companies.serializers import CompanyLogoSerializer
 from companies.serializers import ColourThemeSerializer
 
 from utilities.models import Image
-from utilities.serializers import ImageSerializer
+from utilities.mixins import InstrumentedMixin
+from utilities.mixins import ReplicaMixin
+from utilities.mixins import QueryPlanMixin
+from utilities.mixins import ConditionalMixin
+from utilities.serializers import DownloadParameterSerializer
 
 
-class MemberViewSet(ModelViewSet):
+class MemberViewSet(InstrumentedMixin, ReplicaMixin, ModelViewSet):
     """ViewSet to forward membership relations."""
 
     queryset = Member.objects.all()
@@ -46,22 +55,44 @@ class MemberViewSet(ModelViewSet):
         :return: The filtered queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        if is_employee(self.request.user, False):
-            return queryset.filter(account=self.request.user)
+        if is_employee(principal, False):
+            return queryset.filter(account=principal.user_id)
 
-        return queryset.filter(company__members__account=self.request.user)
+        return queryset.filter(company=principal.company_id)
 
 
-class CompanyViewSet(ModelViewSet):
+class CompanyViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
+    QueryPlanMixin,
+    ModelViewSet,
+):
     """ViewSet for companies."""
 
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = (IsManagementOrReadOnly,)
 
+    select_plan = ("theme",)
+    prefetch_plan = ("members",)
+
+    def get_prefetch_plan(self):
+        """
+        Overridden to skip the members, when they aren't serialized.
+
+        :return: The lookups of the relations to prefetch
+        :rtype: tuple[str]
+        """
+        if is_employee(get_principal(self.request), False):
+            return ()
+
+        return self.prefetch_plan
+
     def filter_queryset(self, queryset):
         """
         Filter out the companies that aren't related to the user.
@@ -72,14 +103,26 @@ class CompanyViewSet(ModelViewSet):
         :return: The filtered queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        return queryset.filter(members__account=self.request.user)
+        return queryset.filter(id=principal.company_id)
 
 
-class ColourThemeViewSet(ModelViewSet):
-    """ViewSet for the companies theme."""
+class ColourThemeViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
+    ConditionalMixin,
+    ModelViewSet,
+):
+    """
+    ViewSet for the companies theme.
+
+    The themes are fetched by every client at start, so conditional
+    requests are answered without serializing, see 'ConditionalMixin'.
+    """
 
     queryset = ColourTheme.objects.all()
     serializer_class = ColourThemeSerializer
@@ -98,21 +141,44 @@ class ColourThemeViewSet(ModelViewSet):
         :return: Teh filtered queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        return queryset.filter(
-            company__members__account=self.request.user.id
-        )
+        return queryset.filter(company=principal.company_id)
 
 
-class CompanyLogoViewSet(ModelViewSet):
-    """ViewSet for the company logo."""
+class CompanyLogoViewSet(
+    InstrumentedMixin,
+    ReplicaMixin,
+    ConditionalMixin,
+    ModelViewSet,
+):
+    """
+    ViewSet for the company logo.
+
+    The responses only carry the metadata of the logo, the bytes are
+    streamed from the file storage by the 'download' action. All of
+    them answer conditional requests, see 'ConditionalMixin'.
+    """
 
     queryset = Image.objects.all()
-    serializer_class = ImageSerializer
+    serializer_class = CompanyLogoSerializer
     permission_classes = (IsAcceptable,)
 
+    def get_queryset(self):
+        """
+        Select the logos, only the download includes the raw bytes.
+
+        :return: The queryset with the logos
+        :rtype: django.db.models.query.QuerySet
+        """
+        if self.action == "download":
+            return Image.objects.with_data()
+
+        return Image.objects.all()
+
     def filter_queryset(self, queryset):
         """
         Filter out the unrelated logo's.
@@ -120,9 +186,46 @@ class CompanyLogoViewSet(ModelViewSet):
         :return: The image queryset
         :rtype: django.db.models.query.QuerySet
         """
-        if is_management(self.request.user):
+        principal = get_principal(self.request)
+
+        if is_management(principal):
             return queryset
 
-        return queryset.filter(
-            colourtheme__company__members__account=self.request.user
-        )
+        return queryset.filter(colourtheme__company=principal.company_id)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        Stream the bytes of the logo, or one of its thumbnails.
+
+        The optional 'size' parameter selects the smallest thumbnail
+        that covers the size, see 'utilities.thumbnails'.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param pk: The primary key of the logo
+        :type pk: str
+
+        :return: The streamed response with the bytes of the logo
+        :rtype: django.http.response.HttpResponseBase
+        """
+        return self.conditional(self.get_object_queryset(), self.stream)
+
+    def stream(self, request):
+        """
+        Actually stream the bytes of the requested logo.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: The streamed response with the bytes of the logo
+        :rtype: django.http.response.FileResponse
+        """
+        parameters = DownloadParameterSerializer(data=request.query_params)
+        parameters.is_valid(raise_exception=True)
+
+        image = self.get_object()
+        image = image.select(parameters.validated_data.get("size"))
+
+        return FileResponse(image.open(), content_type=image.content_type)
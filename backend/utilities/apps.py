@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class UtilitiesConfig(AppConfig):
     name = 'utilities'
+
+    def ready(self):
+        """Connect the tuning of the database connections and checks."""
+
+        import utilities.checks  # noqa: F401
+        import utilities.database  # noqa: F401
@@ -0,0 +1,72 @@
+"""Versioned caching of responses that change only on writes."""
+
+__all__ = (
+    "get_version",
+    "bump_version",
+)
+
+import time
+
+from django.core.cache import cache
+
+
+def _new_version():
+    """
+    Create a version that was never used, in microseconds since epoch.
+
+    :return: The new version
+    :rtype: int
+    """
+    return int(time.time() * 1e6)
+
+
+def _version_key(namespace):
+    """
+    Create the cache key of the version of a namespace.
+
+    :param namespace: The namespace of the cached responses
+    :type namespace: str
+
+    :return: The cache key
+    :rtype: str
+    """
+    return f"{namespace}.version"
+
+
+def get_version(namespace):
+    """
+    Get the current version of the cached responses of a namespace.
+
+    A version that was evicted is replaced by one that was never used,
+    so responses cached under an older version are never read again.
+
+    :param namespace: The namespace of the cached responses
+    :type namespace: str
+
+    :return: The current version
+    :rtype: int
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(namespace):
+    """
+    Invalidate all the cached responses of a namespace at once.
+
+    :param namespace: The namespace of the cached responses
+    :type namespace: str
+    """
+    key = _version_key(namespace)
+
+    try:
+        cache.incr(key)
+
+    except ValueError:
+        cache.set(key, _new_version(), None)
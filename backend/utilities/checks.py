@@ -0,0 +1,46 @@
+"""System checks of the settings the utilities depend on."""
+
+__all__ = (
+    "check_shared_cache",
+)
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# The cache backends that aren't shared with the other processes
+PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Verify that the default cache is shared by all the processes.
+
+    The replica stickiness, the versions of the cached tokens, cached
+    responses and registries are written by the process that handled a
+    write, and have to be read by every other process, otherwise those
+    keep serving stale data.
+
+    :param app_configs: The apps to check, or None for all apps
+    :type app_configs: list | None
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+
+    :return: The errors of the cache settings
+    :rtype: list[django.core.checks.Error]
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+
+    if backend not in PROCESS_CACHES:
+        return []
+
+    return [Error(
+        f"The default cache '{backend}' isn't shared between processes.",
+        hint="Configure a shared cache with 'CACHE_BACKEND', like the "
+             "'FileBasedCache' or 'MemcachedCache'.",
+        id="utilities.E001",
+    )]
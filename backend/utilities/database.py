@@ -0,0 +1,111 @@
+"""Tuning of the database connections."""
+
+__all__ = (
+    "apply_pragmas",
+    "copy_database",
+)
+
+import os
+import shutil
+import sqlite3
+
+from django.conf import settings
+from django.dispatch.dispatcher import receiver
+from django.db.backends.signals import connection_created
+
+
+def apply_pragmas(cursor, pragmas):
+    """
+    Apply the pragmas to a SQLite connection.
+
+    The pragmas are applied in order, so the journal mode should come
+    first, because some pragmas depend on it.
+
+    :param cursor: A cursor of the connection to tune
+    :type cursor: sqlite3.Cursor | django.db.backends.utils.CursorWrapper
+
+    :param pragmas: The values of the pragmas by name
+    :type pragmas: dict[str, str | int]
+    """
+    for name, value in pragmas.items():
+        if not name.isidentifier():
+            raise ValueError(f"Invalid pragma: {name}")
+
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def copy_database(source, target, attempts=10):
+    """
+    Copy a SQLite database file, while it's being used.
+
+    The write-ahead log is checkpointed into the database file first,
+    the file is then copied while holding the write lock, so it can't
+    change and the log stays empty. Readers of the source aren't
+    blocked. The copy replaces the target at once, so readers of the
+    target never see a partial copy.
+
+    :param source: The path of the database to copy
+    :type source: str
+
+    :param target: The path of the copy
+    :type target: str
+
+    :param attempts: The number of tries to empty the write-ahead log
+    :type attempts: int
+
+    :return: The number of copied pages
+    :rtype: int
+    """
+    primary = sqlite3.connect(source, isolation_level=None)
+    journal = f"{source}-wal"
+
+    try:
+        for _ in range(attempts):
+            primary.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            primary.execute("BEGIN IMMEDIATE")
+
+            try:
+                # A write may have been committed before the lock
+                if os.path.exists(journal) and os.path.getsize(journal):
+                    continue
+
+                pages = primary.execute("PRAGMA page_count").fetchone()[0]
+                shutil.copyfile(source, f"{target}.copy")
+
+            finally:
+                primary.execute("ROLLBACK")
+
+            os.replace(f"{target}.copy", target)
+            return pages
+
+    finally:
+        primary.close()
+
+    raise sqlite3.OperationalError("The write-ahead log is never empty")
+
+
+@receiver(connection_created)
+def _tune_connection(sender, connection, **kwargs):
+    """
+    Apply the configured pragmas to every new SQLite connection.
+
+    :param sender: The class of the database wrapper
+    :type sender: type of django.db.backends.base.base.BaseDatabaseWrapper
+
+    :param connection: The connection that was created
+    :type connection: django.db.backends.base.base.BaseDatabaseWrapper
+
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    # The raw cursor keeps the pragmas out of the logged queries
+    cursor = connection.connection.cursor()
+
+    try:
+        apply_pragmas(cursor, getattr(settings, "SQLITE_PRAGMAS", {}))
+
+    finally:
+        cursor.close()
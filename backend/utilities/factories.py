@@ -31,6 +31,7 @@ class ImageFactory(DjangoModelFactory):
         model = Image
 
     mime = "PNG"
+    size = len(BLACK_PIXEL)
     data = BLACK_PIXEL
 
     @lazy_attribute
@@ -0,0 +1,227 @@
+"""Recording and aggregation of the timings of requests."""
+
+__all__ = (
+    "Recorder",
+    "Histogram",
+    "BUCKETS",
+    "timed_serializer",
+    "TimedSerializerMixin",
+)
+
+import time
+import bisect
+import functools
+import threading
+import contextlib
+
+from django.db import connections
+
+from rest_framework.serializers import ListSerializer
+
+# The upper bounds of the buckets of a histogram, in milliseconds
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+# The recorder of the current request of every thread
+_state = threading.local()
+
+
+class Recorder(object):
+    """
+    Recorder of the queries and serializer time of a single request.
+
+    While recording, every query of every database connection is timed,
+    and so is the serialization of the view-sets with the
+    'InstrumentedMixin', see 'utilities.mixins'.
+    """
+
+    def __init__(self):
+        """Initialize the recorder."""
+
+        self.queries = 0
+        self.database = 0.0
+        self.serializer = 0.0
+        self.slowest = (0.0, None)
+
+    @classmethod
+    def current(cls):
+        """
+        Get the recorder of the request of the current thread.
+
+        :return: The current recorder, if recording
+        :rtype: utilities.instrumentation.Recorder | None
+        """
+        return getattr(_state, "recorder", None)
+
+    @contextlib.contextmanager
+    def record(self):
+        """
+        Record the queries and serializers within the context.
+
+        :return: The context manager that records
+        :rtype: contextlib.AbstractContextManager
+        """
+        _state.recorder = self
+
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self))
+
+                yield self
+
+        finally:
+            _state.recorder = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Time a single query, as a database execute wrapper.
+
+        :param execute: The function that actually executes the query
+        :type execute: collections.abc.Callable
+
+        :param sql: The query to execute
+        :type sql: str
+
+        :param params: The parameters of the query
+        :type params: list | tuple | dict
+
+        :param many: Whether it's an 'executemany' call
+        :type many: bool
+
+        :param context: The connection and cursor of the query
+        :type context: dict
+
+        :return: The result of the query
+        :rtype: any
+        """
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+
+        finally:
+            duration = time.perf_counter() - start
+
+            self.queries += 1
+            self.database += duration
+
+            if duration > self.slowest[0]:
+                self.slowest = (duration, sql)
+
+
+class TimedSerializerMixin(object):
+    """
+    Mixin of a serializer that adds its time to the current recorder.
+
+    The representation of a serializer is built when its 'data' is
+    accessed, so that property is timed. The time of the queries within
+    the serialization is left out, as it's already part of the database
+    time. Nothing is timed for threads that aren't recording.
+    """
+
+    @property
+    def data(self):
+        """
+        Overridden to time the representation, when recording.
+
+        :return: The representation of the serializer
+        :rtype: rest_framework.utils.serializer_helpers.ReturnDict | list
+        """
+        recorder = Recorder.current()
+
+        if recorder is None:
+            return super().data
+
+        start = time.perf_counter()
+        database = recorder.database
+
+        try:
+            return super().data
+
+        finally:
+            # The lazy querysets are evaluated while serializing
+            elapsed = time.perf_counter() - start
+            recorder.serializer += elapsed - (recorder.database - database)
+
+
+@functools.lru_cache(maxsize=None)
+def timed_serializer(serializer_class):
+    """
+    Create the subclass of a serializer that is timed for the recorders.
+
+    The list serializer of 'many=True' is timed as well, its children
+    are part of its time.
+
+    :param serializer_class: The serializer to time
+    :type serializer_class: type of rest_framework.serializers.BaseSerializer
+
+    :return: The timed subclass, created once per serializer
+    :rtype: type of rest_framework.serializers.BaseSerializer
+    """
+    attributes = {"__module__": serializer_class.__module__}
+
+    if not issubclass(serializer_class, ListSerializer):
+        meta = getattr(serializer_class, "Meta", object)
+        many = getattr(meta, "list_serializer_class", ListSerializer)
+
+        attributes["Meta"] = type("Meta", (meta,), {
+            "list_serializer_class": timed_serializer(many),
+        })
+
+    return type(
+        serializer_class.__name__,
+        (TimedSerializerMixin, serializer_class),
+        attributes,
+    )
+
+
+class Histogram(object):
+    """Aggregated durations and query counts of a single route."""
+
+    def __init__(self):
+        """Initialize the histogram."""
+
+        self.buckets = [0] * len(BUCKETS)
+        self.durations = []
+        self.queries = 0
+
+    def add(self, duration, queries):
+        """
+        Add a request to the histogram.
+
+        :param duration: The duration of the request, in milliseconds
+        :type duration: float
+
+        :param queries: The number of queries of the request
+        :type queries: int
+        """
+        self.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+
+        bisect.insort(self.durations, duration)
+        self.queries += queries
+
+    @property
+    def count(self):
+        """
+        The number of requests.
+
+        :return: The number of requests
+        :rtype: int
+        """
+        return len(self.durations)
+
+    def percentile(self, percentage):
+        """
+        Determine the duration of a percentile of the requests.
+
+        :param percentage: The percentile, between 0 and 100
+        :type percentage: float
+
+        :return: The duration in milliseconds
+        :rtype: float
+        """
+        if not self.durations:
+            return 0.0
+
+        index = round(percentage / 100 * (self.count - 1))
+        return self.durations[index]
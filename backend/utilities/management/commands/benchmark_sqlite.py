@@ -0,0 +1,233 @@
+"""Management command to benchmark the concurrency of SQLite pragmas."""
+
+import os
+import time
+import random
+import sqlite3
+import tempfile
+import threading
+import contextlib
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utilities.database import apply_pragmas
+
+# A reduced schema of the answered questions, with the foreign key index
+SCHEMA = (
+    "CREATE TABLE answered ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " session_id INTEGER NOT NULL,"
+    " answerer_id INTEGER NOT NULL,"
+    " value DECIMAL NOT NULL,"
+    " created DATETIME NOT NULL)",
+    "CREATE INDEX answered_session ON answered (session_id)",
+)
+
+INSERT = (
+    "INSERT INTO answered (session_id, answerer_id, value, created) "
+    "VALUES (?, ?, ?, datetime('now'))"
+)
+
+SELECT = (
+    "SELECT session_id, SUM(value), COUNT(*) FROM answered "
+    "WHERE session_id = ? GROUP BY session_id"
+)
+
+SESSIONS = 50
+
+
+class Command(BaseCommand):
+    """
+    Compare the throughput of concurrent readers and writers.
+
+    Every configuration runs against a new database file, first with
+    the default pragmas and then with the 'SQLITE_PRAGMAS' setting.
+    Writers insert the answers of a session submission within a single
+    transaction, and readers aggregate the answers of a session like
+    the charts do.
+    """
+
+    help = "Benchmark concurrent reads and writes with the SQLite pragmas."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=8,
+            help="The number of reading threads.",
+        )
+
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=8,
+            help="The number of writing threads.",
+        )
+
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=5,
+            help="The duration of every configuration.",
+        )
+
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=10,
+            help="The number of answers per write transaction.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually run the benchmark, and print the throughput.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        configurations = (
+            ("default", {}),
+            ("tuned", getattr(settings, "SQLITE_PRAGMAS", {})),
+        )
+
+        for name, pragmas in configurations:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                result = self.run(path, pragmas, options)
+
+            self.stdout.write(
+                f"{name}: "
+                f"{result['writes'] / options['seconds']:.0f} writes/s, "
+                f"{result['reads'] / options['seconds']:.0f} reads/s, "
+                f"{result['errors']} errors"
+            )
+
+    def run(self, path, pragmas, options):
+        """
+        Run the readers and writers against a new database.
+
+        :param path: The path of the database file
+        :type path: str
+
+        :param pragmas: The pragmas to apply to every connection
+        :type pragmas: dict[str, str | int]
+
+        :param options: The parsed command options
+        :type options: any
+
+        :return: The number of written rows, reads and errors
+        :rtype: dict[str, int]
+        """
+        with contextlib.closing(self.connect(path, pragmas)) as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+        result = {"writes": 0, "reads": 0, "errors": 0}
+        lock = threading.Lock()
+
+        deadline = time.perf_counter() + options["seconds"]
+        writes = [True] * options["writers"] + [False] * options["readers"]
+
+        threads = [
+            threading.Thread(target=self.work, args=(
+                path, pragmas, write, options["batch"], deadline, result, lock
+            ))
+            for write in writes
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return result
+
+    def work(self, path, pragmas, write, batch, deadline, result, lock):
+        """
+        Keep reading or writing until the deadline.
+
+        :param path: The path of the database file
+        :type path: str
+
+        :param pragmas: The pragmas to apply to the connection
+        :type pragmas: dict[str, str | int]
+
+        :param write: Whether to write, or to read
+        :type write: bool
+
+        :param batch: The number of rows per write transaction
+        :type batch: int
+
+        :param deadline: The moment to stop, see 'time.perf_counter'
+        :type deadline: float
+
+        :param result: The shared counters to add to
+        :type result: dict[str, int]
+
+        :param lock: The lock of the shared counters
+        :type lock: threading.Lock
+        """
+        counts = {"writes": 0, "reads": 0, "errors": 0}
+        generator = random.Random()
+        connection = self.connect(path, pragmas)
+
+        try:
+            while time.perf_counter() < deadline:
+                session = generator.randrange(SESSIONS)
+
+                try:
+                    if write:
+                        rows = [
+                            (session, generator.randrange(10 ** 6),
+                             generator.randrange(100))
+                            for _ in range(batch)
+                        ]
+
+                        with connection:
+                            connection.executemany(INSERT, rows)
+
+                        counts["writes"] += batch
+
+                    else:
+                        connection.execute(SELECT, (session,)).fetchall()
+                        counts["reads"] += 1
+
+                except sqlite3.OperationalError:
+                    counts["errors"] += 1
+
+        finally:
+            connection.close()
+
+        with lock:
+            for key, count in counts.items():
+                result[key] += count
+
+    @staticmethod
+    def connect(path, pragmas):
+        """
+        Connect to the database like Django does, and apply the pragmas.
+
+        :param path: The path of the database file
+        :type path: str
+
+        :param pragmas: The pragmas to apply
+        :type pragmas: dict[str, str | int]
+
+        :return: The new connection
+        :rtype: sqlite3.Connection
+        """
+        connection = sqlite3.connect(path, check_same_thread=False)
+        apply_pragmas(connection.cursor(), pragmas)
+
+        return connection
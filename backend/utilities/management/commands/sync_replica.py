@@ -0,0 +1,60 @@
+"""Management command to copy the primary database to the replica."""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utilities.database import copy_database
+
+
+class Command(BaseCommand):
+    """
+    Copy the primary SQLite database to the replica.
+
+    This keeps a local replica in sync, see 'utilities.routers', where
+    a real deployment would use the replication of the database.
+    """
+
+    help = "Copy the primary SQLite database to the replica."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep copying the database every interval seconds.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually copy the database, and keep copying if requested.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        alias = getattr(settings, "DATABASE_REPLICA_ALIAS", None)
+
+        if alias is None:
+            raise CommandError("There is no replica, see DATABASE_REPLICA")
+
+        source = settings.DATABASES["default"]["NAME"]
+        target = settings.DATABASES[alias]["NAME"]
+
+        while True:
+            pages = copy_database(source, target)
+            self.stdout.write(f"Copied {pages} pages to the replica")
+
+            if not options["interval"]:
+                break
+
+            time.sleep(options["interval"])
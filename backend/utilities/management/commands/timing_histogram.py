@@ -0,0 +1,77 @@
+"""Management command to aggregate the instrumented request timings."""
+
+import json
+import collections
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utilities.instrumentation import BUCKETS, Histogram
+
+
+class Command(BaseCommand):
+    """
+    Print the histogram of the request durations of every route.
+
+    The durations are read from the log of the instrumentation
+    middleware, see 'utilities.middleware.InstrumentationMiddleware'.
+    """
+
+    help = "Print the histograms of the instrumented request timings."
+
+    def add_arguments(self, parser):
+        """
+        Add the optional arguments of the command.
+
+        :param parser: The argument parser of the command
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--log",
+            default=settings.INSTRUMENTATION_LOG,
+            help="The log of the instrumentation middleware.",
+        )
+
+        parser.add_argument(
+            "--route",
+            help="Only print the histogram of this route.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Actually aggregate the log, and print the histograms.
+
+        :param args: The positional arguments (ignored)
+        :type args: str
+
+        :param options: The parsed command options
+        :type options: any
+        """
+        histograms = collections.defaultdict(Histogram)
+
+        with open(options["log"]) as file:
+            for line in file:
+                try:
+                    timing = json.loads(line)
+
+                except ValueError:
+                    continue
+
+                route = f"{timing['method']} {timing['route']}"
+
+                if options["route"] in (None, timing["route"]):
+                    histograms[route].add(timing["total"], timing["queries"])
+
+        for route, histogram in sorted(histograms.items()):
+            self.stdout.write(
+                f"{route}: {histogram.count} requests, "
+                f"p50 {histogram.percentile(50):.1f}ms, "
+                f"p95 {histogram.percentile(95):.1f}ms, "
+                f"p99 {histogram.percentile(99):.1f}ms, "
+                f"{histogram.queries / histogram.count:.1f} queries"
+            )
+
+            for bound, count in zip(BUCKETS, histogram.buckets):
+                if count:
+                    bar = "#" * max(1, 40 * count // histogram.count)
+                    self.stdout.write(f"  <= {bound:>6} ms {count:>7} {bar}")
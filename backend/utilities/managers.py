@@ -0,0 +1,35 @@
+"""Custom managers for utility models."""
+
+__all__ = (
+    "ImageManager",
+)
+
+from django.db.models.manager import Manager
+
+
+class ImageManager(Manager):
+    """
+    Manager that defers the raw bytes of images.
+
+    The 'data' column is only filled for images that were stored
+    before the file storage was used, but selecting it for metadata
+    would still load every blob into memory.
+    """
+
+    def get_queryset(self):
+        """
+        Select the images without their raw bytes.
+
+        :return: The images with the 'data' column deferred
+        :rtype: django.db.models.query.QuerySet
+        """
+        return Manager.get_queryset(self).defer("data")
+
+    def with_data(self):
+        """
+        Select the images including their raw bytes, to serve them.
+
+        :return: The images including the 'data' column
+        :rtype: django.db.models.query.QuerySet
+        """
+        return Manager.get_queryset(self)
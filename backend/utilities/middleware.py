@@ -0,0 +1,143 @@
+"""Middleware of the project."""
+
+__all__ = (
+    "ReplicaMiddleware",
+    "InstrumentationMiddleware",
+)
+
+import json
+import time
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from utilities import routers
+from utilities.instrumentation import Recorder
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentationMiddleware(object):
+    """
+    Middleware to instrument every request, when enabled.
+
+    The number of queries, the database time, the serializer time and
+    the remaining view time are added as 'Server-Timing' header, the
+    three times are disjoint and add up to the total. They're logged
+    as a JSON line together with the slowest query as well, the logged
+    lines are aggregated by the 'timing_histogram' command.
+
+    Enabled by the 'INSTRUMENTATION' setting, otherwise Django removes
+    the middleware at startup.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware, or refuse when disabled.
+
+        :param get_response: The next middleware or view
+        :type get_response: collections.abc.Callable
+        """
+        if not getattr(settings, "INSTRUMENTATION", False):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Record the request, and add the timings to the response.
+
+        :param request: The current request
+        :type request: django.http.request.HttpRequest
+
+        :return: The response with the timings
+        :rtype: django.http.response.HttpResponseBase
+        """
+        start = time.perf_counter()
+
+        with Recorder().record() as recorder:
+            response = self.get_response(request)
+
+            # The template responses are rendered lazily otherwise
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+
+        total = (time.perf_counter() - start) * 1000
+
+        database = recorder.database * 1000
+        serializer = recorder.serializer * 1000
+        view = total - database - serializer
+
+        response["Server-Timing"] = ", ".join((
+            f'db;dur={database:.1f};desc="{recorder.queries} queries"',
+            f"serializer;dur={serializer:.1f}",
+            f"view;dur={view:.1f}",
+            f"total;dur={total:.1f}",
+        ))
+
+        match = request.resolver_match
+        slowest, sql = recorder.slowest
+
+        logger.info(json.dumps({
+            "route": match.view_name if match else None,
+            "method": request.method,
+            "status": response.status_code,
+            "total": round(total, 2),
+            "db": round(database, 2),
+            "queries": recorder.queries,
+            "serializer": round(serializer, 2),
+            "view": round(view, 2),
+            "slowest": {"duration": round(slowest * 1000, 2), "sql": sql},
+        }))
+
+        return response
+
+
+class ReplicaMiddleware(object):
+    """
+    Middleware to keep the reads of a user consistent with the replica.
+
+    The routing state is reset for every request, and a user that wrote
+    to the primary keeps reading from it for 'REPLICA_STICKINESS'
+    seconds, so that the user always reads their own writes.
+
+    Enabled by the 'DATABASE_REPLICA_ALIAS' setting, otherwise Django
+    removes the middleware at startup.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware, or refuse without a replica.
+
+        :param get_response: The next middleware or view
+        :type get_response: collections.abc.Callable
+        """
+        if not getattr(settings, "DATABASE_REPLICA_ALIAS", None):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Reset the routing, and make the user sticky after a write.
+
+        :param request: The current request
+        :type request: django.http.request.HttpRequest
+
+        :return: The response of the view
+        :rtype: django.http.response.HttpResponseBase
+        """
+        routers.reset()
+
+        try:
+            response = self.get_response(request)
+
+            # The user is set by the authentication of the view
+            if routers.has_written() and hasattr(request, "user"):
+                routers.stick(request.user)
+
+            return response
+
+        finally:
+            routers.reset()
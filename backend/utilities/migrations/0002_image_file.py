@@ -0,0 +1,28 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utilities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='file',
+            field=models.FileField(null=True, upload_to='images/'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='data',
+            field=models.BinaryField(null=True),
+        ),
+    ]
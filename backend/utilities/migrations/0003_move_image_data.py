@@ -0,0 +1,52 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:40
+
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.db import migrations
+
+
+def move_data_to_storage(apps, schema_editor):
+    Image = apps.get_model('utilities', 'Image')
+
+    # Only a single blob is loaded into memory at once
+    legacy = Image.objects.filter(data__isnull=False)
+    legacy = legacy.values_list('id', flat=True)
+
+    for identifier in list(legacy):
+        image = Image.objects.get(id=identifier)
+        data = bytes(image.data)
+
+        name = posixpath.basename(image.path) or 'image'
+        image.file.save(name, ContentFile(data), save=False)
+
+        image.data = None
+        image.size = len(data)
+        image.save(update_fields=('file', 'data', 'size'))
+
+
+def move_data_to_table(apps, schema_editor):
+    Image = apps.get_model('utilities', 'Image')
+
+    stored = Image.objects.exclude(file__isnull=True).exclude(file='')
+    stored = stored.values_list('id', flat=True)
+
+    for identifier in list(stored):
+        image = Image.objects.get(id=identifier)
+
+        with image.file.open('rb') as file:
+            image.data = file.read()
+
+        image.file.delete(save=False)
+        image.save(update_fields=('file', 'data'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utilities', '0002_image_file'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_data_to_storage, move_data_to_table),
+    ]
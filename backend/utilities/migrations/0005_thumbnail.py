@@ -0,0 +1,27 @@
+# Generated by Django 2.2.5 on 2026-10-17 22:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utilities', '0004_image_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Thumbnail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.PositiveSmallIntegerField()),
+                ('mime', models.CharField(max_length=255)),
+                ('file', models.FileField(upload_to='images/thumbnails/')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='thumbnails', to='utilities.Image')),
+            ],
+            options={
+                'unique_together': {('image', 'size')},
+            },
+        ),
+    ]
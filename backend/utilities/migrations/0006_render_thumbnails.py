@@ -0,0 +1,49 @@
+# Generated by Django 2.2.5 on 2026-10-18 09:12
+
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.db import migrations
+
+from utilities.thumbnails import render_thumbnails
+
+
+def render_missing_thumbnails(apps, schema_editor):
+    Image = apps.get_model('utilities', 'Image')
+    Thumbnail = apps.get_model('utilities', 'Thumbnail')
+
+    # The images that were stored before the thumbnails were rendered
+    missing = Image.objects.filter(thumbnails__isnull=True)
+    missing = missing.values_list('id', flat=True)
+
+    # Only a single image is loaded into memory at once
+    for identifier in list(missing):
+        image = Image.objects.get(id=identifier)
+        name = posixpath.basename(image.path) or 'image'
+
+        if image.file:
+            with image.file.open('rb') as file:
+                data = file.read()
+        else:
+            data = bytes(image.data or b'')
+
+        for size, (content, mime) in render_thumbnails(data).items():
+            thumbnail = Thumbnail(image=image, size=size, mime=mime)
+            thumbnail.file.save(
+                f'{size}-{name}', ContentFile(content), save=False
+            )
+
+            thumbnail.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utilities', '0005_thumbnail'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            render_missing_thumbnails, migrations.RunPython.noop
+        ),
+    ]
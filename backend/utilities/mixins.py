@@ -0,0 +1,364 @@
+"""Mixins for view-sets."""
+
+__all__ = (
+    "ReplicaMixin",
+    "InstrumentedMixin",
+    "QueryPlanMixin",
+    "ConditionalMixin",
+    "VersionedCacheMixin",
+)
+
+import hashlib
+import calendar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.aggregates import Count, Max, Sum
+
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.response import Response
+from rest_framework.permissions import SAFE_METHODS
+
+from utilities import routers
+from utilities.caching import get_version
+from utilities.instrumentation import Recorder, timed_serializer
+
+
+class ConditionalMixin(object):
+    """
+    Mixin to answer conditional requests of a model view-set.
+
+    The ETag and Last-Modified of a response are derived from the
+    'version' and 'modified' fields of the records with a single
+    aggregation, so a request with a matching 'If-None-Match' or
+    'If-Modified-Since' is answered with 304 Not Modified without
+    serializing anything.
+
+    Lists only carry the ETag, as deleting a record doesn't advance the
+    latest modification, but it does change the ETag.
+    """
+
+    version_field = "version"
+    modified_field = "modified"
+
+    def get_condition(self, queryset):
+        """
+        Determine the ETag and Last-Modified of the records.
+
+        The group of the user is part of the ETag because the
+        representation differs per group.
+
+        :param queryset: The records that will be represented
+        :type queryset: django.db.models.query.QuerySet
+
+        :return: The ETag and Last-Modified timestamp, if there are records
+        :rtype: tuple[str | None, int | None]
+        """
+        state = queryset.order_by().aggregate(
+            count=Count("pk"),
+            version=Sum(self.version_field),
+            modified=Max(self.modified_field),
+        )
+
+        if not state["count"]:
+            return None, None
+
+        modified = state["modified"]
+        modified = modified and calendar.timegm(modified.utctimetuple())
+
+        identity = (
+            getattr(self.request.user, "group_id", None),
+            state["count"],
+            state["version"],
+            modified,
+        )
+
+        etag = hashlib.md5(repr(identity).encode()).hexdigest()
+        return etag, modified
+
+    def conditional(self, queryset, handler, *args, modified=True, **kwargs):
+        """
+        Answer a conditional request, or call the handler.
+
+        :param queryset: The records that will be represented
+        :type queryset: django.db.models.query.QuerySet
+
+        :param handler: The handler to call when the records were modified
+        :type handler: collections.abc.Callable
+
+        :param args: The positional arguments for the handler
+        :type args: any
+
+        :param modified: Whether to answer 'If-Modified-Since' as well
+        :type modified: bool
+
+        :param kwargs: The keyword arguments for the handler
+        :type kwargs: any
+
+        :return: The response of the handler, or 304 Not Modified
+        :rtype: django.http.response.HttpResponseBase
+        """
+        etag, last_modified = self.get_condition(queryset)
+
+        # Missing records are left to the handler, like a 404 response
+        if etag is None:
+            return handler(self.request, *args, **kwargs)
+
+        if not modified:
+            last_modified = None
+
+        response = get_conditional_response(
+            self.request, etag=quote_etag(etag), last_modified=last_modified
+        )
+
+        if response is None:
+            response = handler(self.request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = quote_etag(etag)
+
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+
+        # Clients may keep the response, but have to revalidate it first
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization",))
+
+        return response
+
+    def get_object_queryset(self):
+        """
+        Select the record of a detail request.
+
+        :return: The queryset with at most the requested record
+        :rtype: django.db.models.query.QuerySet
+        """
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return queryset.filter(**{self.lookup_field: self.kwargs[lookup]})
+
+    def list(self, request, *args, **kwargs):
+        """Overridden to answer conditional requests."""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return self.conditional(
+            queryset, super().list, *args, modified=False, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Overridden to answer conditional requests."""
+        queryset = self.get_object_queryset()
+        return self.conditional(queryset, super().retrieve, *args, **kwargs)
+
+
+class QueryPlanMixin(object):
+    """
+    Mixin to apply the query plan of a view-set to its queryset.
+
+    The relations that are serialized are declared once per view-set,
+    either selected together with the records ('select_plan') or
+    prefetched with a single query per relation ('prefetch_plan'), so
+    that a list runs a fixed number of queries regardless of its size.
+    Plans that depend on the request, like a filtered 'Prefetch', are
+    built by overriding 'get_prefetch_plan'.
+    """
+
+    select_plan = ()
+    prefetch_plan = ()
+
+    def get_select_plan(self):
+        """
+        Get the relations to select together with the records.
+
+        :return: The lookups of the relations to select
+        :rtype: collections.abc.Sequence[str]
+        """
+        return self.select_plan
+
+    def get_prefetch_plan(self):
+        """
+        Get the relations to prefetch for the records.
+
+        :return: The lookups or 'Prefetch' instances of the relations
+        :rtype: collections.abc.Sequence[str | django.db.models.Prefetch]
+        """
+        return self.prefetch_plan
+
+    def get_queryset(self):
+        """
+        Overridden to apply the query plan.
+
+        :return: The queryset that follows the plan
+        :rtype: django.db.models.query.QuerySet
+        """
+        queryset = super().get_queryset()
+
+        select = self.get_select_plan()
+        prefetch = self.get_prefetch_plan()
+
+        if select:
+            queryset = queryset.select_related(*select)
+
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        return queryset
+
+
+class ReplicaMixin(object):
+    """
+    Mixin to read the lists of a view-set from the database replica.
+
+    The replica is only used once the user is authenticated and
+    allowed, so the tokens and permissions are always read from the
+    primary. Users that wrote recently keep reading from the primary,
+    see 'utilities.routers'.
+    """
+
+    replica_actions = ("list",)
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Overridden to switch to the replica after the authorization.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param args: Additional arguments
+        :type args: any
+
+        :param kwargs: Additional keyword arguments
+        :type kwargs: any
+        """
+        super().initial(request, *args, **kwargs)
+
+        if request.method in SAFE_METHODS and (
+            self.action in self.replica_actions
+        ):
+            routers.use_replica(request.user)
+
+
+class InstrumentedMixin(object):
+    """
+    Mixin to time the serializers of a view-set for the instrumentation.
+
+    While a request is recorded, see 'utilities.middleware', the view-set
+    serializes with a timed subclass of its serializer, so the time of
+    the serialization is reported apart from the view. Serializers that
+    are created without 'get_serializer_class' count as view time.
+    """
+
+    def get_serializer_class(self):
+        """
+        Overridden to time the serializer, when recording.
+
+        :return: The serializer class of the view-set
+        :rtype: type of rest_framework.serializers.BaseSerializer
+        """
+        serializer_class = super().get_serializer_class()
+
+        if Recorder.current() is None:
+            return serializer_class
+
+        return timed_serializer(serializer_class)
+
+
+class VersionedCacheMixin(object):
+    """
+    Mixin to cache the representation of the lists and details.
+
+    The serialized data is cached under the current version of the
+    'cache_namespace', so all the responses of the namespace are
+    invalidated at once by bumping its version on every write, see
+    'utilities.caching'. The requests are authorized before the cache
+    is read, so the representation has to be the same for every user
+    that is allowed to read it.
+
+    The entries expire after the 'RESPONSE_CACHE_TIMEOUT' setting, and
+    nothing is cached when it's zero.
+    """
+
+    cache_namespace = None
+    cache_actions = ("list", "retrieve")
+
+    def get_cache_timeout(self):
+        """
+        Get the seconds to keep a new response in the cache.
+
+        :return: The timeout of the cache entry
+        :rtype: int
+        """
+        return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 0)
+
+    def get_cache_key(self, request):
+        """
+        Create the cache key of the response to a request.
+
+        The host is part of the key because the hyperlinks of the
+        representation are absolute.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: The cache key
+        :rtype: str
+        """
+        identity = (
+            type(self).__name__,
+            self.action,
+            request.build_absolute_uri(),
+        )
+
+        digest = hashlib.md5(repr(identity).encode()).hexdigest()
+        version = get_version(self.cache_namespace)
+
+        return f"{self.cache_namespace}.{version}.{digest}"
+
+    def cached(self, handler, request, *args, **kwargs):
+        """
+        Answer a request from the cache, or call the handler.
+
+        :param handler: The handler to call when the response isn't cached
+        :type handler: collections.abc.Callable
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param args: The positional arguments for the handler
+        :type args: any
+
+        :param kwargs: The keyword arguments for the handler
+        :type kwargs: any
+
+        :return: The cached or handled response
+        :rtype: rest_framework.response.Response
+        """
+        enabled = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 0)
+
+        if not enabled or self.action not in self.cache_actions:
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            cache.set(key, response.data, self.get_cache_timeout())
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Overridden to answer from the cache."""
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Overridden to answer from the cache."""
+        return self.cached(super().retrieve, request, *args, **kwargs)
@@ -1,9 +1,168 @@
+import io
+import mimetypes
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.dispatch.dispatcher import receiver
+from django.utils.timezone import now
+
 from django.db.models import Model
+from django.db.models.signals import pre_save
 from django.db.models.fields import BinaryField, CharField
+from django.db.models.fields import DateTimeField, PositiveIntegerField
+from django.db.models.fields import PositiveSmallIntegerField
+from django.db.models.fields.files import FileField
+from django.db.models.fields.related import CASCADE, ForeignKey
+
+from utilities.managers import ImageManager
+from utilities.thumbnails import render_thumbnails
 
 
 class Image(Model):
     mime = CharField(max_length=4)
     path = CharField(max_length=255)
-    data = BinaryField()
+    size = PositiveIntegerField(default=0)
+
+    # The bytes are kept within the file storage, 'data' only holds the
+    # bytes of images that were stored before the storage was used.
+    data = BinaryField(null=True)
+    file = FileField(upload_to="images/", null=True)
+
+    # Raised on every save, used to answer conditional requests
+    version = PositiveIntegerField(default=0, editable=False)
+    modified = DateTimeField(default=now, editable=False)
+
+    objects = ImageManager()
+
+    @property
+    def content_type(self):
+        """
+        The content type of the image, the mime could be a short format.
+
+        :return: The content type to serve the image with
+        :rtype: str
+        """
+        if "/" in self.mime:
+            return self.mime
+
+        extension = "." + self.mime.lower()
+        return mimetypes.types_map.get(extension, "application/octet-stream")
+
+    def store(self, data):
+        """
+        Write the bytes of the image to the file storage.
+
+        The instance itself isn't saved, this is up to the caller.
+
+        :param data: The raw bytes of the image
+        :type data: bytes
+        """
+        name = posixpath.basename(self.path) or "image"
+
+        if self.file:
+            self.file.delete(save=False)
+
+        self.file.save(name, ContentFile(data), save=False)
+
+        self.data = None
+        self.size = len(data)
+
+    def store_thumbnails(self, data):
+        """
+        Render and store the thumbnails, replacing the previous ones.
+
+        The image has to be saved before the thumbnails are stored.
+
+        :param data: The raw bytes of the original image
+        :type data: bytes
+        """
+        for thumbnail in self.thumbnails.all():
+            thumbnail.file.delete(save=False)
+            thumbnail.delete()
+
+        for size, (content, mime) in render_thumbnails(data).items():
+            thumbnail = Thumbnail(image=self, size=size, mime=mime)
+            thumbnail.file.save(
+                f"{size}-{posixpath.basename(self.path) or 'image'}",
+                ContentFile(content),
+                save=False,
+            )
+
+            thumbnail.save()
+
+    def select(self, size=None):
+        """
+        Select the smallest rendition that covers the size.
+
+        :param size: The requested size in pixels, or None for the original
+        :type size: int | None
+
+        :return: The thumbnail to serve, or the image itself
+        :rtype: utilities.models.Thumbnail | utilities.models.Image
+        """
+        if size is None:
+            return self
+
+        thumbnail = self.thumbnails.filter(size__gte=size).order_by("size")
+        return thumbnail.first() or self
+
+    def open(self):
+        """
+        Open the bytes of the image for reading.
+
+        :return: A binary file-like object with the bytes of the image
+        :rtype: django.core.files.File | io.BytesIO
+        """
+        if self.file:
+            return self.file.open("rb")
+
+        return io.BytesIO(self.data or b"")
+
+
+class Thumbnail(Model):
+    """A smaller rendition of an image, rendered when the image is stored."""
+
+    class Meta:
+        unique_together = ("image", "size")
+
+    image = ForeignKey(Image, CASCADE, related_name="thumbnails")
+    size = PositiveSmallIntegerField()
+    mime = CharField(max_length=255)
+    file = FileField(upload_to="images/thumbnails/")
+
+    @property
+    def content_type(self):
+        """
+        The content type of the thumbnail.
+
+        :return: The content type to serve the thumbnail with
+        :rtype: str
+        """
+        return self.mime
+
+    def open(self):
+        """
+        Open the bytes of the thumbnail for reading.
+
+        :return: A binary file-like object with the bytes of the thumbnail
+        :rtype: django.core.files.File
+        """
+        return self.file.open("rb")
+
+
+@receiver(pre_save, sender=Image)
+def _bump_image_version(sender, instance, **kwargs):
+    """
+    Raise the version of a image that is about to be saved.
+
+    :param sender: The model's class
+    :type sender: type of utilities.models.Image
+
+    :param instance: The image that will be saved
+    :type instance: utilities.models.Image
 
+    :param kwargs: Additional keyword arguments
+    :type kwargs: any
+    """
+    instance.version += 1
+    instance.modified = now()
@@ -0,0 +1,33 @@
+"""Pagination classes for the view-sets."""
+
+__all__ = (
+    "KeysetPagination",
+)
+
+from django.conf import settings
+
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on the primary key.
+
+    Every page is selected with a 'WHERE key > cursor LIMIT size'
+    query instead of an offset, so the cost of a page doesn't grow
+    with the size of the table. The page size may be chosen by the
+    client, but is capped by the 'PAGINATION_MAX_PAGE_SIZE' setting.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+
+    @property
+    def max_page_size(self):
+        """
+        The maximum page size a client may request.
+
+        :return: The configured maximum page size
+        :rtype: int
+        """
+        return settings.PAGINATION_MAX_PAGE_SIZE
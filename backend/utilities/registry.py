@@ -0,0 +1,180 @@
+"""Per-process snapshots of constant lookup tables."""
+
+__all__ = (
+    "Registry",
+)
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from django.apps import apps
+from django.db.transaction import on_commit
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from utilities.caching import get_version, bump_version
+
+
+class Registry(Mapping):
+    """
+    Immutable per-process snapshot of a lookup table.
+
+    The records are fetched once per process on first use, so that the
+    hot paths resolve them by primary key without any query. Every
+    record is a named tuple of the 'fields', and the snapshot is a
+    read-only mapping of the primary keys to the records.
+
+    Lookup tables are maintained through fixtures. A snapshot belongs
+    to a version within the cache, see 'utilities.caching', which is
+    bumped when a record of the model or one of the 'senders' was
+    saved, deleted or related, like 'loaddata' does, or by 'reload'.
+    Every process fetches the records again on the next use, as the
+    cache is shared by all the processes, see 'utilities.checks'.
+
+    The models are given by label and only resolved when fetching, so
+    that a registry can be declared before its models are loaded.
+    """
+
+    def __init__(self, model, fields, senders=()):
+        """
+        Initialize the registry, and connect the reload hook.
+
+        :param model: The label of the model of the lookup table
+        :type model: str
+
+        :param fields: The fields of the records, besides the 'id'
+        :type fields: tuple[str]
+
+        :param senders: The labels of other models that change the records
+        :type senders: tuple[str]
+        """
+        self.label = model
+        self.fields = fields
+        self.senders = (model,) + senders
+
+        self.namespace = f"utilities.registry.{model}"
+
+        # The version and records of the current snapshot
+        self._snapshot = (None, None)
+
+        for sender in self.senders:
+            post_save.connect(self.reload, sender, weak=False)
+            post_delete.connect(self.reload, sender, weak=False)
+
+        # Unlike the model signals, this one can't connect to a label
+        m2m_changed.connect(self._related, weak=False)
+
+    @property
+    def model(self):
+        """
+        The model of the lookup table.
+
+        :return: The resolved model
+        :rtype: type of django.db.models.Model
+        """
+        return apps.get_model(self.label)
+
+    def fetch(self):
+        """
+        Fetch the records of the lookup table.
+
+        :return: The records by their primary key
+        :rtype: dict[int, tuple]
+        """
+        queryset = self.model.objects.order_by("id")
+        rows = queryset.values_list("id", *self.fields, named=True)
+
+        return {row.id: row for row in rows}
+
+    @property
+    def snapshot(self):
+        """
+        The current version and records, fetched when the version changed.
+
+        The version is read before fetching, so a change while fetching
+        is fetched again on the next use.
+
+        :return: The version and the records by their primary key
+        :rtype: tuple[int, types.MappingProxyType]
+        """
+        version = get_version(self.namespace)
+        snapshot = self._snapshot
+
+        if snapshot[1] is None or snapshot[0] != version:
+            snapshot = version, MappingProxyType(self.fetch())
+            self._snapshot = snapshot
+
+        return snapshot
+
+    @property
+    def records(self):
+        """
+        The records of the current snapshot.
+
+        :return: The records by their primary key
+        :rtype: types.MappingProxyType
+        """
+        return self.snapshot[1]
+
+    def reload(self, *args, **kwargs):
+        """
+        Fetch the records again on the next use, within every process.
+
+        The version is bumped again after the commit, so snapshots that
+        were fetched while the transaction was pending are dropped as
+        well. Accepts the arguments of a signal, so it's a receiver.
+
+        :param args: The positional arguments of a signal (ignored)
+        :type args: any
+
+        :param kwargs: The keyword arguments of a signal (ignored)
+        :type kwargs: any
+        """
+        bump_version(self.namespace)
+        on_commit(lambda: bump_version(self.namespace))
+
+        del args, kwargs
+
+    def _related(self, sender, **kwargs):
+        """
+        Reload when the relations of one of the senders changed.
+
+        :param sender: The intermediate model of the relation
+        :type sender: type of django.db.models.Model
+
+        :param kwargs: Additional keyword arguments
+        :type kwargs: any
+        """
+        if sender._meta.label in self.senders:
+            self.reload()
+
+        del kwargs
+
+    def __getitem__(self, key):
+        """
+        Resolve a record by its primary key.
+
+        :param key: The primary key of the record
+        :type key: int
+
+        :return: The record
+        :rtype: tuple
+        """
+        return self.records[key]
+
+    def __iter__(self):
+        """
+        Iterate over the primary keys of the records.
+
+        :return: An iterator over the primary keys
+        :rtype: collections.abc.Iterator[int]
+        """
+        return iter(self.records)
+
+    def __len__(self):
+        """
+        Count the records.
+
+        :return: The number of records
+        :rtype: int
+        """
+        return len(self.records)
@@ -0,0 +1,183 @@
+"""Routing of the reads to a replica of the database."""
+
+__all__ = (
+    "ReplicaRouter",
+    "use_replica",
+    "has_written",
+    "reset",
+    "stick",
+    "is_sticky",
+)
+
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+# The routing state of the current request of every thread
+_state = threading.local()
+
+# The app of the entries of the 'DatabaseCache', which has to be shared
+_CACHE_APP = "django_cache"
+
+
+def use_replica(user):
+    """
+    Read from the replica for the rest of the request, if configured.
+
+    Users that wrote recently keep reading from the primary, so that
+    they always read their own writes, see 'stick'.
+
+    :param user: The user of the request
+    :type user: accounts.models.User | django.contrib.auth.models.AnonymousUser
+
+    :return: Whether the replica is used
+    :rtype: bool
+    """
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", None)
+
+    _state.replica = alias if alias and not is_sticky(user) else None
+    return _state.replica is not None
+
+
+def has_written():
+    """
+    Check whether anything was written within the current request.
+
+    :return: Whether anything was written
+    :rtype: bool
+    """
+    return getattr(_state, "written", False)
+
+
+def reset():
+    """Reset the routing state for a new request."""
+
+    _state.replica = None
+    _state.written = False
+
+
+def _sticky_key(user):
+    """
+    Create the cache key of the stickiness of a user.
+
+    :param user: The user to create the key for
+    :type user: accounts.models.User
+
+    :return: The cache key
+    :rtype: str
+    """
+    return f"utilities.routers.sticky.{user.id}"
+
+
+def stick(user):
+    """
+    Keep the user on the primary until the replica caught up.
+
+    :param user: The user that wrote to the primary
+    :type user: accounts.models.User
+    """
+    if user.is_authenticated:
+        timeout = getattr(settings, "REPLICA_STICKINESS", 10)
+        cache.set(_sticky_key(user), True, timeout)
+
+
+def is_sticky(user):
+    """
+    Check whether the user has to read from the primary.
+
+    :param user: The user to check
+    :type user: accounts.models.User | django.contrib.auth.models.AnonymousUser
+
+    :return: Whether the user wrote recently
+    :rtype: bool
+    """
+    return user.is_authenticated and cache.get(_sticky_key(user), False)
+
+
+class ReplicaRouter(object):
+    """
+    Database router that sends the reads to the replica, when enabled.
+
+    The reads of a request only go to the replica after 'use_replica',
+    which is called by the 'ReplicaMixin' of the chart and list
+    view-sets once the user is authenticated. All the writes go to the
+    primary, and every read after a write within the same request goes
+    to the primary as well. The entries of a database cache are always
+    read from the primary, and don't count as a write.
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        Select the replica for reads, when enabled and nothing was written.
+
+        :param model: The model that is read
+        :type model: type of django.db.models.Model
+
+        :param hints: Additional routing hints
+        :type hints: any
+
+        :return: The alias of the replica, or None for the default
+        :rtype: str | None
+        """
+        if has_written() or model._meta.app_label == _CACHE_APP:
+            return None
+
+        return getattr(_state, "replica", None)
+
+    def db_for_write(self, model, **hints):
+        """
+        Select the primary for writes, and remember the write.
+
+        :param model: The model that is written
+        :type model: type of django.db.models.Model
+
+        :param hints: Additional routing hints
+        :type hints: any
+
+        :return: The alias of the primary
+        :rtype: str
+        """
+        if model._meta.app_label != _CACHE_APP:
+            _state.written = True
+
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Allow relations between the primary and replica, as they're equal.
+
+        :param obj1: The first instance of the relation
+        :type obj1: django.db.models.Model
+
+        :param obj2: The second instance of the relation
+        :type obj2: django.db.models.Model
+
+        :param hints: Additional routing hints
+        :type hints: any
+
+        :return: Always true
+        :rtype: bool
+        """
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Only migrate the primary, the replica is a copy of it.
+
+        :param db: The alias of the database
+        :type db: str
+
+        :param app_label: The label of the app to migrate
+        :type app_label: str
+
+        :param model_name: The name of the model to migrate
+        :type model_name: str | None
+
+        :param hints: Additional routing hints
+        :type hints: any
+
+        :return: Whether to migrate the database
+        :rtype: bool
+        """
+        return db != getattr(settings, "DATABASE_REPLICA_ALIAS", None)
@@ -0,0 +1,53 @@
+"""Test runner of the project."""
+
+__all__ = (
+    "TestRunner",
+)
+
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that uses a cache of its own.
+
+    The cache is shared by all the processes, see 'CACHES', so the
+    tests would otherwise read the responses and versions of an earlier
+    run, or of a running server. The cache of the tests is a temporary
+    directory instead, which starts empty and is removed afterwards.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        """
+        Overridden to replace the cache with a temporary one.
+
+        :param kwargs: Additional keyword arguments
+        :type kwargs: any
+        """
+        super().setup_test_environment(**kwargs)
+
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.cache_settings = override_settings(CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased"
+                           ".FileBasedCache",
+                "LOCATION": self.cache_directory.name,
+            },
+        })
+
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        """
+        Overridden to remove the temporary cache.
+
+        :param kwargs: Additional keyword arguments
+        :type kwargs: any
+        """
+        self.cache_settings.disable()
+        self.cache_directory.cleanup()
+
+        super().teardown_test_environment(**kwargs)
@@ -4,9 +4,11 @@ import mimetypes
 from rest_framework.serializers import Field
 from rest_framework.serializers import CharField
 from rest_framework.serializers import ChoiceField
+from rest_framework.serializers import Serializer
 from rest_framework.serializers import ModelSerializer
 
 from utilities.models import Image
+from utilities.thumbnails import THUMBNAIL_SIZES
 
 
 class Base64Field(Field):
@@ -20,14 +22,75 @@ class Base64Field(Field):
 
 
 class ImageSerializer(ModelSerializer):
+    """
+    Serializer for the metadata of an image.
+
+    The bytes are only accepted on write and written to the file
+    storage, together with the thumbnails of the image. They are
+    served by a download view instead.
+    """
+
     class Meta:
         model = Image
-        fields = ("id", "path", "mime", "data")
+        fields = ("id", "path", "mime", "size", "data")
+        read_only_fields = ("size",)
 
     path = CharField()
     mime = ChoiceField(choices={
         c for c in mimetypes.types_map.values() if c.startswith("image")
     })
 
-    data = Base64Field()
+    data = Base64Field(write_only=True)
+
+    def create(self, validated_data):
+        """
+        Create the image and store the bytes.
+
+        :param validated_data: The validated values
+        :type validated_data: dict
+
+        :return: The created image
+        :rtype: utilities.models.Image
+        """
+        data = validated_data.pop("data")
+        instance = Image(**validated_data)
+
+        instance.store(data)
+        instance.save()
+        instance.store_thumbnails(data)
+
+        return instance
+
+    def update(self, instance, validated_data):
+        """
+        Update the image and replace the bytes if given.
+
+        :param instance: The image to update
+        :type instance: utilities.models.Image
+
+        :param validated_data: The validated values
+        :type validated_data: dict
+
+        :return: The updated image
+        :rtype: utilities.models.Image
+        """
+        data = validated_data.pop("data", None)
+
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+
+        if data is not None:
+            instance.store(data)
+
+        instance.save()
+
+        if data is not None:
+            instance.store_thumbnails(data)
+
+        return instance
+
+
+class DownloadParameterSerializer(Serializer):
+    """Serializer for the query parameters of a image download."""
 
+    size = ChoiceField(choices=THUMBNAIL_SIZES, required=False)
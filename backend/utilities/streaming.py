@@ -0,0 +1,54 @@
+"""Streaming encoders for large exports."""
+
+__all__ = (
+    "STREAM_FORMATS",
+    "stream_rows",
+)
+
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# The content type of every supported output format
+STREAM_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo(object):
+    """File-like object that returns what is written, for 'csv.writer'."""
+
+    def write(self, value):
+        return value
+
+
+def stream_rows(columns, rows, output):
+    """
+    Encode rows one by one, so an export runs in constant memory.
+
+    :param columns: The names of the columns of the rows
+    :type columns: collections.abc.Sequence[str]
+
+    :param rows: The rows to encode, typically a lazy queryset iterator
+    :type rows: collections.abc.Iterable[tuple]
+
+    :param output: The output format, see 'STREAM_FORMATS'
+    :type output: str
+
+    :return: The encoded lines
+    :rtype: collections.abc.Iterator[str]
+    """
+    if output == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+
+        for row in rows:
+            yield writer.writerow(row)
+
+        return
+
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
@@ -1,3 +1,308 @@
-from django.test import TestCase
+"""Unittests for the utilities."""
 
-# Create your tests here.
+import io
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+
+from django.db import connection
+from django.test import override_settings
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+
+from rest_framework import status
+
+from rest_framework.test import APITestCase
+from rest_framework.test import URLPatternsTestCase
+
+from rest_framework.reverse import reverse
+from rest_framework.serializers import Serializer
+
+from accounts.utils import Groups
+from accounts.models import Group
+
+from accounts.factories import UserFactory
+from accounts.factories import AuthFactory
+
+from companies.models import Company
+from companies.urls import urlpatterns as company_urlpatterns
+from companies.factories import CompanyFactory
+
+from utilities import routers
+from utilities.checks import check_shared_cache
+from utilities.caching import bump_version
+from utilities.database import copy_database
+from utilities.registry import Registry
+
+# A registry of the 'groups.json' fixture, see 'TestRegistry'
+groups = Registry("auth.Group", ("name",))
+
+
+@override_settings(INSTRUMENTATION=True)
+class TestInstrumentation(URLPatternsTestCase, APITestCase):
+    """Unittests for the instrumentation of requests."""
+
+    fixtures = ["groups"]
+    urlpatterns = company_urlpatterns
+
+    @classmethod
+    def setUpTestData(cls):
+        CompanyFactory()
+
+        cls.management = UserFactory(
+            group=Group.objects.get(id=Groups.management)
+        )
+
+        cls.management_token = AuthFactory(user=cls.management)
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.management_token.plain}"
+        )
+
+    def test_server_timing(self):
+        """Verify that the timings are added to the response and logged."""
+
+        with self.assertLogs("utilities.middleware", "INFO") as logs:
+            response = self.client.get(reverse("company-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        timings = response["Server-Timing"].split(", ")
+        names = [timing.split(";")[0] for timing in timings]
+
+        self.assertEqual(names, ["db", "serializer", "view", "total"])
+
+        durations = [
+            float(timing.split(";")[1].split("=")[1]) for timing in timings
+        ]
+
+        # The database, serializer and view times add up to the total
+        self.assertAlmostEqual(sum(durations[:3]), durations[3], delta=0.2)
+
+        timing = json.loads(logs.records[0].getMessage())
+
+        self.assertEqual(timing["route"], "company-list")
+        self.assertGreater(timing["queries"], 0)
+        self.assertGreater(timing["serializer"], 0)
+        self.assertIn(timing["slowest"]["sql"][:6], ("SELECT", "INSERT"))
+
+        # The serializers of the REST framework itself are left alone
+        self.assertEqual(
+            Serializer.data.fget.__module__, "rest_framework.serializers"
+        )
+
+    @override_settings(INSTRUMENTATION=False)
+    def test_disabled(self):
+        """Verify that nothing is added when the instrumentation is off."""
+
+        response = self.client.get(reverse("company-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_histogram(self):
+        """Verify that the logged timings are aggregated per route."""
+
+        with tempfile.NamedTemporaryFile("w", suffix=".log") as log:
+            for total in (1, 3, 30, 3000):
+                log.write(json.dumps({
+                    "route": "company-list",
+                    "method": "GET",
+                    "total": total,
+                    "queries": 4,
+                }) + "\n")
+
+            log.flush()
+
+            stdout = io.StringIO()
+            call_command("timing_histogram", log=log.name, stdout=stdout)
+
+        lines = stdout.getvalue().splitlines()
+
+        self.assertTrue(lines[0].startswith("GET company-list: 4 requests"))
+        self.assertIn("4.0 queries", lines[0])
+        self.assertEqual(len(lines), 4)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Tunes SQLite only")
+class TestSQLitePragmas(APITestCase):
+    """Unittests for the tuning of the SQLite connections."""
+
+    def test_pragmas(self):
+        """Verify that the pragmas are applied to the connection."""
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            busy_timeout = cursor.fetchone()[0]
+
+        self.assertEqual(busy_timeout, 5000)
+
+    def test_benchmark(self):
+        """Verify that both configurations are benchmarked."""
+
+        stdout = io.StringIO()
+
+        call_command(
+            "benchmark_sqlite",
+            readers=2,
+            writers=2,
+            seconds=0.2,
+            stdout=stdout,
+        )
+
+        lines = stdout.getvalue().splitlines()
+
+        self.assertEqual([line.split(":")[0] for line in lines], [
+            "default", "tuned",
+        ])
+
+
+@override_settings(DATABASE_REPLICA_ALIAS="replica")
+class TestReplicaRouter(APITestCase):
+    """Unittests for the routing of the reads to the replica."""
+
+    fixtures = ["groups"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.management = UserFactory(
+            group=Group.objects.get(id=Groups.management)
+        )
+
+    def setUp(self):
+        routers.reset()
+        self.router = routers.ReplicaRouter()
+
+    def tearDown(self):
+        routers.reset()
+
+    def test_read_from_replica(self):
+        """Verify that the reads go to the replica, until a write."""
+
+        self.assertIsNone(self.router.db_for_read(Company))
+        self.assertTrue(routers.use_replica(self.management))
+        self.assertEqual(self.router.db_for_read(Company), "replica")
+
+        self.assertEqual(self.router.db_for_write(Company), "default")
+        self.assertIsNone(self.router.db_for_read(Company))
+
+    def test_sticky(self):
+        """Verify that a user reads from the primary after a write."""
+
+        routers.stick(self.management)
+
+        self.assertFalse(routers.use_replica(self.management))
+        self.assertIsNone(self.router.db_for_read(Company))
+
+    def test_cache_entries(self):
+        """Verify that the entries of a database cache use the primary."""
+
+        entry = DatabaseCache("cache", {}).cache_model_class
+        routers.use_replica(self.management)
+
+        self.assertEqual(self.router.db_for_write(entry), "default")
+        self.assertFalse(routers.has_written())
+        self.assertIsNone(self.router.db_for_read(entry))
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_without_replica(self):
+        """Verify that nothing is routed without a replica."""
+
+        self.assertFalse(routers.use_replica(self.management))
+        self.assertIsNone(self.router.db_for_read(Company))
+
+    def test_migrate(self):
+        """Verify that only the primary is migrated."""
+
+        self.assertTrue(self.router.allow_migrate("default", "companies"))
+        self.assertFalse(self.router.allow_migrate("replica", "companies"))
+
+    def test_copy_database(self):
+        """Verify that the replica is a copy of the primary."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "primary.sqlite3")
+            target = os.path.join(directory, "replica.sqlite3")
+
+            primary = sqlite3.connect(source)
+            primary.execute("PRAGMA journal_mode = wal")
+            primary.execute("PRAGMA wal_autocheckpoint = 0")
+
+            # The row is only committed to the write-ahead log
+            with primary:
+                primary.execute("CREATE TABLE score (value INTEGER)")
+                primary.execute("INSERT INTO score VALUES (42)")
+
+            self.assertGreater(copy_database(source, target), 0)
+            primary.close()
+
+            replica = sqlite3.connect(target)
+            value = replica.execute("SELECT value FROM score").fetchone()
+            replica.close()
+
+        self.assertEqual(value, (42,))
+
+
+class TestSharedCache(unittest.TestCase):
+    """Unittests for the check of the shared cache."""
+
+    def test_shared(self):
+        """Verify that the cache of the tests is shared."""
+
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    })
+    def test_process_cache(self):
+        """Verify that a cache of a single process is refused."""
+
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["utilities.E001"])
+
+
+class TestRegistry(APITestCase):
+    """Unittests for the registries of the lookup tables."""
+
+    fixtures = ["groups"]
+
+    def setUp(self):
+        groups.reload()
+
+    def test_resolve_without_queries(self):
+        """Verify that the records are only fetched once."""
+
+        with self.assertNumQueries(1):
+            self.assertEqual(groups[Groups.employee].name, "Employees")
+            self.assertEqual(len(groups), len(Groups))
+
+        with self.assertRaises(TypeError):
+            groups.records[Groups.employee] = None
+
+    def test_reload(self):
+        """Verify that the records are reloaded after a change."""
+
+        self.assertEqual(groups[Groups.admin].name, "Administrators")
+
+        group = Group.objects.get(id=Groups.admin)
+        group.name = "Admins"
+        group.save()
+
+        self.assertEqual(groups[Groups.admin].name, "Admins")
+
+    def test_reload_from_other_process(self):
+        """Verify that the records are reloaded when the version changed."""
+
+        self.assertEqual(groups[Groups.admin].name, "Administrators")
+
+        # Another process would only bump the version in the shared cache
+        Group.objects.filter(id=Groups.admin).update(name="Admins")
+        self.assertEqual(groups[Groups.admin].name, "Administrators")
+
+        bump_version(groups.namespace)
+        self.assertEqual(groups[Groups.admin].name, "Admins")
@@ -0,0 +1,62 @@
+"""Rendering of image thumbnails."""
+
+__all__ = (
+    "THUMBNAIL_SIZES",
+    "render_thumbnails",
+)
+
+import io
+
+from PIL import Image as PillowImage
+
+# The bounding boxes of the thumbnails, in pixels
+THUMBNAIL_SIZES = (64, 128, 256)
+
+# The formats that are kept, other formats are rendered as PNG
+KEPT_FORMATS = {"PNG": "image/png", "JPEG": "image/jpeg", "GIF": "image/gif"}
+
+
+def render_thumbnails(data, sizes=THUMBNAIL_SIZES):
+    """
+    Render the thumbnails of an image.
+
+    The aspect ratio is kept and images are never enlarged, so only
+    the sizes that are smaller than the original image are rendered.
+    Nothing is rendered when the data isn't a readable image, the
+    original image is served instead.
+
+    :param data: The raw bytes of the original image
+    :type data: bytes
+
+    :param sizes: The bounding boxes to render
+    :type sizes: collections.abc.Iterable[int]
+
+    :return: The bytes and content type of each rendered size
+    :rtype: dict[int, tuple[bytes, str]]
+    """
+    try:
+        original = PillowImage.open(io.BytesIO(data))
+        original.load()
+
+    except (OSError, ValueError, PillowImage.DecompressionBombError):
+        return {}
+
+    output = original.format if original.format in KEPT_FORMATS else "PNG"
+    thumbnails = {}
+
+    for size in sizes:
+        if max(original.size) <= size:
+            continue
+
+        image = original.copy()
+        image.thumbnail((size, size))
+
+        if output == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        image.save(buffer, output)
+
+        thumbnails[size] = buffer.getvalue(), KEPT_FORMATS[output]
+
+    return thumbnails